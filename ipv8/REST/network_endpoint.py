@@ -4,7 +4,7 @@ from typing import cast
 from aiohttp import web
 from aiohttp.abc import Request
 from aiohttp_apispec import docs
-from marshmallow.fields import Integer, List, String
+from marshmallow.fields import Boolean, Integer, List, String
 
 from ipv8_service import IPv8
 
@@ -21,7 +21,8 @@ class NetworkEndpoint(BaseEndpoint[IPv8]):
         """
         Register the names to make this endpoint callable.
         """
-        self.app.add_routes([web.get("", self.retrieve_peers)])
+        self.app.add_routes([web.get("", self.retrieve_peers),
+                             web.get("/rate_limit", self.get_rate_limit_statistics)])
 
     @docs(
         tags=["Network"],
@@ -58,3 +59,27 @@ class NetworkEndpoint(BaseEndpoint[IPv8]):
             }
             for peer in peer_list
         }})
+
+    @docs(
+        tags=["Network"],
+        summary="Return the counters of the rate limiter for incoming packets.",
+        responses={
+            200: {
+                "schema": schema(RateLimitResponse={
+                    "enabled": Boolean,
+                    "accepted": Integer,
+                    "rejected": Integer,
+                    "evicted": Integer,
+                    "sources": Integer,
+                    "allowed": Integer
+                })
+            }
+        }
+    )
+    async def get_rate_limit_statistics(self, _: Request) -> Response:
+        """
+        Return the counters of the rate limiter for incoming packets.
+        """
+        if self.session is None or self.session.rate_limiter is None:
+            return Response({"enabled": False})
+        return Response({"enabled": True, **self.session.rate_limiter.get_statistics()})
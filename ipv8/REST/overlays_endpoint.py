@@ -84,6 +84,8 @@ class OverlaysEndpoint(BaseEndpoint[IPv8]):
             peers = overlay.get_peers()
             statistics = self.session.endpoint.get_aggregate_statistics(overlay.get_prefix()) \
                 if isinstance(self.session.endpoint, StatisticsEndpoint) else {}
+            ingress = self.session.endpoint.get_ingress_statistics(overlay.get_prefix()) \
+                if isinstance(self.session.endpoint, StatisticsEndpoint) else {}
             overlay_stats.append({
                 "id": hexlify(overlay.community_id).decode(),
                 "my_peer": hexlify(overlay.my_peer.public_key.key_to_bin()).decode(),
@@ -93,6 +95,9 @@ class OverlaysEndpoint(BaseEndpoint[IPv8]):
                            "public_key": hexlify(peer.public_key.key_to_bin()).decode()} for peer in peers],
                 "overlay_name": overlay.__class__.__name__,
                 "statistics": statistics,
+                "signature_cache": (overlay.signature_cache.get_statistics()
+                                    if overlay.signature_cache is not None else {}),
+                "ingress": ingress,
                 "max_peers": overlay.max_peers,
                 "is_isolated": self.session.network != overlay.network,
                 "my_estimated_wan": {"ip": overlay.my_estimated_wan[0], "port": overlay.my_estimated_wan[1]},
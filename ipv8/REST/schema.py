@@ -46,6 +46,26 @@ class OverlayStatisticsSchema(Schema):
     diff_time = Integer()
 
 
+class IngressStatisticsSchema(Schema):
+    """
+    The schema for the statistics of the ingress queues of an overlay.
+    """
+
+    queued = Integer()
+    max_queued = Integer()
+    dropped = Integer()
+
+
+class SignatureCacheStatisticsSchema(Schema):
+    """
+    The schema for the statistics of the verified signature cache of an overlay.
+    """
+
+    hits = Integer()
+    misses = Integer()
+    size = Integer()
+
+
 class OverlayStrategySchema(Schema):
     """
     The schema describing discovery strategies for overlays.
@@ -71,6 +91,8 @@ class OverlaySchema(Schema):
     my_estimated_lan = Nested(cast("Schema", Address))
     strategies = List(Nested(cast("Schema", OverlayStrategySchema)))
     statistics = Nested(cast("Schema", OverlayStatisticsSchema))
+    signature_cache = Nested(cast("Schema", SignatureCacheStatisticsSchema))
+    ingress = Nested(cast("Schema", IngressStatisticsSchema))
 
 
 class DHTValueSchema(Schema):
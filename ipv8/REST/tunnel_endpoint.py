@@ -295,7 +295,10 @@ class TunnelEndpoint(BaseEndpoint[IPv8]):
                         "direction": String,
                         "bytes_up": Integer,
                         "bytes_down": Integer,
-                        "creation_time": Integer
+                        "creation_time": Integer,
+                        "cells_queued": Integer,
+                        "cells_delayed": Integer,
+                        "cells_dropped": Integer
                     })]
                 })
             }
@@ -316,7 +319,10 @@ class TunnelEndpoint(BaseEndpoint[IPv8]):
             "direction": "forward" if relay.direction == FORWARD else "backward",
             "bytes_up": relay.bytes_up,
             "bytes_down": relay.bytes_down,
-            "creation_time": relay.creation_time
+            "creation_time": relay.creation_time,
+            "cells_queued": len(relay.queue),
+            "cells_delayed": relay.cells_delayed,
+            "cells_dropped": relay.cells_dropped
         } for circuit_from, relay in self.tunnels.relay_from_to.items()]})
 
     @docs(
@@ -10,17 +10,19 @@ Community instance.
 from __future__ import annotations
 
 import sys
-from asyncio import ensure_future, iscoroutine
+from asyncio import Future, ensure_future, get_running_loop, iscoroutine, wait
 from binascii import hexlify
 from ipaddress import IPv4Address, IPv6Address, ip_address
 from itertools import islice
 from random import choice, random
 from time import time
 from traceback import format_exception
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, TypeAlias, cast
 
 from typing_extensions import Self
 
+from .keyvault.crypto import default_eccrypto
+from .keyvault.signature_cache import DEFAULT_SIGNATURE_CACHE_TIMEOUT, VerifiedSignatureCache
 from .lazy_community import EZPackOverlay, lazy_wrapper, lazy_wrapper_unsigned
 from .messaging.anonymization.endpoint import TunnelEndpoint
 from .messaging.interfaces.dispatcher.endpoint import FAST_ADDR_TO_INTERFACE, INTERFACES
@@ -39,9 +41,10 @@ from .messaging.payload_headers import BinMemberAuthenticationPayload, GlobalTim
 from .overlay import Settings
 
 if TYPE_CHECKING:
-    from collections.abc import Awaitable, Callable, Coroutine
+    from collections.abc import Awaitable, Callable, Container, Coroutine
 
     from .bootstrapping.bootstrapper_interface import Bootstrapper
+    from .keyvault.keys import PublicKey
     from .messaging.interfaces.dispatcher.endpoint import DispatcherEndpoint
     from .messaging.serialization import Payload
     from .peer import Peer
@@ -51,6 +54,19 @@ _UNUSED_FLAGS_REQ = {"connection_type_0": 0, "connection_type_1": 0, "supports_n
 _UNUSED_FLAGS_RESP = {"flag1": 0, "flag2": 0, "flag3": 0, "flag4": 0, "flag5": 0, "flag6": 0, "flag7": 0}
 
 DEFAULT_MAX_PEERS = 30
+DEFAULT_VERIFICATION_BATCH_SIZE = 64
+
+MessageHandlerCallable: TypeAlias = "Callable[[Address, bytes], None] | Callable[[Address, bytes], Coroutine]"
+SignatureJob: TypeAlias = "tuple[PublicKey, bytes | memoryview, bytes] | None"
+
+
+def verify_signatures(jobs: list[SignatureJob]) -> list[bool]:
+    """
+    Verify a batch of (public key, message, signature) jobs. ``None`` jobs are considered invalid.
+
+    This is intended to run on a worker thread: the crypto backends release the GIL while verifying.
+    """
+    return [job is not None and default_eccrypto.is_valid_signature(*job) for job in jobs]
 
 
 class CommunitySettings(Settings):
@@ -64,6 +80,24 @@ class CommunitySettings(Settings):
     anonymize: bool = False
     """Request use of a ``TunnelEndpoint`` to anonymize all our traffic."""
 
+    zero_copy_decoding: bool = False
+    """Decode payloads without copying: raw and varlen fields become ``memoryview`` slices of the packet."""
+
+    batch_verification: bool = False
+    """
+    Verify the signatures of incoming signed packets in batches, on worker threads, before handling them.
+    Unsigned packets that arrive while signed packets are being verified are handled after them, in order of arrival.
+    """
+
+    verification_batch_size: int = DEFAULT_VERIFICATION_BATCH_SIZE
+    """The maximum number of packets to collect in a single verification batch (batches also end every tick)."""
+
+    signature_cache_size: int = 0
+    """The number of signature verification results to remember for duplicate packets (0, the default, to disable)."""
+
+    signature_cache_timeout: float = DEFAULT_SIGNATURE_CACHE_TIMEOUT
+    """The number of seconds to remember a signature verification result for."""
+
 
 class Community(EZPackOverlay):
     """
@@ -98,6 +132,13 @@ class Community(EZPackOverlay):
 
         self.max_peers = settings.max_peers
         self.anonymize = settings.anonymize
+        self.zero_copy_decoding = settings.zero_copy_decoding
+        self.batch_verification = settings.batch_verification
+        self.verification_batch_size = settings.verification_batch_size
+        self.verification_batch: list[tuple[MessageHandlerCallable, Address, bytes]] = []
+        self.last_verification: Future | None = None
+        self.signature_cache = (VerifiedSignatureCache(settings.signature_cache_size, settings.signature_cache_timeout)
+                                if settings.signature_cache_size > 0 else None)
 
         if settings.anonymize:
             if isinstance(self.endpoint, TunnelEndpoint):
@@ -123,24 +164,6 @@ class Community(EZPackOverlay):
         self.add_message_handler(NewIntroductionRequestPayload, self.on_new_introduction_request)
         self.add_message_handler(NewIntroductionResponsePayload, self.on_new_introduction_response)
 
-        self.add_message_handler(255, self.on_deprecated_message)
-        self.add_message_handler(254, self.on_deprecated_message)
-        self.add_message_handler(253, self.on_deprecated_message)
-        self.add_message_handler(252, self.on_deprecated_message)
-        self.add_message_handler(251, self.on_deprecated_message)
-        self.add_message_handler(248, self.on_deprecated_message)
-        self.add_message_handler(247, self.on_deprecated_message)
-        self.add_message_handler(244, self.on_deprecated_message)
-        self.add_message_handler(243, self.on_deprecated_message)
-        self.add_message_handler(242, self.on_deprecated_message)
-        self.add_message_handler(241, self.on_deprecated_message)
-        self.add_message_handler(240, self.on_deprecated_message)
-        self.add_message_handler(239, self.on_deprecated_message)
-        self.add_message_handler(238, self.on_deprecated_message)
-        self.add_message_handler(237, self.on_deprecated_message)
-        self.add_message_handler(236, self.on_deprecated_message)
-        self.add_message_handler(235, self.on_deprecated_message)
-
         self.deprecated_message_names = {
             255: "reserved-255",
             254: "on-missing-sequence",
@@ -160,6 +183,8 @@ class Community(EZPackOverlay):
             236: "dynamic-settings",
             235: "missing-last-message"
         }
+        for msg_id in self.deprecated_message_names:
+            self.add_message_handler(msg_id, self.on_deprecated_message)
 
     def get_prefix(self) -> bytes:
         """
@@ -298,7 +323,7 @@ class Community(EZPackOverlay):
                                                  global_time,
                                                  extra_bytes,
                                                  supports_new_style=new_style)
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
+        auth = BinMemberAuthenticationPayload(self.my_peer.public_key_bin)
         dist = GlobalTimeDistributionPayload(global_time)
 
         return self._ez_pack(prefix or self._prefix, payload.msg_id, [auth, dist, payload])
@@ -350,7 +375,7 @@ class Community(EZPackOverlay):
                                                   extra_bytes,
                                                   intro_supports_new_style=new_style_intro,
                                                   peer_limit_reached=0 <= self.max_peers <= len(self.get_peers()))
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
+        auth = BinMemberAuthenticationPayload(self.my_peer.public_key_bin)
         dist = GlobalTimeDistributionPayload(global_time)
 
         if introduced and introduction is not None:
@@ -376,7 +401,7 @@ class Community(EZPackOverlay):
             payload = NewPuncturePayload(lan_walker, wan_walker, identifier)
         else:
             payload = PuncturePayload(lan_walker, wan_walker, identifier)
-        auth = BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin())
+        auth = BinMemberAuthenticationPayload(self.my_peer.public_key_bin)
         dist = GlobalTimeDistributionPayload(global_time)
 
         return self._ez_pack(self._prefix, payload.msg_id, [auth, dist, payload])
@@ -604,22 +629,131 @@ class Community(EZPackOverlay):
         probable_peer = self.network.get_verified_by_address(source_address)
         if probable_peer:
             probable_peer.last_response = time()
+        self.dispatch_packet(source_address, data, warn_unknown)
+
+    def on_packets(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Callback for when the Endpoint has a batch of new data for us.
+
+        The known peers are looked up once per source address in the batch and signed packets are verified as a single
+        batch (if batch verification is enabled). Subclasses that override ``on_packet`` receive the packets one by one.
+
+        :param packets: The address, bytes tuples that were received.
+        """
+        if type(self).on_packet is not Community.on_packet:
+            super().on_packets(packets)
+            return
+
+        now = time()
+        source_addresses = {source_address for source_address, _ in packets}
+        for source_address in source_addresses:
+            probable_peer = self.network.get_verified_by_address(source_address)
+            if probable_peer:
+                probable_peer.last_response = now
+        for source_address, data in packets:
+            self.dispatch_packet(source_address, data)
+        if self.verification_batch:
+            self.flush_verification_batch()
+
+    def dispatch_packet(self, source_address: Address, data: bytes, warn_unknown: bool = True) -> None:
+        """
+        Feed a packet to the handler of its message identifier, if it has our prefix.
+
+        :param source_address: The address the packet was received from.
+        :param data: The received bytes.
+        :param warn_unknown: Whether we should log incoming garbage data.
+        """
         if self._prefix != data[:22]:
             return
         msg_id = data[22]
         handler = self.decode_map[msg_id]
         if handler is not None:
-            try:
-                result: Coroutine | None = handler(source_address, data)
-                if iscoroutine(result):
-                    aw_result = cast("Awaitable", result)
-                    self.register_anonymous_task("on_packet", ensure_future(aw_result), ignore=(Exception,))
-            except Exception:
-                self.logger.exception("Exception occurred while handling packet!\n%s",
-                                      "".join(format_exception(*sys.exc_info())))
+            if self.batch_verification and (getattr(handler, "signed", False) or self.verification_pending()):
+                self.queue_verification(handler, source_address, data)
+            else:
+                self.handle_packet(handler, source_address, data)
         elif warn_unknown:
             self.logger.warning("Received unknown message: %d from (%s, %d)", msg_id, *source_address)
 
+    def handle_packet(self, handler: MessageHandlerCallable, source_address: Address, data: bytes) -> None:
+        """
+        Feed a packet to its message handler, logging any exceptions.
+        """
+        try:
+            result: Coroutine | None = handler(source_address, data)
+            if iscoroutine(result):
+                aw_result = cast("Awaitable", result)
+                self.register_anonymous_task("on_packet", ensure_future(aw_result), ignore=(Exception,))
+        except Exception:
+            self.logger.exception("Exception occurred while handling packet!\n%s",
+                                  "".join(format_exception(*sys.exc_info())))
+
+    def verification_pending(self) -> bool:
+        """
+        Check if there are signed packets that are waiting for their verification, to be handled.
+        """
+        return bool(self.verification_batch) or (self.last_verification is not None
+                                                 and not self.last_verification.done())
+
+    def queue_verification(self, handler: MessageHandlerCallable, source_address: Address, data: bytes) -> None:
+        """
+        Add a packet to the current verification batch.
+
+        Unsigned packets are also added while signed packets are pending, so they are not handled out of order.
+        The batch is verified at the end of the current event loop tick, or as soon as it is full.
+        """
+        self.verification_batch.append((handler, source_address, data))
+        if len(self.verification_batch) >= self.verification_batch_size:
+            self.flush_verification_batch()
+        elif len(self.verification_batch) == 1:
+            get_running_loop().call_soon(self.flush_verification_batch)
+
+    def flush_verification_batch(self) -> None:
+        """
+        Start verifying the signatures of the current verification batch.
+
+        The signatures are verified on a worker thread. The packets are handled afterward, in order of arrival.
+        """
+        batch, self.verification_batch = self.verification_batch, []
+        if not batch:
+            return
+        jobs = [self._signature_job(data) if getattr(handler, "signed", False) else None
+                for handler, _, data in batch]
+        self.last_verification = self.register_anonymous_task("verify_batch", self._verify_and_handle_batch,
+                                                              batch, jobs, self.last_verification)
+
+    def _signature_job(self, data: bytes) -> SignatureJob:
+        """
+        Extract the public key, signed message and signature from a signed packet (``None`` if it is malformed).
+        """
+        try:
+            auth, _ = self.serializer.unpack_serializable(BinMemberAuthenticationPayload, data, offset=23)
+            public_key = default_eccrypto.key_from_public_bin(auth.public_key_bin)
+            signature_length = default_eccrypto.get_signature_length(public_key)
+        except Exception:
+            return None
+        return public_key, data[:-signature_length], data[-signature_length:]
+
+    async def _verify_and_handle_batch(self, batch: list[tuple[MessageHandlerCallable, Address, bytes]],
+                                       jobs: list[SignatureJob], previous: Future | None) -> None:
+        """
+        Verify a batch of signatures on a worker thread and then handle the packets.
+
+        Packets that fail verification are still handled: their handler will repeat the check and report the error.
+        """
+        results = await self.register_executor_task("verify_signatures", verify_signatures, jobs, anon=True)
+        if results is None:
+            return  # We are shutting down
+        if previous is not None and not previous.done():
+            # Wait for the previous batch, to handle packets in the order they arrived.
+            await wait([previous])
+        for (handler, source_address, data), valid in zip(batch, results, strict=True):
+            self.verified_packet = data if valid else None
+            try:
+                self.handle_packet(handler, source_address, data)
+            finally:
+                self.verified_packet = None
+
     def walk_to(self, address: Address) -> None:
         """
         Attempt to walk directly to the given address.
@@ -667,6 +801,15 @@ class Community(EZPackOverlay):
         """
         return self.network.get_walkable_addresses(self.community_id)
 
+    def get_random_walkable_address(self, exclude: Container[Address] = ()) -> Address | None:
+        """
+        Get a random address that we know of but have not been contacted to become a peer.
+        """
+        if type(self).get_walkable_addresses is not Community.get_walkable_addresses:
+            # Respect subclasses that choose their own walkable addresses.
+            return super().get_random_walkable_address(exclude)
+        return self.network.get_random_walkable_address(self.community_id, exclude)
+
     def get_peers(self) -> list[Peer]:
         """
         Get the peers that we are currently connected to (and we have received signed messages from).
@@ -244,6 +244,10 @@ class ConfigBuilder:
 
         assert self.config["walker_interval"] >= 0
 
+        if self.config.get("rate_limit"):
+            assert self.config["rate_limit"].get("rate", 1) > 0, "The rate limit must be positive!"
+            assert self.config["rate_limit"].get("burst", 1) > 0, "The rate limit burst must be positive!"
+
         for overlay in self.config["overlays"]:
             assert overlay.get("class") is not None, "Missing class in overlay config!"
             assert overlay.get("key") is not None, f"Missing key in overlay config of {overlay['class']}!"
@@ -360,6 +364,19 @@ class ConfigBuilder:
         self.config["walker_interval"] = interval
         return self
 
+    def set_rate_limit(self, rate: float, burst: float, max_sources: int = 4096) -> ConfigBuilder:
+        """
+        Limit the number of packets per second that IPv8 accepts from each source IP address.
+
+        Packets from the bootstrap servers of the loaded overlays are never limited.
+
+        :param rate: the number of packets per second that each source is allowed to send.
+        :param burst: the number of packets that each source is allowed to send at once.
+        :param max_sources: the maximum number of sources to keep track of.
+        """
+        self.config["rate_limit"] = {"rate": rate, "burst": burst, "max_sources": max_sources}
+        return self
+
     def add_key(self, alias: str, generation: str, file_path: str) -> ConfigBuilder:
         """
         Add a key by alias and mode of generation, to be stored at a certain file path.
@@ -200,7 +200,14 @@ class NodePacker(Packer):
         return self.serializer.pack("ip_address", node.address) + \
             self.serializer.pack("varlenH", node.public_key.key_to_bin())
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def pack_into(self, buffer: bytearray, node: Node) -> None:  # type: ignore[override]
+        """
+        Pack the given node and append it to the buffer.
+        """
+        self.serializer.get_packer_for("ip_address").pack_into(buffer, node.address)
+        self.serializer.get_packer_for("varlenH").pack_into(buffer, node.public_key.key_to_bin())
+
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack the node format from the given offset in the data and add the unpacked object to the list.
         """
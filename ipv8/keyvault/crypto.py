@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 
 from cryptography.hazmat.primitives.asymmetric.ec import EllipticCurve
@@ -67,6 +68,8 @@ _CURVES: dict[str, tuple[EllipticCurve | None, str]] = {
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PUBLIC_KEY_CACHE_SIZE = 1024
+
 
 class ECCrypto:
     """
@@ -81,6 +84,18 @@ class ECCrypto:
         :author: Niels Zeilemaker
     """
 
+    def __init__(self, public_key_cache_size: int = DEFAULT_PUBLIC_KEY_CACHE_SIZE) -> None:
+        """
+        Create a new ECCrypto instance, with a bounded LRU cache of parsed public keys.
+
+        :param public_key_cache_size: the maximum number of public key objects to cache (0 to disable caching).
+        """
+        super().__init__()
+        self.public_key_cache_size = public_key_cache_size
+        self.public_key_cache: OrderedDict[bytes, PublicKey] = OrderedDict()
+        self.public_key_cache_hits = 0
+        self.public_key_cache_misses = 0
+
     @property
     def security_levels(self) -> list[str]:
         """
@@ -161,10 +176,23 @@ class ECCrypto:
     def key_from_public_bin(self, string: bytes) -> PublicKey:
         """
         Get the EC from a public key in binary format.
+
+        Parsed keys are cached: the same key object is returned for the same binary format.
         """
-        if string.startswith(b"LibNaCLPK:"):
-            return LibNaCLPK(string[10:])
-        return M2CryptoPK(keystring=string)
+        key = self.public_key_cache.get(string)
+        if key is not None:
+            self.public_key_cache.move_to_end(string)
+            self.public_key_cache_hits += 1
+            return key
+        self.public_key_cache_misses += 1
+
+        key = LibNaCLPK(string[10:]) if string.startswith(b"LibNaCLPK:") else M2CryptoPK(keystring=string)
+
+        if self.public_key_cache_size > 0:
+            self.public_key_cache[bytes(string)] = key
+            if len(self.public_key_cache) > self.public_key_cache_size:
+                self.public_key_cache.popitem(False)  # Pop the least recently used key
+        return key
 
     def get_signature_length(self, ec_key: PublicKey) -> int:
         """
@@ -181,12 +209,12 @@ class ECCrypto:
         assert isinstance(data, (bytes, str)), type(data)
         return ec_key.signature(data)
 
-    def is_valid_signature(self, ec_key: PublicKey, data: bytes, signature: bytes) -> bool:
+    def is_valid_signature(self, ec_key: PublicKey, data: bytes | memoryview, signature: bytes) -> bool:
         """
         Returns True when SIGNATURE matches the DIGEST made using EC.
         """
         assert isinstance(ec_key, Key), ec_key
-        assert isinstance(data, (bytes, str)), type(data)
+        assert isinstance(data, (bytes, str, memoryview)), type(data)
         assert isinstance(signature, (bytes, str)), type(signature)
 
         try:
@@ -195,7 +223,7 @@ class ECCrypto:
             return False
 
 
-# ECCrypto should be stateless.
+# ECCrypto should be stateless (other than its cache of parsed public keys).
 # Therefore, we can expose a global singleton for efficiency.
 # If you do need a ECCrypto with a state, be sure to use your own instance.
 default_eccrypto = ECCrypto()
@@ -74,7 +74,7 @@ class PublicKey(Key, metaclass=abc.ABCMeta):
         return False
 
     @abc.abstractmethod
-    def verify(self, signature: bytes, msg: bytes) -> bool:
+    def verify(self, signature: bytes, msg: bytes | memoryview) -> bool:
         """
         Verify that the given signature belongs to the given message for this public key.
         """
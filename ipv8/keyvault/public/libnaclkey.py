@@ -32,7 +32,7 @@ class LibNaCLPK(PublicKey):
         self.key = libnacl.public.PublicKey(pk)
         self.veri = libnacl.sign.Verifier(hex_vk)
 
-    def verify(self, signature: bytes, msg: bytes) -> bool:
+    def verify(self, signature: bytes, msg: bytes | memoryview) -> bool:
         """
         Verify whether a given signature is correct for a message.
 
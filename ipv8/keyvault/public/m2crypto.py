@@ -69,7 +69,7 @@ class M2CryptoPK(PublicKey):
         """
         return ceil(self.ec.curve.key_size / 8.0) * 2
 
-    def verify(self, signature: bytes, msg: bytes) -> bool:
+    def verify(self, signature: bytes, msg: bytes | memoryview) -> bool:
         """
         Verify whether a given signature is correct for a message.
 
@@ -93,7 +93,7 @@ class M2CryptoPK(PublicKey):
         try:
             pub = cast("M2CryptoPK", self.pub())
             pub_ec = cast("EllipticCurvePublicKey", pub.ec)
-            pub_ec.verify(encode_dss_signature(ri, si), msg, ec.ECDSA(hashes.SHA1()))
+            pub_ec.verify(encode_dss_signature(ri, si), bytes(msg), ec.ECDSA(hashes.SHA1()))
             return True
         except InvalidSignature:
             return False
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+
+DEFAULT_SIGNATURE_CACHE_SIZE = 1024
+DEFAULT_SIGNATURE_CACHE_TIMEOUT = 10.0
+
+
+class VerifiedSignatureCache:
+    """
+    A small, time-bounded cache of signature verification results for byte-identical packets.
+
+    Packets are identified by a digest of their full binary format, which includes the public key, the signed message
+    and the signature. A cached result is therefore only ever reused for the exact same packet.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_SIGNATURE_CACHE_SIZE,
+                 timeout: float = DEFAULT_SIGNATURE_CACHE_TIMEOUT) -> None:
+        """
+        Create a new cache that holds at most ``max_size`` results, for at most ``timeout`` seconds each.
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.timeout = timeout
+        # Entries are inserted in order of time, so the oldest entries are always first.
+        self.entries: OrderedDict[bytes, tuple[float, bool]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(packet: bytes | memoryview) -> bytes:
+        """
+        Get the cache key for the given (signed) packet.
+        """
+        return blake2b(packet, digest_size=20).digest()
+
+    def get(self, digest: bytes) -> bool | None:
+        """
+        Get the cached verification result for the given packet digest, or ``None`` if it is not (or no longer) known.
+        """
+        entry = self.entries.get(digest)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def add(self, digest: bytes, valid: bool) -> None:
+        """
+        Remember the verification result for the given packet digest.
+        """
+        now = time.monotonic()
+        while self.entries:
+            oldest_digest, (expiry, _) = next(iter(self.entries.items()))
+            if expiry >= now and len(self.entries) < self.max_size:
+                break
+            del self.entries[oldest_digest]
+        self.entries.pop(digest, None)
+        self.entries[digest] = (now + self.timeout, valid)
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        Get the number of cache hits and misses and the number of cached results.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -16,6 +16,7 @@ if TYPE_CHECKING:
     from collections.abc import Sequence
 
     from .keyvault.keys import PrivateKey
+    from .keyvault.signature_cache import VerifiedSignatureCache
     from .messaging.serialization import Serializable
     from .requestcache import NumberCache, NumberCacheWithName, RequestCache
 
@@ -79,6 +80,15 @@ class EZPackOverlay(Overlay, ABC):
     Base class that provides you with some easy ways to pack and unpack payloads.
     """
 
+    zero_copy_decoding: bool = False
+    """Decode incoming packets from a ``memoryview``, see ``decoding_buffer()``."""
+
+    verified_packet: bytes | None = None
+    """A packet of which the signature has already been verified, while it is being handled."""
+
+    signature_cache: VerifiedSignatureCache | None = None
+    """The cache of verification results for duplicate packets, if any."""
+
     @abstractmethod
     def get_prefix(self) -> bytes:
         """
@@ -125,29 +135,56 @@ class EZPackOverlay(Overlay, ABC):
         :return: the serialized message
         """
         if sig:
-            payloads = (BinMemberAuthenticationPayload(self.my_peer.public_key.key_to_bin()), *payloads)
+            payloads = (BinMemberAuthenticationPayload(self.my_peer.public_key_bin), *payloads)
         return self._ez_pack(self.get_prefix(), msg_num, payloads, sig)
 
     def _ez_pack(self, prefix: bytes, msg_num: int, payloads: Sequence[Payload], sig: bool = True) -> bytes:
-        packet = prefix + bytes([msg_num]) + self.serializer.pack_serializable_list(payloads)
+        packet = bytearray(prefix)
+        packet.append(msg_num)
+        self.serializer.pack_serializable_list_into(payloads, packet)
         if sig:
-            packet += default_eccrypto.create_signature(cast("PrivateKey", self.my_peer.key), packet)
-        return packet
+            packet += default_eccrypto.create_signature(cast("PrivateKey", self.my_peer.key), bytes(packet))
+        return bytes(packet)
+
+    def decoding_buffer(self, data: bytes) -> bytes | memoryview:
+        """
+        Get the buffer to decode the given packet data from.
+
+        If ``zero_copy_decoding`` is enabled, this is a ``memoryview`` of the data. Decoding from this view does not
+        copy the data: "raw", "varlen" and nested payload fields are ``memoryview`` slices of the original packet.
+        Note that these slices keep the entire packet in memory, as long as they exist.
+        """
+        return memoryview(data) if self.zero_copy_decoding else data
 
-    def _verify_signature(self, auth: BinMemberAuthenticationPayload, data: bytes) -> tuple[bool, bytes]:
+    def _verify_signature(self, auth: BinMemberAuthenticationPayload,
+                          data: bytes | memoryview) -> tuple[bool, bytes | memoryview]:
         ec = default_eccrypto
         public_key = ec.key_from_public_bin(auth.public_key_bin)
         signature_length = ec.get_signature_length(public_key)
         remainder = data[2 + len(auth.public_key_bin):-signature_length]
-        signature = data[-signature_length:]
-        return ec.is_valid_signature(public_key, data[:-signature_length], signature), remainder
+        cache = self.signature_cache
+        if self.verified_packet is not None and getattr(data, "obj", data) is self.verified_packet:
+            if cache is not None:
+                cache.add(cache.digest(data), True)
+            return True, remainder
+        if cache is None:
+            return ec.is_valid_signature(public_key, data[:-signature_length], bytes(data[-signature_length:])), \
+                remainder
+
+        digest = cache.digest(data)
+        valid = cache.get(digest)
+        if valid is None:
+            valid = ec.is_valid_signature(public_key, data[:-signature_length], bytes(data[-signature_length:]))
+            cache.add(digest, valid)
+        return valid, remainder
 
     def _ez_unpack_auth(self,
                         payload_class: type[UT],
                         data: bytes) -> tuple[BinMemberAuthenticationPayload, GlobalTimeDistributionPayload, UT]:
         # UNPACK
-        auth, _ = self.serializer.unpack_serializable(BinMemberAuthenticationPayload, data, offset=23)
-        signature_valid, remainder = self._verify_signature(auth, data)
+        buffer = self.decoding_buffer(data)
+        auth, _ = self.serializer.unpack_serializable(BinMemberAuthenticationPayload, buffer, offset=23)
+        signature_valid, remainder = self._verify_signature(auth, buffer)
         fmt: list[type[Serializable]] = [GlobalTimeDistributionPayload, payload_class]
         unpacked = self.serializer.unpack_serializable_list(fmt, remainder, offset=23)
         # ASSERT
@@ -164,7 +201,7 @@ class EZPackOverlay(Overlay, ABC):
         # UNPACK
         fmt: list[type[Serializable]] = ([GlobalTimeDistributionPayload, payload_class] if global_time
                                          else [payload_class])
-        unpacked = self.serializer.unpack_serializable_list(fmt, data, offset=23)
+        unpacked = self.serializer.unpack_serializable_list(fmt, self.decoding_buffer(data), offset=23)
         # PRODUCE
         return (cast("tuple[GlobalTimeDistributionPayload, UT]", unpacked) if global_time
                 else cast("UT", unpacked[0]))
@@ -205,8 +242,9 @@ def lazy_wrapper(*payloads: type[Payload]) -> Callable[[LazyWrappable], MessageH
         @wraps(func)
         def wrapper(self: EZPackOverlayInst, source_address: Address, data: bytes) -> Coroutine | None:
             # UNPACK
-            auth, _ = self.serializer.unpack_serializable(BinMemberAuthenticationPayload, data, offset=23)
-            signature_valid, remainder = self._verify_signature(auth, data)
+            buffer = self.decoding_buffer(data)
+            auth, _ = self.serializer.unpack_serializable(BinMemberAuthenticationPayload, buffer, offset=23)
+            signature_valid, remainder = self._verify_signature(auth, buffer)
             unpacked = self.serializer.unpack_serializable_list(payloads, remainder, offset=23)
             # ASSERT
             if not signature_valid:
@@ -218,6 +256,7 @@ def lazy_wrapper(*payloads: type[Payload]) -> Callable[[LazyWrappable], MessageH
             if peer:
                 peer.add_address(source_address)
             return func(self, peer or Peer(auth.public_key_bin, source_address), *unpacked)
+        wrapper.signed = True  # type: ignore[attr-defined]
         return wrapper  # type: ignore[return-value]
     return decorator
 
@@ -242,8 +281,9 @@ def lazy_wrapper_wd(*payloads: type[Payload]) -> Callable[[LazyWDWrappable], Mes
         @wraps(func)
         def wrapper(self: EZPackOverlayInst, source_address: Address, data: bytes) -> Coroutine | None:
             # UNPACK
-            auth, _ = self.serializer.unpack_serializable(BinMemberAuthenticationPayload, data, offset=23)
-            signature_valid, remainder = self._verify_signature(auth, data)
+            buffer = self.decoding_buffer(data)
+            auth, _ = self.serializer.unpack_serializable(BinMemberAuthenticationPayload, buffer, offset=23)
+            signature_valid, remainder = self._verify_signature(auth, buffer)
             unpacked = self.serializer.unpack_serializable_list(payloads, remainder, offset=23)
             # ASSERT
             if not signature_valid:
@@ -256,6 +296,7 @@ def lazy_wrapper_wd(*payloads: type[Payload]) -> Callable[[LazyWDWrappable], Mes
             if peer:
                 peer.add_address(source_address)
             return func(self, peer or Peer(auth.public_key_bin, source_address), *output)
+        wrapper.signed = True  # type: ignore[attr-defined]
         return wrapper  # type: ignore[return-value]
     return decorator
 
@@ -278,7 +319,7 @@ def lazy_wrapper_unsigned(*payloads: type[Payload]) -> Callable[[LazyUnsignedWra
         @wraps(func)
         def wrapper(self: EZPackOverlayInst, source_address: Address, data: bytes) -> Coroutine | None:
             # UNPACK
-            unpacked = self.serializer.unpack_serializable_list(payloads, data, offset=23)
+            unpacked = self.serializer.unpack_serializable_list(payloads, self.decoding_buffer(data), offset=23)
             return func(self, source_address, *unpacked)
         return wrapper  # type: ignore[return-value]
     return decorator
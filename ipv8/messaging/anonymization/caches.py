@@ -99,6 +99,7 @@ class RetryRequestCache(NumberCacheWithName):
         self.retry_func = retry_func
         self.timeout = timeout
         self.logger = logging.getLogger(__name__)
+        self.racers: dict[int, Hop] = {}
 
     @property
     def timeout_delay(self) -> float:
@@ -107,6 +108,18 @@ class RetryRequestCache(NumberCacheWithName):
         """
         return float(self.timeout)
 
+    def add_racer(self, hop: Hop) -> int:
+        """
+        Register a hop that we are trying to add to the circuit, in parallel with the other registered hops.
+
+        :return: the packet identifier to use for the CREATE/EXTEND of the given hop.
+        """
+        identifier = self.packet_identifier
+        while identifier in self.racers:
+            identifier = secrets.randbelow(2**16)
+        self.racers[identifier] = hop
+        return identifier
+
     def on_timeout(self) -> None:
         """
         Retry until we run out of candidates. Otherwise, remove the circuit.
@@ -138,6 +151,7 @@ class PingRequestCache(RandomNumberCacheWithName):
         Create a new cache.
         """
         super().__init__(community.request_cache, self.name)
+        self.sent = time.time()
 
     def on_timeout(self) -> None:
         """
@@ -45,6 +45,7 @@ from .payload import (
 )
 from .tunnel import (
     BACKWARD,
+    CIRCUIT_STATE_CLOSING,
     CIRCUIT_STATE_EXTENDING,
     CIRCUIT_STATE_READY,
     CIRCUIT_TYPE_DATA,
@@ -58,6 +59,7 @@ from .tunnel import (
     PEER_FLAG_RELAY,
     PEER_FLAG_SPEED_TEST,
     PING_INTERVAL,
+    CandidateTable,
     Circuit,
     Hop,
     RelayRoute,
@@ -95,6 +97,9 @@ def unpack_cell(payload_cls: type[Serializable]) -> Callable[...,  # User functi
         def on_message(source_address: str, payload: DataPayload):
             pass
 
+    Cells are never decoded from a ``memoryview`` of their data, not even if ``zero_copy_decoding`` is enabled: the
+    fields of control cells (e.g., keys) outlive the packet. Only exiting data is decoded zero-copy, see ``on_data()``.
+
     :param payload_cls: the payload class to create an instance for.
     """
 
@@ -131,6 +136,9 @@ class TunnelSettings(CommunitySettings):
     unstable_timeout = 60
     # Maximum number of seconds adding a single hop to a circuit is allowed to take.
     next_hop_timeout = 10
+    # Number of candidates that are sent a CREATE/EXTEND in parallel when adding a hop to a circuit. The first candidate
+    # to respond becomes the next hop and the others are destroyed. Relays in between need to support this as well.
+    next_hop_race_size = 1
 
     swarm_lookup_interval = 30
     swarm_connection_limit = 15
@@ -139,6 +147,32 @@ class TunnelSettings(CommunitySettings):
     # to flow over the circuit (i.e. bandwidth payouts to intermediate nodes in a circuit).
     remove_tunnel_delay = 5
 
+    # Maximum number of received cells that the PythonCryptoEndpoint processes as a single batch (1 disables batching).
+    # Batches are grouped per circuit and processed at the latest at the end of the current event loop iteration.
+    cell_batch_size = 1
+    # Perform the crypto of cell batches on the default thread pool, instead of on the event loop thread.
+    threaded_cell_crypto = False
+    # Number of worker threads to shard circuits over, by circuit id, for threaded cell crypto (0 uses the default
+    # thread pool). A sharded circuit always has its cells handled by the same thread.
+    cell_crypto_shards = 0
+
+    # Maximum number of bytes per second that a single relay circuit may forward (0 disables the limit).
+    relay_rate_limit = 0
+    # Maximum number of bytes per second that all relay circuits together may forward (0 disables the limit).
+    relay_total_rate_limit = 0
+    # Maximum number of bytes that a rate limited relay circuit may forward at once.
+    relay_burst_size = 64 * 1024
+    # Maximum number of cells that are queued per rate limited relay circuit (additional cells are dropped).
+    relay_queue_size = 256
+    # Number of bytes that each queued relay circuit may forward per round of the deficit round robin scheduler (at
+    # least 1).
+    relay_quantum = 1500
+
+    # Number of spare circuits to keep per circuit pool (0 disables the pools). Pools exist per hop count that tunnels
+    # are built for and per hop count and exit flags that are explicitly added. Spare circuits are promoted to regular
+    # circuits when circuits are removed or needed.
+    circuit_pool_size = 0
+
     _peer_flags: set[int] = {PEER_FLAG_RELAY, PEER_FLAG_SPEED_TEST}
 
     _max_relay_early = 8
@@ -216,7 +250,10 @@ class TunnelCommunity(Community):
         self.add_cell_handler(TestResponsePayload, self.on_test_response)
 
         self.circuits_needed: dict[int, int] = defaultdict(int)
-        self.candidates: dict[Peer, list[int]] = {}  # Keeps track of the candidates that want to be a relay/exit node
+        self.circuit_pools: set[tuple[int, tuple[int, ...] | None]] = set()
+        self.circuit_pool_hits = 0
+        self.circuit_pool_misses = 0
+        self.candidates = CandidateTable()  # Keeps track of the candidates that want to be a relay/exit node
 
         self.logger.info("Exit settings: BT=%s, IPv8=%s",
                          PEER_FLAG_EXIT_BT in self.settings.peer_flags,
@@ -237,6 +274,7 @@ class TunnelCommunity(Community):
         self.crypto_endpoint.setup_tunnels(self, self.settings)
 
         self.circuits = self.crypto_endpoint.circuits
+        self.circuit_index = self.crypto_endpoint.circuit_index
         self.relay_from_to = self.crypto_endpoint.relays
         self.exit_sockets = self.crypto_endpoint.exit_sockets
 
@@ -262,6 +300,9 @@ class TunnelCommunity(Community):
 
         await super().unload()
 
+        if isinstance(self.crypto_endpoint, PythonCryptoEndpoint):
+            self.crypto_endpoint.shutdown()
+
     def get_serializer(self) -> Serializer:
         """
         Extend our serializer with the ability to (un)pack exit node flags.
@@ -293,6 +334,8 @@ class TunnelCommunity(Community):
         """
         for circuit_length, num_circuits in self.circuits_needed.items():
             num_to_build = max(0, num_circuits - len(self.find_circuits(state=None, hops=circuit_length)))
+            while num_to_build and self.promote_spare_circuit(circuit_length):
+                num_to_build -= 1
             if not num_to_build:
                 continue
             self.logger.info("Want %d data circuits of length %d", num_to_build, circuit_length)
@@ -300,6 +343,7 @@ class TunnelCommunity(Community):
                 if not self.create_circuit(circuit_length):
                     self.logger.info("Circuit creation of %d circuits failed, no need to continue", num_to_build)
                     break
+        self.fill_circuit_pools()
         self.do_remove()
 
     def build_tunnels(self, hops: int) -> None:
@@ -310,8 +354,54 @@ class TunnelCommunity(Community):
         """
         if hops > 0:
             self.circuits_needed[hops] = self.settings.max_circuits
+            self.circuit_pools.add((hops, None))
             self.do_circuits()
 
+    def add_circuit_pool(self, hops: int, exit_flags: Collection[int] | None = None) -> None:
+        """
+        Signal that we want to keep spare data circuits of a given number of hops (and potentially exit flags).
+
+        The number of spare circuits is dictated by the ``circuit_pool_size`` setting.
+        """
+        self.circuit_pools.add((hops, tuple(sorted(exit_flags)) if exit_flags is not None else None))
+
+    def fill_circuit_pools(self) -> None:
+        """
+        Create spare circuits for the circuit pools that have less than ``circuit_pool_size`` spare circuits.
+        """
+        for hops, exit_flags in self.circuit_pools:
+            num_spares = len([c for c in self.circuits.values()
+                              if c.spare and c.goal_hops == hops and c.requested_exit_flags == exit_flags])
+            for _ in range(self.settings.circuit_pool_size - num_spares):
+                circuit = self.create_circuit(hops, exit_flags=exit_flags)
+                if not circuit:
+                    break
+                circuit.spare = True
+
+    def promote_spare_circuit(self, hops: int, exit_flags: Collection[int] | None = None) -> Circuit | None:
+        """
+        Turn a spare circuit of the given number of hops (and exit flags) into a regular circuit, preferring spare
+        circuits that are ready. This updates the hit and miss counts of the circuit pools.
+
+        :return: None if there is no circuit pool for the given hops and exit flags, or if it has no spare circuits.
+        """
+        pool_exit_flags = tuple(sorted(exit_flags)) if exit_flags is not None else None
+        if (hops, pool_exit_flags) not in self.circuit_pools or self.settings.circuit_pool_size <= 0:
+            return None
+
+        spares = [c for c in self.circuits.values()
+                  if c.spare and c.goal_hops == hops and c.requested_exit_flags == pool_exit_flags
+                  and c.state != CIRCUIT_STATE_CLOSING]
+        if not spares:
+            self.circuit_pool_misses += 1
+            return None
+
+        circuit = next((c for c in spares if c.state == CIRCUIT_STATE_READY), spares[0])
+        circuit.spare = False
+        self.circuit_pool_hits += 1
+        self.logger.info("Promoted spare circuit %d (state: %s)", circuit.circuit_id, circuit.state)
+        return circuit
+
     def tunnels_ready(self, hops: int) -> float:
         """
         Fraction of circuits that are available for the given hop count.
@@ -360,8 +450,8 @@ class TunnelCommunity(Community):
         """
         Get all the peers that we can create circuits with.
         """
-        return [peer for peer, flags in self.candidates.items()
-                if set(requested_flags) <= set(flags) and self.crypto.is_key_compatible(peer.public_key)]
+        return [peer for peer in self.candidates.get_peers(*requested_flags)
+                if self.crypto.is_key_compatible(peer.public_key)]
 
     def get_max_time(self, circuit_id: int) -> float:
         """
@@ -374,11 +464,11 @@ class TunnelCommunity(Community):
         """
         Get circuits of the given type and state (and potentially exit flags and a given number of hops).
         """
-        return [c for c in self.circuits.values()
-                if (state is None or c.state == state)
-                and (ctype is None or c.ctype == ctype)
-                and (exit_flags is None or set(exit_flags) <= set(c.exit_flags))
-                and (hops is None or hops == c.goal_hops)]
+        circuits = self.circuit_index.find(ctype, state, hops)
+        if exit_flags is None:
+            return circuits
+        required_flags = set(exit_flags)
+        return [c for c in circuits if required_flags.issubset(c.exit_flags)]
 
     def create_circuit(self, goal_hops: int, ctype: str = CIRCUIT_TYPE_DATA,
                        exit_flags: Collection[int] | None = None, required_exit: Peer | None = None,
@@ -426,6 +516,7 @@ class TunnelCommunity(Community):
         # Finally, construct the Circuit object and send the CREATE message
         circuit_id = self._generate_circuit_id()
         self.circuits[circuit_id] = circuit = Circuit(circuit_id, goal_hops, ctype, required_exit, info_hash)
+        circuit.requested_exit_flags = tuple(sorted(exit_flags)) if exit_flags is not None else None
         self.send_initial_create(circuit, possible_first_hops,
                                  self.settings.circuit_timeout // self.settings.next_hop_timeout)
 
@@ -458,22 +549,26 @@ class TunnelCommunity(Community):
             self.request_cache.pop(RetryRequestCache, circuit.circuit_id)
             self.logger.info("Retrying first hop for circuit %d", circuit.circuit_id)
 
-        first_hop = candidate_peers[0]
-        alt_first_hops = [c for c in candidate_peers if c != first_hop]
-
-        circuit.unverified_hop = Hop(first_hop, flags=self.candidates.get(first_hop))
-        circuit.unverified_hop.dh_secret, circuit.unverified_hop.dh_first_part = self.crypto.generate_diffie_secret()
-
-        self.logger.info("Adding first hop %s:%d to circuit %d", *(*first_hop.address, circuit.circuit_id))
+        first_hops = candidate_peers[:max(1, self.settings.next_hop_race_size)]
+        alt_first_hops = [c for c in candidate_peers if c not in first_hops]
 
         cache = RetryRequestCache(self, circuit, alt_first_hops, max_tries - 1,
                                   self.send_initial_create, self.settings.next_hop_timeout)
         self.request_cache.add(cache)
 
-        self.send_cell(first_hop.address, CreatePayload(circuit.circuit_id,
-                                                        cache.packet_identifier,
-                                                        self.my_peer.public_key.key_to_bin(),
-                                                        circuit.unverified_hop.dh_first_part))
+        for first_hop in first_hops:
+            hop = Hop(first_hop, flags=self.candidates.get(first_hop))
+            hop.dh_secret, hop.dh_first_part = self.crypto.generate_diffie_secret()
+            identifier = cache.add_racer(hop)
+            if identifier == cache.packet_identifier:
+                circuit.unverified_hop = hop
+
+            self.logger.info("Adding first hop %s:%d to circuit %d", *(*first_hop.address, circuit.circuit_id))
+
+            self.send_cell(first_hop.address, CreatePayload(circuit.circuit_id,
+                                                            identifier,
+                                                            self.my_peer.public_key.key_to_bin(),
+                                                            hop.dh_first_part))
 
     @task
     async def remove_circuit(self, circuit_id: int, additional_info: str = "", remove_now: bool = False,
@@ -494,8 +589,15 @@ class TunnelCommunity(Community):
         if destroy:
             self.destroy_circuit(circuit_to_remove, reason=destroy)
 
+        closing = circuit_to_remove.state == CIRCUIT_STATE_CLOSING
         circuit_to_remove.close(additional_info)
 
+        # Immediately replace a removed data circuit with a spare circuit, if we still need it.
+        hops = circuit_to_remove.goal_hops
+        if (not closing and not circuit_to_remove.spare and circuit_to_remove.ctype == CIRCUIT_TYPE_DATA
+                and len(self.find_circuits(hops=hops)) < self.circuits_needed.get(hops, 0)):
+            self.promote_spare_circuit(hops, circuit_to_remove.requested_exit_flags)
+
         if not remove_now or self.settings.remove_tunnel_delay > 0:
             await sleep(self.settings.remove_tunnel_delay)
 
@@ -518,7 +620,10 @@ class TunnelCommunity(Community):
 
         self.logger.info("Removing relay %d %s", circuit_id, additional_info)
 
-        return self.relay_from_to.pop(circuit_id, None)
+        relay = self.relay_from_to.pop(circuit_id, None)
+        if relay and isinstance(self.crypto_endpoint, PythonCryptoEndpoint):
+            self.crypto_endpoint.drop_relay_queue(relay)
+        return relay
 
     @task
     async def remove_exit_socket(self, circuit_id: int, additional_info: str = "", remove_now: bool = False,
@@ -605,6 +710,19 @@ class TunnelCommunity(Community):
         packet = self.ezr_pack(DestroyPayload.msg_id, DestroyPayload(circuit_id, reason))
         self.send_packet(target, packet)
 
+    def select_racer(self, cache: RetryRequestCache, identifier: int) -> None:
+        """
+        Make the hop that responded to the CREATE/EXTEND with the given identifier the unverified hop of its circuit.
+
+        First hops that are still racing are destroyed. Losing candidates for later hops are destroyed by the last hop.
+        """
+        circuit = cache.circuit
+        circuit.unverified_hop = cache.racers.pop(identifier)
+        if not circuit.hops:
+            for hop in cache.racers.values():
+                self.send_destroy(hop.address, circuit.circuit_id, 0)
+        cache.racers.clear()
+
     def _ours_on_created_extended(self, circuit_id: int, payload: CreatedPayload | ExtendedPayload) -> None:
         circuit = self.circuits[circuit_id]
         hop = circuit.unverified_hop
@@ -656,48 +774,39 @@ class TunnelCommunity(Community):
         """
         Extend a circuit by choosing one of the given candidates.
         """
+        race_size = max(1, self.settings.next_hop_race_size)
         become_exit = circuit.goal_hops - 1 == len(circuit.hops)
         if become_exit and circuit.required_exit:
             # Set the required exit according to the circuit setting (e.g. for linking e2e circuits)
-            extend_hop_public_bin = circuit.required_exit.public_key.key_to_bin()
-            extend_hop_addr = circuit.required_exit.address
+            extend_hops = [(circuit.required_exit.public_key.key_to_bin(), circuit.required_exit.address)]
 
         else:
-            # Chose the next candidate. Ensure we didn't use this candidate already, and its key is compatible.
+            # Chose the next candidates. Ensure we didn't use these candidates already, and their keys are compatible.
             exclude = [hop.public_key_bin for hop in circuit.hops] + [self.my_peer.public_key.key_to_bin()]
             if circuit.required_exit:
                 exclude.append(circuit.required_exit.public_key.key_to_bin())
             candidates = [c for c in candidates if c not in exclude and self.crypto.key_from_public_bin(c)]
-            extend_hop_public_bin = next(iter(candidates), b"")
-            extend_hop_addr = ("0.0.0.0", 0)
+            extend_hops = [(c, ("0.0.0.0", 0)) for c in candidates[:race_size]]
 
-            if not extend_hop_public_bin:
+            if not extend_hops:
                 # By default, nodes will give a number of candidates to which we can extend the circuit (i.e., peers
                 # that have already been punctured). However, it could be that there simply aren't enough candidates
                 # available. When this happens, we try to extend to exit nodes (which we assume are connectable).
                 choices = [peer for peer in self.get_candidates(PEER_FLAG_EXIT_BT, PEER_FLAG_RELAY)
                            if peer.public_key.key_to_bin() not in exclude]
-                if choices:
-                    peer = random.choice(choices)
-                    extend_hop_public_bin = peer.public_key.key_to_bin()
-                    extend_hop_addr = peer.address
+                for peer in random.sample(choices, min(race_size, len(choices))):
+                    extend_hops.append((peer.public_key.key_to_bin(), peer.address))
                     self.logger.info("No candidates to extend to, trying exit node %s instead", peer)
 
-        if extend_hop_public_bin:
+        if extend_hops:
             if self.request_cache.has(RetryRequestCache, circuit.circuit_id):
                 self.request_cache.pop(RetryRequestCache, circuit.circuit_id)
                 self.logger.info("Retrying hop %d for circuit %d", len(circuit.hops) + 1, circuit.circuit_id)
 
-            extend_hop_public_key = self.crypto.key_from_public_bin(extend_hop_public_bin)
-            hop = Hop(Peer(extend_hop_public_key), flags=self.candidates.get(Peer(extend_hop_public_bin)))
-            hop.dh_secret, hop.dh_first_part = self.crypto.generate_diffie_secret()
-            circuit.unverified_hop = hop
-
-            self.logger.info("Extending circuit %d with %s", circuit.circuit_id, hexlify(extend_hop_public_bin))
-
             # Only retry if we are allowed to use another node
             if not become_exit or not circuit.required_exit:
-                alt_candidates = [c for c in candidates if c != extend_hop_public_bin]
+                extend_hops_bin = [extend_hop_public_bin for extend_hop_public_bin, _ in extend_hops]
+                alt_candidates = [c for c in candidates if c not in extend_hops_bin]
             else:
                 alt_candidates = []
 
@@ -705,11 +814,23 @@ class TunnelCommunity(Community):
                                       self.send_extend, self.settings.next_hop_timeout)
             self.request_cache.add(cache)
 
-            self.send_cell(circuit.hop.address, ExtendPayload(circuit.circuit_id,
-                                                              cache.packet_identifier,
-                                                              circuit.unverified_hop.public_key_bin,
-                                                              circuit.unverified_hop.dh_first_part,
-                                                              extend_hop_addr))
+            for extend_hop_public_bin, extend_hop_addr in extend_hops:
+                extend_hop_public_key = self.crypto.key_from_public_bin(extend_hop_public_bin)
+                hop = Hop(Peer(extend_hop_public_key), flags=self.candidates.get(Peer(extend_hop_public_bin)))
+                hop.dh_secret, hop.dh_first_part = self.crypto.generate_diffie_secret()
+                identifier = cache.add_racer(hop)
+                if identifier == cache.packet_identifier:
+                    circuit.unverified_hop = hop
+
+                self.logger.info("Extending circuit %d with %s", circuit.circuit_id, hexlify(extend_hop_public_bin))
+
+                # When racing, our current last hop sends a CREATE to every candidate and destroys all but the first
+                # candidate to respond.
+                self.send_cell(circuit.hop.address, ExtendPayload(circuit.circuit_id,
+                                                                  identifier,
+                                                                  hop.public_key_bin,
+                                                                  hop.dh_first_part,
+                                                                  extend_hop_addr))
 
         else:
             self.remove_circuit(circuit.circuit_id, "no candidates to extend")
@@ -862,8 +983,10 @@ class TunnelCommunity(Community):
 
             self.logger.info("Got CREATED message forward as EXTENDED to origin.")
 
-            if request.from_circuit_id not in self.exit_sockets:
+            if request.from_circuit_id not in self.exit_sockets or request.from_circuit_id in self.relay_from_to:
+                # This also happens when the circuit owner raced its extend and another candidate already responded.
                 self.logger.info("Created for unknown exit socket %s", request.from_circuit_id)
+                self.send_destroy(source_address, payload.circuit_id, 0)
                 return
             session_keys = self.exit_sockets[request.from_circuit_id].hop.keys
             self.remove_exit_socket(request.from_circuit_id, remove_now=True)
@@ -882,10 +1005,15 @@ class TunnelCommunity(Community):
         cache = self.request_cache.get(RetryRequestCache, circuit_id)
 
         # Check payload.identifier to ensure we're not accepting old created messages that have since timed out.
-        if cache and cache.packet_identifier == payload.identifier:
+        if cache and payload.identifier in cache.racers:
+            self.select_racer(cache, payload.identifier)
             self._ours_on_created_extended(circuit_id, payload)
         else:
             self.logger.warning("Received unexpected created for circuit %d", circuit_id)
+            circuit = self.circuits.get(circuit_id)
+            if circuit and circuit.hops and source_address != circuit.hop.address:
+                # A first hop that lost the race (or timed out) joined our circuit after all.
+                self.send_destroy(source_address, circuit_id, 0)
 
     @unpack_cell(ExtendPayload)
     async def on_extend(self, source_address: Address, payload: ExtendPayload, _: int | None) -> None:
@@ -951,10 +1079,11 @@ class TunnelCommunity(Community):
         """
         circuit_id = payload.circuit_id
         cache = self.request_cache.get(RetryRequestCache, circuit_id)
-        if not cache or cache.packet_identifier != payload.identifier:
+        if not cache or payload.identifier not in cache.racers:
             self.logger.warning("Received unexpected extended for circuit %s", circuit_id)
             return
 
+        self.select_racer(cache, payload.identifier)
         self._ours_on_created_extended(circuit_id, payload)
 
     def on_raw_data(self, circuit: Circuit, origin: Address, data: bytes) -> None:
@@ -969,7 +1098,7 @@ class TunnelCommunity(Community):
 
         Data is readable only if this handler is (a) an exit node or (b) the one that created the circuit.
         """
-        payload, _ = self.serializer.unpack_serializable(DataPayload, data, offset=23)
+        payload, _ = self.serializer.unpack_serializable(DataPayload, self.decoding_buffer(data), offset=23)
 
         # If it's our circuit, the messenger is the candidate assigned to that circuit and the DATA's destination
         # is set to the zero-address then the packet is from the outside world and addressed to us from.
@@ -983,6 +1112,8 @@ class TunnelCommunity(Community):
         circuit = self.circuits.get(circuit_id, None)
         if circuit and origin and sock_addr == circuit.hop.address:
             circuit.beat_heart()
+            # Only exiting data may remain a view of the cell, data that is meant for us is delivered as bytes.
+            data = bytes(data)
 
             e2e_data = circuit.ctype in [CIRCUIT_TYPE_RP_DOWNLOADER, CIRCUIT_TYPE_RP_SEEDER]
             if DataChecker.could_be_ipv8(data) and not e2e_data:
@@ -1034,12 +1165,13 @@ class TunnelCommunity(Community):
             self.logger.warning("Invalid ping circuit_id")
             return
 
-        self.request_cache.pop(PingRequestCache, payload.identifier)
+        cache = self.request_cache.pop(PingRequestCache, payload.identifier)
         self.logger.debug("Got pong from %s", source_address)
 
         circuit = self.circuits.get(payload.circuit_id)
         if circuit:
             circuit.beat_heart()
+            circuit.update_rtt(time.time() - cache.sent)
 
     def do_ping(self, exclude: list[int] | None = None) -> None:
         """
@@ -3,8 +3,12 @@ from __future__ import annotations
 import abc
 import logging
 import struct
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, cast
+import time
+from asyncio import Future, gather, get_running_loop, wait
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import TYPE_CHECKING, Any, cast
 
 import libnacl
 from cryptography.hazmat.backends import default_backend
@@ -13,6 +17,7 @@ from cryptography.hazmat.primitives.kdf.hkdf import HKDFExpand
 from libnacl.aead import AEAD
 
 from ...keyvault.crypto import ECCrypto, LibNaCLPK
+from ...util import TokenBucket
 from ..interfaces.endpoint import Endpoint, EndpointListener
 from .payload import NO_CRYPTO_PACKETS, CellPayload
 from .tunnel import (
@@ -21,11 +26,14 @@ from .tunnel import (
     CIRCUIT_TYPE_RP_SEEDER,
     FORWARD,
     Circuit,
+    CircuitIndex,
     Hop,
     RelayRoute,
 )
 
 if TYPE_CHECKING:
+    from asyncio import Handle
+
     from ...keyvault.keys import PublicKey
     from ...keyvault.private.libnaclkey import LibNaCLSK
     from ..interfaces.udp.endpoint import Address
@@ -33,6 +41,53 @@ if TYPE_CHECKING:
     from .exit_socket import TunnelExitSocket
 
 
+REPLAY_WINDOW_SIZE = 1024
+
+
+class ReplayWindow:
+    """
+    Sliding window of received explicit salts, used to drop replayed and outdated content (like IPsec anti-replay).
+    """
+
+    __slots__ = ("bitmap", "highest", "size")
+
+    def __init__(self, size: int = REPLAY_WINDOW_SIZE) -> None:
+        """
+        Create a new window that has not received any explicit salt yet.
+
+        :param size: the number of explicit salts, up to the highest received explicit salt, that are tracked.
+        """
+        self.size = size
+        self.highest = 0
+        self.bitmap = 0
+
+    def check(self, salt_explicit: int) -> bool:
+        """
+        Check if the given explicit salt has not been received before and is not too old to be tracked.
+        """
+        if salt_explicit <= 0:
+            return False
+        if salt_explicit > self.highest:
+            return True
+        offset = self.highest - salt_explicit
+        return offset < self.size and not (self.bitmap >> offset) & 1
+
+    def update(self, salt_explicit: int) -> bool:
+        """
+        Mark the given explicit salt as received, sliding the window if needed.
+
+        :returns: False if the explicit salt cannot be accepted (anymore), True otherwise.
+        """
+        if not self.check(salt_explicit):
+            return False
+        if salt_explicit > self.highest:
+            self.bitmap = ((self.bitmap << (salt_explicit - self.highest)) | 1) & ((1 << self.size) - 1)
+            self.highest = salt_explicit
+        else:
+            self.bitmap |= 1 << (self.highest - salt_explicit)
+        return True
+
+
 @dataclass
 class SessionKeys:
     """
@@ -45,6 +100,152 @@ class SessionKeys:
     salt_backward: bytes
     salt_explicit_forward: int
     salt_explicit_backward: int
+    aead_forward: AEAD = field(init=False, repr=False, compare=False)
+    """The cipher context for ``key_forward``, reused for all cells of this session."""
+    aead_backward: AEAD = field(init=False, repr=False, compare=False)
+    """The cipher context for ``key_backward``, reused for all cells of this session."""
+    replay_window_forward: ReplayWindow = field(init=False, repr=False, compare=False)
+    """The explicit salts of the content that was decrypted using ``key_forward``."""
+    replay_window_backward: ReplayWindow = field(init=False, repr=False, compare=False)
+    """The explicit salts of the content that was decrypted using ``key_backward``."""
+    lock: Lock = field(init=False, repr=False, compare=False)
+    """Lock for the explicit salts and replay windows, which may be updated from multiple threads."""
+
+    def __post_init__(self) -> None:
+        """
+        Create the cipher contexts and replay windows for the session keys.
+        """
+        self.aead_forward = AEAD(self.key_forward)
+        self.aead_backward = AEAD(self.key_backward)
+        self.replay_window_forward = ReplayWindow()
+        self.replay_window_backward = ReplayWindow()
+        self.lock = Lock()
+
+
+@dataclass
+class PendingCell:
+    """
+    A received cell that still needs to be decrypted (or encrypted, when relaying).
+    """
+
+    source_address: Address
+    cell: CellPayload
+    size: int
+    route: Route
+    next_relay: RelayRoute | None
+    relay_early: bool = False
+
+
+class Route:
+    """
+    The circuit, relay and exit socket that use a given circuit id, if any.
+    """
+
+    __slots__ = ("circuit", "exit_socket", "relay")
+
+    def __init__(self) -> None:
+        """
+        Create a new route without any tunnels.
+        """
+        self.circuit: Circuit | None = None
+        self.relay: RelayRoute | None = None
+        self.exit_socket: TunnelExitSocket | None = None
+
+
+NO_ROUTE = Route()
+
+
+class RoutingTable(dict):
+    """
+    Dictionary of tunnels by circuit id that keeps the shared routes per circuit id up to date.
+
+    Optionally, the table also keeps a ``CircuitIndex`` of its tunnels up to date.
+    """
+
+    __slots__ = ("attribute", "index", "routes")
+
+    def __init__(self, routes: dict[int, Route], attribute: str, index: CircuitIndex | None = None) -> None:
+        """
+        Create a new (empty) table that stores its tunnels in the given attribute of the shared routes.
+        """
+        super().__init__()
+        self.routes = routes
+        self.attribute = attribute
+        self.index = index
+
+    def _update_route(self, circuit_id: int, value: Any) -> None:  # noqa: ANN401
+        """
+        Set the tunnel of this table in the route of the given circuit id, removing routes that have no tunnels left.
+        """
+        route = self.routes.get(circuit_id)
+        if self.index is not None:
+            old_value = getattr(route, self.attribute) if route is not None else None
+            if old_value is not value:
+                if old_value is not None:
+                    self.index.remove(old_value)
+                if value is not None:
+                    self.index.add(value)
+        if route is None:
+            if value is None:
+                return
+            route = self.routes[circuit_id] = Route()
+        setattr(route, self.attribute, value)
+        if value is None and route.circuit is None and route.relay is None and route.exit_socket is None:
+            del self.routes[circuit_id]
+
+    def __setitem__(self, circuit_id: int, value: Any) -> None:  # noqa: ANN401
+        """
+        Add or replace the tunnel for the given circuit id.
+        """
+        super().__setitem__(circuit_id, value)
+        self._update_route(circuit_id, value)
+
+    def __delitem__(self, circuit_id: int) -> None:
+        """
+        Remove the tunnel for the given circuit id.
+        """
+        super().__delitem__(circuit_id)
+        self._update_route(circuit_id, None)
+
+    def pop(self, circuit_id: int, *default: Any) -> Any:  # type: ignore[override]  # noqa: ANN401
+        """
+        Remove and return the tunnel for the given circuit id.
+        """
+        existed = circuit_id in self
+        value = super().pop(circuit_id, *default)
+        if existed:
+            self._update_route(circuit_id, None)
+        return value
+
+    def popitem(self) -> tuple[int, Any]:
+        """
+        Remove and return the last added circuit id and tunnel.
+        """
+        circuit_id, value = super().popitem()
+        self._update_route(circuit_id, None)
+        return circuit_id, value
+
+    def setdefault(self, circuit_id: int, default: Any = None) -> Any:  # type: ignore[override]  # noqa: ANN401
+        """
+        Return the tunnel for the given circuit id, adding the given default if it does not exist.
+        """
+        if circuit_id not in self:
+            self[circuit_id] = default
+        return self[circuit_id]
+
+    def update(self, *args: Any, **kwargs) -> None:  # type: ignore[override]  # noqa: ANN401
+        """
+        Add or replace the tunnels of the given mapping.
+        """
+        for circuit_id, value in dict(*args, **kwargs).items():
+            self[circuit_id] = value
+
+    def clear(self) -> None:
+        """
+        Remove all tunnels.
+        """
+        for circuit_id in list(self):
+            del self[circuit_id]
 
 
 class CryptoException(Exception):
@@ -64,9 +265,11 @@ class CryptoEndpoint(metaclass=abc.ABCMeta):
         """
         self.settings: TunnelSettings | None = None
         self.prefix = b"\x00" * 22
-        self.circuits: dict[int, Circuit] = {}
-        self.relays: dict[int, RelayRoute] = {}
-        self.exit_sockets: dict[int, TunnelExitSocket] = {}
+        self.routes: dict[int, Route] = {}
+        self.circuit_index = CircuitIndex()
+        self.circuits: dict[int, Circuit] = RoutingTable(self.routes, "circuit", self.circuit_index)
+        self.relays: dict[int, RelayRoute] = RoutingTable(self.routes, "relay")
+        self.exit_sockets: dict[int, TunnelExitSocket] = RoutingTable(self.routes, "exit_socket")
         self.logger = logging.getLogger(self.__class__.__name__)
 
     @abc.abstractmethod
@@ -94,6 +297,12 @@ class PythonCryptoEndpoint(CryptoEndpoint, EndpointListener):
         EndpointListener.__init__(self, endpoint)
         CryptoEndpoint.__init__(self)
         self.tunnel_community: TunnelCommunity | None = None
+        self.cell_batch: list[tuple[Address, bytes]] = []
+        self.last_cell_batch: Future | None = None
+        self.crypto_shards: list[ThreadPoolExecutor] = []
+        self.queued_relays: dict[RelayRoute, None] = {}
+        self.relay_bucket: TokenBucket | None = None
+        self.relay_queue_handle: Handle | None = None
 
     def setup_tunnels(self, tunnel_community: TunnelCommunity, settings: TunnelSettings) -> None:
         """
@@ -116,36 +325,62 @@ class PythonCryptoEndpoint(CryptoEndpoint, EndpointListener):
         """
         return self.settings.max_relay_early if self.settings else 8
 
+    @property
+    def cell_batch_size(self) -> int:
+        """
+        Return the maximum number of received cells to process as a single batch.
+        """
+        return self.settings.cell_batch_size if self.settings else 1
+
     def on_packet(self, packet: tuple[Address, bytes], warn_unknown: bool = True) -> None:
         """
         Callback for when data is received on this endpoint.
         """
         source_address, datagram = packet
         if datagram.startswith(self.prefix) and datagram[22] == CellPayload.msg_id:
-            self.process_cell(source_address, datagram)
+            if self.cell_batch_size > 1:
+                self.queue_cell(source_address, datagram)
+            else:
+                self.process_cell(source_address, datagram)
         elif self.tunnel_community:
             self.tunnel_community.on_packet(packet)
 
+    def on_packets(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Callback for when a batch of data is received on this endpoint.
+        """
+        other_packets = []
+        for packet in packets:
+            source_address, datagram = packet
+            if datagram.startswith(self.prefix) and datagram[22] == CellPayload.msg_id:
+                if self.cell_batch_size > 1:
+                    self.queue_cell(source_address, datagram)
+                else:
+                    self.process_cell(source_address, datagram)
+            else:
+                other_packets.append(packet)
+        if other_packets and self.tunnel_community:
+            self.tunnel_community.on_packets(other_packets)
+
     def send_cell(self, target_addr: Address, cell: CellPayload) -> None:
         """
         Send the given payload directly to the given peer with the appropriate encryption rules.
         """
-        circuit_id = cell.circuit_id
-        circuit = self.circuits.get(circuit_id)
-        relay = self.relays.get(circuit_id)
+        route = self.routes.get(cell.circuit_id, NO_ROUTE)
+        circuit = route.circuit
 
         if circuit:
             cell.relay_early = cell.message[0] == 4 or circuit.relay_early_count < self.max_relay_early
             if cell.relay_early:
                 circuit.relay_early_count += 1
 
-        if not self.outgoing_crypto(cell):
+        if not self.outgoing_crypto(cell, route):
             return
 
         packet = cell.to_bin(self.prefix)
         self.endpoint.send(target_addr, packet)
 
-        tunnel_obj = circuit or relay
+        tunnel_obj = circuit or route.relay
         if tunnel_obj:
             tunnel_obj.bytes_up += len(packet)
 
@@ -153,23 +388,158 @@ class PythonCryptoEndpoint(CryptoEndpoint, EndpointListener):
         """
         Process incoming raw data, assumed to be a cell, originating from a given address.
         """
+        pending = self.prepare_cell(source_address, data)
+        if pending and self.crypt_cell(pending):
+            self.finish_cell(pending)
+
+    def queue_cell(self, source_address: Address, data: bytes) -> None:
+        """
+        Queue incoming raw data, assumed to be a cell, to be processed as part of a batch.
+
+        The batch is processed when it is full, or otherwise at the end of the current event loop iteration.
+        """
+        self.cell_batch.append((source_address, data))
+        if len(self.cell_batch) >= self.cell_batch_size:
+            self.flush_cells()
+        elif len(self.cell_batch) == 1:
+            get_running_loop().call_soon(self.flush_cells)
+
+    def flush_cells(self) -> None:
+        """
+        Process all queued cells.
+
+        The crypto of the batch is performed per circuit, optionally on the default thread pool. Afterwards, the cells
+        are relayed or delivered, keeping the order in which cells were received per circuit.
+        """
+        batch, self.cell_batch = self.cell_batch, []
+        per_circuit: dict[int, list[PendingCell]] = {}
+        for source_address, data in batch:
+            try:
+                pending = self.prepare_cell(source_address, data)
+            except struct.error:
+                # A malformed cell should only cost us that cell, not the rest of the batch.
+                self.logger.warning("Dropping malformed cell of %d bytes from %s", len(data), source_address)
+                continue
+            if pending:
+                per_circuit.setdefault(pending.cell.circuit_id, []).append(pending)
+        if not per_circuit:
+            return
+
+        if self.settings and self.settings.threaded_cell_crypto and self.tunnel_community:
+            self.last_cell_batch = self.tunnel_community.register_anonymous_task(
+                "cell_batch", self._crypt_and_finish_threaded, self.last_cell_batch, list(per_circuit.values())
+            )
+            return
+
+        for pendings in per_circuit.values():
+            self.finish_cells(pendings, self.crypt_cells(pendings))
+
+    async def _crypt_and_finish_threaded(self, previous: Future | None, batch: list[list[PendingCell]]) -> None:
+        """
+        Perform the crypto of the given cells on worker threads and finish them on the event loop thread.
+        """
+        loop = get_running_loop()
+        results = await gather(*(loop.run_in_executor(self.get_crypto_shard(pendings[0].cell.circuit_id),
+                                                      self.crypt_cells, pendings) for pendings in batch))
+        if previous is not None and not previous.done():
+            # Keep the order of batches. The outcome of the previous batch does not affect this batch.
+            await wait([previous])
+        for pendings, crypted in zip(batch, results, strict=True):
+            self.finish_cells(pendings, crypted)
+
+    def get_crypto_shard(self, circuit_id: int) -> ThreadPoolExecutor | None:
+        """
+        Get the worker thread that performs the cell crypto for the given circuit id.
+
+        Circuits are sharded over the workers by circuit id, so that all cells of a circuit are handled by the same
+        thread. If sharding is disabled, None is returned to use the default thread pool instead.
+        """
+        shard_count = self.settings.cell_crypto_shards if self.settings else 0
+        if shard_count <= 0:
+            return None
+        if not self.crypto_shards:
+            self.crypto_shards = [ThreadPoolExecutor(1, thread_name_prefix=f"CellCrypto-{i}")
+                                  for i in range(shard_count)]
+        return self.crypto_shards[circuit_id % len(self.crypto_shards)]
+
+    def shutdown(self) -> None:
+        """
+        Stop the worker threads and drop all cells that are queued for rate limited relays.
+        """
+        self.shutdown_crypto_shards()
+        if self.relay_queue_handle:
+            self.relay_queue_handle.cancel()
+            self.relay_queue_handle = None
+        for relay in self.queued_relays:
+            relay.queue.clear()
+        self.queued_relays.clear()
+
+    def shutdown_crypto_shards(self) -> None:
+        """
+        Stop the worker threads that circuits are sharded over.
+        """
+        for shard in self.crypto_shards:
+            shard.shutdown(wait=False)
+        self.crypto_shards = []
+
+    def crypt_cells(self, pendings: list[PendingCell]) -> list[bool]:
+        """
+        Perform the crypto of multiple cells, which may happen outside of the event loop thread.
+        """
+        return [self.crypt_cell(pending) for pending in pendings]
+
+    def finish_cells(self, pendings: list[PendingCell], crypted: list[bool]) -> None:
+        """
+        Relay or deliver multiple cells that have completed their crypto.
+        """
+        for pending, success in zip(pendings, crypted, strict=True):
+            if success:
+                self.finish_cell(pending)
+
+    def prepare_cell(self, source_address: Address, data: bytes) -> PendingCell | None:
+        """
+        Parse a received cell, update the relay statistics and perform the checks that need to happen before the
+        crypto of the cell.
+        """
         cell = CellPayload.from_bin(data)
         circuit_id = cell.circuit_id
 
-        next_relay = self.relays.get(circuit_id)
+        route = self.routes.get(circuit_id, NO_ROUTE)
+        next_relay = route.relay
         if next_relay:
             this_relay = self.relays.get(next_relay.circuit_id)
             if this_relay:
                 this_relay.beat_heart()
                 this_relay.bytes_down += len(data)
             self.logger.debug("Relaying cell from circuit %d to %d", circuit_id, next_relay.circuit_id)
-            self.relay_cell(cell)
-            return
+            if not self.check_relay_cell(cell, next_relay):
+                return None
+        return PendingCell(source_address, cell, len(data), route, next_relay, cell.relay_early)
 
-        if not self.incoming_crypto(cell):
-            return
+    def crypt_cell(self, pending: PendingCell) -> bool:
+        """
+        Decrypt a received cell, or encrypt/decrypt it for the next hop if it is to be relayed.
+        """
+        if pending.next_relay:
+            return self.relay_crypto(pending.cell, pending.next_relay)
+        return self.incoming_crypto(pending.cell, pending.route) is not None
+
+    def finish_cell(self, pending: PendingCell) -> None:
+        """
+        Relay a cell to the next hop, or deliver it to the TunnelCommunity.
+        """
+        if pending.next_relay:
+            # Cells that were received earlier, in the same batch, may have used up the relay_early cells.
+            if self.check_relay_early(pending.relay_early, pending.next_relay):
+                self.send_relayed_cell(pending.cell, pending.next_relay)
+        else:
+            self.deliver_cell(pending.source_address, pending.cell, pending.size, pending.route.circuit)
 
-        self.logger.debug("Got cell(%s) from circuit %d (sender %s)", cell.message[0], circuit_id, source_address)
+    def deliver_cell(self, source_address: Address, cell: CellPayload, size: int, circuit: Circuit | None) -> None:
+        """
+        Deliver a decrypted cell, received over the given circuit (if it is ours), to the TunnelCommunity.
+        """
+        self.logger.debug("Got cell(%s) from circuit %d (sender %s)", cell.message[0], cell.circuit_id, source_address)
 
         if (not cell.relay_early and cell.message[0] == 4) or self.max_relay_early <= 0:
             self.logger.info("Dropping cell (missing or unexpected relay_early flag)")
@@ -184,25 +554,41 @@ class PythonCryptoEndpoint(CryptoEndpoint, EndpointListener):
 
         self.tunnel_community.on_packet((source_address, cell.to_bin(self.prefix)))
 
-        circuit = self.circuits.get(cell.circuit_id)
         if circuit:
             circuit.beat_heart()
-            circuit.bytes_down += len(data)
+            circuit.bytes_down += size
 
     def relay_cell(self, cell: CellPayload) -> None:
         """
         Forward the given cell, which contains the information needed for its own relaying.
         """
+        next_relay = self.relays[cell.circuit_id]
+        if self.check_relay_cell(cell, next_relay) and self.relay_crypto(cell, next_relay):
+            self.send_relayed_cell(cell, next_relay)
+
+    def check_relay_cell(self, cell: CellPayload, next_relay: RelayRoute) -> bool:
+        """
+        Check if the given cell is allowed to be relayed.
+        """
         if cell.plaintext:
             self.logger.warning("Dropping cell (cell not encrypted)")
-            return
+            return False
 
-        next_relay = self.relays[cell.circuit_id]
+        return self.check_relay_early(cell.relay_early, next_relay)
 
-        if cell.relay_early and next_relay.relay_early_count >= self.max_relay_early:
+    def check_relay_early(self, relay_early: bool, next_relay: RelayRoute) -> bool:
+        """
+        Check if a cell, with or without the relay_early flag, is allowed to be relayed to the given next relay.
+        """
+        if relay_early and next_relay.relay_early_count >= self.max_relay_early:
             self.logger.warning("Dropping cell (too many relay_early cells)")
-            return
+            return False
+        return True
 
+    def relay_crypto(self, cell: CellPayload, next_relay: RelayRoute) -> bool:
+        """
+        Perform the crypto for a cell that is to be relayed to the given next relay.
+        """
         try:
             if next_relay.rendezvous_relay:
                 self.decrypt_cell(cell, FORWARD, next_relay.hop)
@@ -215,25 +601,125 @@ class PythonCryptoEndpoint(CryptoEndpoint, EndpointListener):
                     self.decrypt_cell(cell, direction, next_relay.hop)
                 elif direction == BACKWARD:
                     self.encrypt_cell(cell, direction, next_relay.hop)
-
-        except CryptoException as e:
+        except (CryptoException, KeyError) as e:
             self.logger.warning(str(e))
-            return
+            return False
+        return True
 
+    def send_relayed_cell(self, cell: CellPayload, next_relay: RelayRoute) -> None:
+        """
+        Send a cell, of which the crypto has been performed, to the next relay, and count it as relayed.
+        """
+        next_relay.relay_early_count += 1
         cell.circuit_id = next_relay.circuit_id
         packet = cell.to_bin(self.prefix)
+        if self.settings and (self.settings.relay_rate_limit > 0 or self.settings.relay_total_rate_limit > 0):
+            self.shape_relayed_packet(next_relay, packet)
+            return
         self.endpoint.send(next_relay.hop.address, packet)
         next_relay.bytes_up += len(packet)
-        next_relay.relay_early_count += 1
 
-    def outgoing_crypto(self, cell: CellPayload) -> CellPayload | None:
+    def shape_relayed_packet(self, next_relay: RelayRoute, packet: bytes) -> None:
+        """
+        Send a relayed packet if the rate limits allow it, otherwise queue it for the deficit round robin scheduler.
+        """
+        settings = cast("TunnelSettings", self.settings)
+        if next_relay.bucket is None and settings.relay_rate_limit > 0:
+            next_relay.bucket = TokenBucket(settings.relay_rate_limit, settings.relay_burst_size)
+        if self.relay_bucket is None and settings.relay_total_rate_limit > 0:
+            self.relay_bucket = TokenBucket(settings.relay_total_rate_limit, settings.relay_burst_size)
+
+        if not self.queued_relays and self.take_relay_tokens(next_relay, len(packet), time.monotonic()):
+            self.endpoint.send(next_relay.hop.address, packet)
+            next_relay.bytes_up += len(packet)
+            return
+
+        if len(next_relay.queue) >= settings.relay_queue_size:
+            next_relay.cells_dropped += 1
+            return
+        next_relay.queue.append(packet)
+        next_relay.cells_delayed += 1
+        self.queued_relays[next_relay] = None
+        if self.relay_queue_handle is None:
+            self.relay_queue_handle = get_running_loop().call_soon(self.process_relay_queues)
+
+    def drop_relay_queue(self, relay: RelayRoute) -> None:
+        """
+        Drop the cells that are queued for the given relay, e.g., because the relay was removed.
+        """
+        relay.queue.clear()
+        relay.deficit = 0
+        self.queued_relays.pop(relay, None)
+
+    def take_relay_tokens(self, relay: RelayRoute, size: int, now: float) -> bool:
+        """
+        Take the tokens for sending the given number of bytes over a relay, if both rate limits allow it.
+        """
+        if relay.bucket is not None and not relay.bucket.allows(size, now):
+            return False
+        if self.relay_bucket is not None and not self.relay_bucket.allows(size, now):
+            return False
+        if relay.bucket is not None:
+            relay.bucket.tokens -= size
+        if self.relay_bucket is not None:
+            self.relay_bucket.tokens -= size
+        return True
+
+    def process_relay_queues(self) -> None:
+        """
+        Send the queued relay cells in a deficit round robin fashion, for as far as the rate limits allow.
+
+        If cells remain queued, this method reschedules itself for when the rate limits allow more cells to be sent.
+        """
+        self.relay_queue_handle = None
+        settings = cast("TunnelSettings", self.settings)
+        # A quantum that is not positive would never let a queued cell be sent.
+        quantum = max(settings.relay_quantum, 1)
+        now = time.monotonic()
+        delay = None
+
+        progress = True
+        while progress and self.queued_relays:
+            progress = False
+            for relay in list(self.queued_relays):
+                relay.deficit += quantum
+                while relay.queue:
+                    packet = relay.queue[0]
+                    if len(packet) > relay.deficit:
+                        # The deficit grows in the next round.
+                        progress = True
+                        break
+                    if not self.take_relay_tokens(relay, len(packet), now):
+                        # A circuit that is waiting for tokens does not get to use the quantum of this round.
+                        relay.deficit = max(0, relay.deficit - quantum)
+                        buckets = [bucket for bucket in (relay.bucket, self.relay_bucket) if bucket is not None]
+                        wait = max(bucket.delay(len(packet)) for bucket in buckets)
+                        delay = wait if delay is None else min(delay, wait)
+                        break
+                    relay.queue.popleft()
+                    relay.deficit -= len(packet)
+                    self.endpoint.send(relay.hop.address, packet)
+                    relay.bytes_up += len(packet)
+                    progress = True
+                if not relay.queue:
+                    relay.deficit = 0
+                    self.queued_relays.pop(relay)
+
+        if self.queued_relays:
+            self.relay_queue_handle = get_running_loop().call_later(max(delay or 0.0, 0.001),
+                                                                    self.process_relay_queues)
+
+    def outgoing_crypto(self, cell: CellPayload, route: Route | None = None) -> CellPayload | None:
         """
         Encrypt a CellPayload using the SessionKeys currently available in the routing table.
+
+        :param route: the route of the circuit id of the cell, if it was already looked up.
         """
-        circuit_id = cell.circuit_id
-        circuit = self.circuits.get(circuit_id)
-        exit_socket = self.exit_sockets.get(circuit_id)
-        relay = self.relays.get(circuit_id)
+        if route is None:
+            route = self.routes.get(cell.circuit_id, NO_ROUTE)
+        circuit = route.circuit
+        exit_socket = route.exit_socket
+        relay = route.relay
 
         try:
             if circuit:
@@ -256,16 +742,19 @@ class PythonCryptoEndpoint(CryptoEndpoint, EndpointListener):
 
         return cell
 
-    def incoming_crypto(self, cell: CellPayload) -> CellPayload | None:
+    def incoming_crypto(self, cell: CellPayload, route: Route | None = None) -> CellPayload | None:
         """
         Decrypt a CellPayload using the SessionKeys currently available in the routing table.
+
+        :param route: the route of the circuit id of the cell, if it was already looked up.
         """
-        circuit_id = cell.circuit_id
-        circuit = self.circuits.get(circuit_id, None)
-        exit_socket = self.exit_sockets.get(circuit_id, None)
+        if route is None:
+            route = self.routes.get(cell.circuit_id, NO_ROUTE)
+        circuit = route.circuit
+        exit_socket = route.exit_socket
 
         if not circuit and not exit_socket and not cell.plaintext:
-            self.logger.debug("Got encrypted cell from unknown circuit %d", circuit_id)
+            self.logger.debug("Got encrypted cell from unknown circuit %d", cell.circuit_id)
             return None
 
         try:
@@ -401,36 +890,48 @@ class TunnelCrypto(ECCrypto):
         """
         Encrypt content using the given key, salt, and incremental session salt.
         """
-        if direction == FORWARD:
-            keys.salt_explicit_forward += 1
-            key = keys.key_forward
-            salt = keys.salt_forward
-            salt_explicit = keys.salt_explicit_forward
-        else:
-            keys.salt_explicit_backward += 1
-            key = keys.key_backward
-            salt = keys.salt_backward
-            salt_explicit = keys.salt_explicit_backward
+        with keys.lock:
+            if direction == FORWARD:
+                keys.salt_explicit_forward += 1
+                salt_explicit = keys.salt_explicit_forward
+            else:
+                keys.salt_explicit_backward += 1
+                salt_explicit = keys.salt_explicit_backward
+        aead = keys.aead_forward if direction == FORWARD else keys.aead_backward
+        salt = keys.salt_forward if direction == FORWARD else keys.salt_backward
 
         # Return the encrypted content prepended with salt_explicit
-        aead = AEAD(key)
-        _, _, ciphertext = aead.encrypt(content, b"",
-                                        nonce=salt + struct.pack("!q", salt_explicit),
-                                        pack_nonce_aad=False)
-        return struct.pack("!q", salt_explicit) + ciphertext
+        packed_salt_explicit = struct.pack("!q", salt_explicit)
+        _, _, ciphertext = aead.encrypt(content, b"", nonce=salt + packed_salt_explicit, pack_nonce_aad=False)
+        return packed_salt_explicit + ciphertext
 
     @staticmethod
     def decrypt_str(content: bytes, keys: SessionKeys, direction: int) -> bytes:
         """
         Decrypt the given content using a key and salt.
+
+        Content of which the salt_explicit was already decrypted before, or is too old to tell, is dropped before
+        attempting to decrypt it.
         """
         # Content contains the tag and salt_explicit in plaintext
-        key = keys.key_forward if direction == FORWARD else keys.key_backward
+        aead = keys.aead_forward if direction == FORWARD else keys.aead_backward
         salt = keys.salt_forward if direction == FORWARD else keys.salt_backward
+        window = keys.replay_window_forward if direction == FORWARD else keys.replay_window_backward
 
         if len(content) < 24:
             msg = "truncated content"
             raise CryptoException(msg)
 
-        aead = AEAD(key)
-        return aead.decrypt(salt + content, 0)
+        salt_explicit, = struct.unpack_from("!q", content)
+        if not window.check(salt_explicit):
+            msg = f"replayed content (salt_explicit {salt_explicit})"
+            raise CryptoException(msg)
+
+        plaintext = aead.decrypt(salt + content, 0)
+
+        # Only authenticated content may move the window. Check again, in case of concurrent decryption.
+        with keys.lock:
+            if not window.update(salt_explicit):
+                msg = f"replayed content (salt_explicit {salt_explicit})"
+                raise CryptoException(msg)
+        return plaintext
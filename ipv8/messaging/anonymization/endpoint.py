@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
     from ..interfaces.udp.endpoint import Address
     from .community import TunnelCommunity
+    from .tunnel import Circuit
 
 
 class TunnelEndpoint(Endpoint):
@@ -29,6 +30,8 @@ class TunnelEndpoint(Endpoint):
         self.tunnel_community: TunnelCommunity | None = None
         self.settings: dict[bytes, bool] = {}
         self.send_queue: deque[tuple[Address, bytes]] = deque(maxlen=100)
+        self.virtual_time = 0.0
+        self.finish_times: dict[int, float] = {}
 
     def set_tunnel_community(self, tunnel_community: TunnelCommunity | None, hops: int = 1) -> None:
         """
@@ -36,6 +39,8 @@ class TunnelEndpoint(Endpoint):
         """
         self.tunnel_community = tunnel_community
         self.hops = hops
+        if tunnel_community is not None:
+            tunnel_community.add_circuit_pool(hops, exit_flags=[PEER_FLAG_EXIT_IPV8])
 
     def set_anonymity(self, prefix: bytes, enable: bool) -> None:
         """
@@ -55,21 +60,55 @@ class TunnelEndpoint(Endpoint):
         if self.tunnel_community is not None:
             tunnel_community = self.tunnel_community
             circuits = tunnel_community.find_circuits(exit_flags=[PEER_FLAG_EXIT_IPV8], hops=self.hops, state=None)
-            circuit = circuits[0] if circuits else None
-            if not circuit or circuit.state != CIRCUIT_STATE_READY:
-                # Recreate tunnel when needed
-                if not circuit:
-                    tunnel_community.create_circuit(self.hops, exit_flags=[PEER_FLAG_EXIT_IPV8])
+            ready = [circuit for circuit in circuits if circuit.state == CIRCUIT_STATE_READY]
+            if not circuits:
+                # Recreate tunnel when needed, preferably using a spare circuit
+                circuit = tunnel_community.promote_spare_circuit(self.hops, exit_flags=[PEER_FLAG_EXIT_IPV8]) \
+                          or tunnel_community.create_circuit(self.hops, exit_flags=[PEER_FLAG_EXIT_IPV8])
+                if circuit and circuit.state == CIRCUIT_STATE_READY:
+                    ready = [circuit]
+            if not ready:
                 self.send_queue.append((address, packet))
                 return
 
-            circuit_id = circuit.circuit_id
-            tunnel_community.send_data(circuit.hop.address, circuit_id, address, ("0.0.0.0", 0), packet)
-
             # Any packets still need sending?
             while self.send_queue:
-                address, packet = self.send_queue.popleft()
-                tunnel_community.send_data(circuit.hop.address, circuit_id, address, ("0.0.0.0", 0), packet)
+                self.send_striped(tunnel_community, ready, *self.send_queue.popleft())
+            self.send_striped(tunnel_community, ready, address, packet)
+
+    def send_striped(self, tunnel_community: TunnelCommunity, circuits: list[Circuit], address: Address,
+                     packet: bytes) -> None:
+        """
+        Send the given packet to a certain address over the circuit that is selected by the stripe scheduler.
+        """
+        circuit = self.select_circuit(circuits, len(packet))
+        tunnel_community.send_data(circuit.hop.address, circuit.circuit_id, address, ("0.0.0.0", 0), packet)
+
+    def select_circuit(self, circuits: list[Circuit], size: int) -> Circuit:
+        """
+        Select one of the given (ready) circuits to send a packet of the given size over.
+
+        The bytes are striped over the circuits in proportion to their inverse round-trip time, using the virtual
+        finish times of weighted fair queuing. New circuits start at the current virtual time and circuits that have no
+        measured round-trip time yet are assumed to be as fast as the average measured circuit.
+        """
+        rtts = [circuit.rtt for circuit in circuits if circuit.rtt]
+        default_rtt = sum(rtts) / len(rtts) if rtts else 1.0
+
+        selected = circuits[0]
+        selected_start = selected_finish = 0.0
+        for circuit in circuits:
+            start = self.finish_times.setdefault(circuit.circuit_id, self.virtual_time)
+            finish = start + size * (circuit.rtt or default_rtt)
+            if circuit is selected or finish < selected_finish:
+                selected, selected_start, selected_finish = circuit, start, finish
+
+        self.virtual_time = selected_start
+        if len(self.finish_times) > len(circuits):
+            # Forget about circuits that are no longer in use.
+            self.finish_times = {circuit.circuit_id: self.finish_times[circuit.circuit_id] for circuit in circuits}
+        self.finish_times[selected.circuit_id] = selected_finish
+        return selected
 
     def notify_listeners(self, packet: tuple[Address, bytes], from_tunnel: bool = False) -> None:
         """
@@ -80,7 +119,18 @@ class TunnelEndpoint(Endpoint):
             # Non-anonymized communities should ignore traffic received from the TunnelCommunity
             if getattr(listener, "anonymize", False) != from_tunnel:
                 continue
-            self.endpoint._deliver_later(listener, packet)  # noqa: SLF001
+            self.endpoint._deliver(listener, packet)  # noqa: SLF001
+
+    def notify_listeners_batch(self, packets: list[tuple[Address, bytes]], from_tunnel: bool = False) -> None:
+        """
+        Ensure a batch of packets is only delivered if they are properly encrypted.
+        """
+        for listener in self.endpoint._listeners:  # noqa: SLF001
+            # Anonymized communities should ignore traffic received from the socket
+            # Non-anonymized communities should ignore traffic received from the TunnelCommunity
+            if getattr(listener, "anonymize", False) != from_tunnel:
+                continue
+            self.endpoint._deliver_batch(listener, packets)  # noqa: SLF001
 
     def add_listener(self, listener: EndpointListener) -> None:
         """
@@ -94,6 +144,12 @@ class TunnelEndpoint(Endpoint):
         """
         self.endpoint.add_prefix_listener(listener, prefix)
 
+    def get_ingress_statistics(self, prefix: bytes | None) -> dict[str, int]:
+        """
+        Forward directly to the underlying endpoint.
+        """
+        return self.endpoint.get_ingress_statistics(prefix)
+
     def assert_open(self) -> None:
         """
         Forward directly to the underlying endpoint.
@@ -386,7 +386,7 @@ class Flags(Packer):
         """
         return pack(self.format, reduce(lambda a, b: a | b, data, 0))
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Uncompress the flags from their serialized form.
         """
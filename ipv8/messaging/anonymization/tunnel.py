@@ -5,8 +5,9 @@ import logging
 import time
 from asyncio import Future, gather
 from binascii import hexlify
+from collections import deque
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Sequence
@@ -14,6 +15,7 @@ if TYPE_CHECKING:
     from ...keyvault.private.libnaclkey import LibNaCLSK
     from ...keyvault.public.libnaclkey import LibNaCLPK
     from ...peer import Peer
+    from ...util import TokenBucket
     from ..interfaces.udp.endpoint import Address
     from .crypto import SessionKeys
 
@@ -139,9 +141,34 @@ class Circuit(RoutingObject):
         self._hs_session_keys: SessionKeys | None = None
         self.e2e = False
         self.relay_early_count = 0
+        self.rtt: float | None = None
+        # The exit flags that were requested when creating this circuit and whether this is a spare circuit.
+        self.requested_exit_flags: tuple[int, ...] | None = None
+        self._spare = False
+        self.observers: list[Callable[[Circuit], None]] = []
 
         self.dirty = False
 
+    def add_observer(self, observer: Callable[[Circuit], None]) -> None:
+        """
+        Register a callback for changes to the state of this circuit and to whether it is a spare circuit.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Callable[[Circuit], None]) -> None:
+        """
+        Unregister a callback for circuit changes, if it was registered.
+        """
+        if observer in self.observers:
+            self.observers.remove(observer)
+
+    def _notify(self) -> None:
+        """
+        Inform the observers of a change to this circuit.
+        """
+        for observer in list(self.observers):
+            observer(self)
+
     def add_hop(self, hop: Hop) -> None:
         """
         Adds a hop to the circuits hop collection.
@@ -150,6 +177,28 @@ class Circuit(RoutingObject):
         if self.state == CIRCUIT_STATE_READY:
             self.ready.set_result(self)
         self.dirty = True
+        self._notify()
+
+    def update_rtt(self, sample: float) -> None:
+        """
+        Update the smoothed round-trip time of this circuit using a newly measured round-trip time.
+        """
+        self.rtt = sample if self.rtt is None else self.rtt + (sample - self.rtt) / 8
+
+    @property
+    def spare(self) -> bool:
+        """
+        Whether this circuit is kept as a spare circuit, instead of being used.
+        """
+        return self._spare
+
+    @spare.setter
+    def spare(self, value: bool) -> None:
+        """
+        Mark this circuit as a spare circuit or as a regular circuit.
+        """
+        self._spare = value
+        self._notify()
 
     @property
     def hs_session_keys(self) -> SessionKeys | None:
@@ -216,6 +265,166 @@ class Circuit(RoutingObject):
         self._closing = True
         if not self.ready.done():
             self.ready.set_result(None)
+        self._notify()
+
+
+class CircuitIndex:
+    """
+    Index of the circuits that are not spare circuits, by circuit type, state and goal number of hops.
+
+    Circuits are followed as they change after they are added to the index, until they are removed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a new (empty) index.
+        """
+        self.circuits: dict[tuple[str, str, int], dict[int, Circuit]] = {}
+        self.keys: dict[int, tuple[str, str, int]] = {}
+
+    def add(self, circuit: Circuit) -> None:
+        """
+        Start indexing the given circuit.
+        """
+        circuit.add_observer(self.update)
+        self.update(circuit)
+
+    def remove(self, circuit: Circuit) -> None:
+        """
+        Stop indexing the given circuit.
+        """
+        circuit.remove_observer(self.update)
+        self._unindex(circuit.circuit_id)
+
+    def _unindex(self, circuit_id: int) -> None:
+        """
+        Remove the circuit with the given circuit id from the index.
+        """
+        key = self.keys.pop(circuit_id, None)
+        if key is not None:
+            circuits = self.circuits[key]
+            circuits.pop(circuit_id, None)
+            if not circuits:
+                del self.circuits[key]
+
+    def update(self, circuit: Circuit) -> None:
+        """
+        Move the given circuit to the entry that matches its current type, state and goal number of hops.
+        """
+        key = None if circuit.spare else (circuit.ctype, circuit.state, circuit.goal_hops)
+        if self.keys.get(circuit.circuit_id) == key:
+            return
+        self._unindex(circuit.circuit_id)
+        if key is not None:
+            self.circuits.setdefault(key, {})[circuit.circuit_id] = circuit
+            self.keys[circuit.circuit_id] = key
+
+    def find(self, ctype: str | None = None, state: str | None = None, hops: int | None = None) -> list[Circuit]:
+        """
+        Get the indexed circuits of the given type, state and goal number of hops (None matches anything).
+        """
+        if ctype is not None and state is not None and hops is not None:
+            return list(self.circuits.get((ctype, state, hops), {}).values())
+        return [circuit for (c_ctype, c_state, c_hops), circuits in self.circuits.items()
+                if (ctype is None or ctype == c_ctype)
+                and (state is None or state == c_state)
+                and (hops is None or hops == c_hops)
+                for circuit in circuits.values()]
+
+
+class CandidateTable(dict):
+    """
+    Dictionary of peers and their peer flags that keeps an index of the peers per flag up to date.
+    """
+
+    __slots__ = ("peers_by_flag",)
+
+    def __init__(self) -> None:
+        """
+        Create a new (empty) table.
+        """
+        super().__init__()
+        self.peers_by_flag: dict[int, dict[Peer, None]] = {}
+
+    def _update_index(self, peer: Peer, old_flags: Sequence[int] | None, new_flags: Sequence[int] | None) -> None:
+        """
+        Move the given peer from the index entries of its old flags to those of its new flags.
+        """
+        for flag in old_flags or ():
+            peers = self.peers_by_flag.get(flag)
+            if peers is not None:
+                peers.pop(peer, None)
+                if not peers:
+                    del self.peers_by_flag[flag]
+        for flag in new_flags or ():
+            self.peers_by_flag.setdefault(flag, {})[peer] = None
+
+    def __setitem__(self, peer: Peer, flags: list[int]) -> None:
+        """
+        Add or replace the flags of the given peer.
+        """
+        old_flags = self.get(peer)
+        super().__setitem__(peer, flags)
+        if old_flags != flags:
+            self._update_index(peer, old_flags, flags)
+
+    def __delitem__(self, peer: Peer) -> None:
+        """
+        Remove the given peer.
+        """
+        old_flags = self[peer]
+        super().__delitem__(peer)
+        self._update_index(peer, old_flags, None)
+
+    def pop(self, peer: Peer, *default: Any) -> Any:  # type: ignore[override]  # noqa: ANN401
+        """
+        Remove and return the flags of the given peer.
+        """
+        existed = peer in self
+        flags = super().pop(peer, *default)
+        if existed:
+            self._update_index(peer, flags, None)
+        return flags
+
+    def popitem(self) -> tuple[Peer, list[int]]:
+        """
+        Remove and return the last added peer and its flags.
+        """
+        peer, flags = super().popitem()
+        self._update_index(peer, flags, None)
+        return peer, flags
+
+    def setdefault(self, peer: Peer, default: Any = None) -> Any:  # type: ignore[override]  # noqa: ANN401
+        """
+        Return the flags of the given peer, adding the given default flags if it does not exist.
+        """
+        if peer not in self:
+            self[peer] = default
+        return self[peer]
+
+    def update(self, *args: Any, **kwargs) -> None:  # type: ignore[override]  # noqa: ANN401
+        """
+        Add or replace the flags of the peers in the given mapping.
+        """
+        for peer, flags in dict(*args, **kwargs).items():
+            self[peer] = flags
+
+    def clear(self) -> None:
+        """
+        Remove all peers.
+        """
+        super().clear()
+        self.peers_by_flag.clear()
+
+    def get_peers(self, *flags: int) -> list[Peer]:
+        """
+        Get the peers that have all of the given flags.
+        """
+        if not flags:
+            return list(self)
+        indexed = [self.peers_by_flag.get(flag, {}) for flag in set(flags)]
+        smallest = min(indexed, key=len)
+        return [peer for peer in smallest if all(peer in peers for peers in indexed)]
 
 
 class RelayRoute(RoutingObject):
@@ -235,6 +444,13 @@ class RelayRoute(RoutingObject):
         # that had the early_relay flag set) we start the count at 1.
         self.relay_early_count = 1
 
+        # Traffic shaping state, only used when relays are rate limited.
+        self.bucket: TokenBucket | None = None
+        self.queue: deque[bytes] = deque()
+        self.deficit = 0
+        self.cells_delayed = 0
+        self.cells_dropped = 0
+
 
 class RendezvousPoint:
     """
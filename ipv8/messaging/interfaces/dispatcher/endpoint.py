@@ -6,8 +6,12 @@ import typing
 
 from ....util import maybe_coroutine
 from ..endpoint import Endpoint, EndpointListener
+from ..lan_addresses.importshield import Platform, conditional_import_shield
 from ..udp.endpoint import Address, UDPEndpoint, UDPv4Address, UDPv6Address, UDPv6Endpoint
 
+if typing.TYPE_CHECKING:
+    from ..rate_limiter import SourceRateLimiter
+
 INTERFACES = {
     "UDPIPv4": UDPEndpoint,
     "UDPIPv6": UDPv6Endpoint
@@ -16,6 +20,19 @@ INTERFACES = {
 The INTERFACES dictionary describes the mapping of interface names to interface classes.
 """
 
+BATCHED_INTERFACES: dict[str, type[UDPEndpoint]] = {}
+"""
+The BATCHED_INTERFACES dictionary describes the mapping of interface names to interface classes that receive and send
+packets in batches. These are used for interfaces that are configured with ``"batched": True``, if available.
+"""
+
+with conditional_import_shield(Platform.LINUX):
+    from ..udp.batch_endpoint import UDPBatchEndpoint, UDPv6BatchEndpoint
+    BATCHED_INTERFACES.update({
+        "UDPIPv4": UDPBatchEndpoint,
+        "UDPIPv6": UDPv6BatchEndpoint
+    })
+
 PREFERENCE_ORDER = [
     "UDPIPv4",
     "UDPIPv6"
@@ -80,17 +97,37 @@ class DispatcherEndpoint(Endpoint):
 
             DispatcherEndpoint(["UDPIPv4"], UDPIPv4={'port': my_custom_port})
 
+        The ``batched`` keyword argument selects the implementation of an interface from ``BATCHED_INTERFACES``.
+        The ``worker_queue_size`` keyword argument enables worker threads for listeners that do not use the main thread.
+        The ``ingress_queue_size`` keyword argument enables bounded queues for incoming packets, per prefix.
+
         :param interfaces: list of interfaces to load.
         :param kwargs: optional interface-specific launch arguments.
         :returns: None
         """
         super().__init__()
         # Filter the available interfaces and preference order, based on the user's selection.
-        self.interfaces = {interface: INTERFACES[interface](**(kwargs.get(interface, {}))) for interface in interfaces}
+        self.interfaces = {interface: self.create_interface(interface, **(kwargs.get(interface, {})))
+                           for interface in interfaces}
         self.interface_order = [interface for interface in PREFERENCE_ORDER if interface in interfaces]
         # The order of preference will not change, we can precompute the preferred interface Endpoint.
         self._preferred_interface = self.interfaces[self.interface_order[0]] if self.interface_order else None
 
+    @staticmethod
+    def create_interface(interface: str, batched: bool = False, worker_queue_size: int = 0,
+                         ingress_queue_size: int = 0, **kwargs) -> UDPEndpoint:
+        """
+        Create the Endpoint for the given interface, falling back to the unbatched implementation if a batched
+        implementation is requested but not available on this platform.
+        """
+        if batched and interface not in BATCHED_INTERFACES:
+            logger.warning("No batched implementation of %s available, falling back to unbatched", interface)
+            batched = False
+        endpoint = BATCHED_INTERFACES[interface](**kwargs) if batched else INTERFACES[interface](**kwargs)
+        endpoint.worker_queue_size = worker_queue_size
+        endpoint.ingress_queue_size = ingress_queue_size
+        return endpoint
+
     @property
     def bytes_up(self) -> int:
         """
@@ -133,6 +170,13 @@ class DispatcherEndpoint(Endpoint):
         for interface in self.interfaces.values():
             interface.notify_listeners(packet)
 
+    def notify_listeners_batch(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Dispatch a new batch of packets to all interfaces.
+        """
+        for interface in self.interfaces.values():
+            interface.notify_listeners_batch(packets)
+
     def assert_open(self) -> None:
         """
         Perform an assert that we are opened.
@@ -189,3 +233,25 @@ class DispatcherEndpoint(Endpoint):
         """
         for interface in self.interfaces.values():
             interface.reset_byte_counters()
+
+    def set_rate_limiter(self, rate_limiter: SourceRateLimiter | None) -> None:
+        """
+        Share the given rate limiter for incoming packets between all interfaces.
+        """
+        self.rate_limiter = rate_limiter
+        for interface in self.interfaces.values():
+            interface.set_rate_limiter(rate_limiter)
+
+    def get_ingress_statistics(self, prefix: bytes | None) -> dict[str, int]:
+        """
+        Get the ingress statistics of the given prefix over all interfaces.
+
+        The queued and dropped packets are summed, the maximum number of queued packets is the largest of any interface.
+        """
+        aggregate = {"queued": 0, "max_queued": 0, "dropped": 0}
+        for interface in self.interfaces.values():
+            statistics = interface.get_ingress_statistics(prefix)
+            aggregate["queued"] += statistics["queued"]
+            aggregate["max_queued"] = max(aggregate["max_queued"], statistics["max_queued"])
+            aggregate["dropped"] += statistics["dropped"]
+        return aggregate
@@ -6,13 +6,18 @@ import logging
 import socket
 import struct
 import threading
+import time
+from asyncio import get_running_loop
+from collections import deque
 from typing import TYPE_CHECKING
 
+from .ingress import DEFAULT_INGRESS_PRIORITIES, DEFAULT_PRIORITY, IngressQueue
 from .lan_addresses.interfaces import get_lan_addresses
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Iterable
 
+    from .rate_limiter import SourceRateLimiter
     from .udp.endpoint import Address
 
 
@@ -32,6 +37,32 @@ class Endpoint(metaclass=abc.ABCMeta):
         self._prefix_map: dict[bytes, list[EndpointListener]] = {}
         self.prefixlen: int = prefixlen
         self.listener_update_lock: threading.RLock = threading.RLock()
+        self.worker_queue_size: int = 0
+        """
+        The maximum number of packets that can be queued for a listener that does not use the main thread.
+        If this is 0 (the default), all listeners are called on the main thread.
+        """
+        self._workers: dict[EndpointListener, ListenerWorker] = {}
+        self.ingress_queue_size: int = 0
+        """
+        The maximum number of incoming packets that can be queued per prefix before packets are dropped.
+        If this is 0 (the default), incoming packets are delivered immediately.
+        """
+        self.ingress_budget: int = 256
+        """
+        The maximum number of queued incoming packets to deliver per event loop iteration, shared by all prefixes.
+        """
+        self.ingress_priorities: dict[int, int] = dict(DEFAULT_INGRESS_PRIORITIES)
+        """
+        The ingress priority per message identifier: packets with a lower priority are dropped first.
+        """
+        self._ingress: dict[bytes | None, IngressQueue] = {}
+        self.rate_limiter: SourceRateLimiter | None = None
+        """
+        The rate limiter that incoming packets have to pass before they are queued or delivered, if any.
+        """
+        self._ingress_sequence_number = 0
+        self._ingress_scheduled = False
 
     def add_listener(self, listener: EndpointListener) -> None:
         """
@@ -72,6 +103,64 @@ class Endpoint(metaclass=abc.ABCMeta):
                 if set(listeners) != set(self._listeners):
                     new_prefix_map[prefix] = listeners
             self._prefix_map = new_prefix_map
+            worker = self._workers.pop(listener, None)
+        if worker is not None:
+            worker.stop()
+
+    def stop_workers(self, timeout: float = 1.0) -> None:
+        """
+        Stop the workers of all listeners and wait for their threads to exit, e.g., when this endpoint is closed.
+
+        :param timeout: the maximum number of seconds to wait for all worker threads together.
+        """
+        with self.listener_update_lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.join(max(deadline - time.monotonic(), 0.0))
+
+    def get_worker(self, listener: EndpointListener) -> ListenerWorker | None:
+        """
+        Get the worker that delivers packets to the given listener, if it does not use the main thread.
+        """
+        return self._workers.get(listener)
+
+    def _get_or_create_worker(self, listener: EndpointListener) -> ListenerWorker | None:
+        """
+        Get the worker for the given listener, creating it if needed, or None if the main thread should be used.
+        """
+        if listener.use_main_thread or self.worker_queue_size <= 0:
+            return None
+        worker = self._workers.get(listener)
+        if worker is None:
+            with self.listener_update_lock:
+                worker = self._workers.get(listener)
+                if worker is None:
+                    worker = self._workers[listener] = ListenerWorker(self, listener, self.worker_queue_size)
+        return worker
+
+    def _deliver(self, listener: EndpointListener, packet: tuple[Address, bytes]) -> None:
+        """
+        Deliver a packet to the given listener, on its worker thread if it does not need the main thread.
+        """
+        worker = self._get_or_create_worker(listener)
+        if worker is None:
+            self._deliver_later(listener, packet)
+        else:
+            worker.submit([packet])
+
+    def _deliver_batch(self, listener: EndpointListener, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Deliver a batch of packets to the given listener, on its worker thread if it does not need the main thread.
+        """
+        worker = self._get_or_create_worker(listener)
+        if worker is None:
+            self._deliver_batch_later(listener, packets)
+        else:
+            worker.submit(packets)
 
     def _deliver_later(self, listener: EndpointListener, packet: tuple[Address, bytes]) -> None:
         """
@@ -80,15 +169,132 @@ class Endpoint(metaclass=abc.ABCMeta):
         if self.is_open() and (packet[1][:self.prefixlen] in self._prefix_map or listener in self._listeners):
             listener.on_packet(packet)
 
+    def _deliver_batch_later(self, listener: EndpointListener, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Ensure that the listener is still loaded when delivering a batch of packets later.
+        """
+        if not self.is_open():
+            return
+        if listener not in self._listeners:
+            packets = [packet for packet in packets if packet[1][:self.prefixlen] in self._prefix_map]
+        if packets:
+            listener.on_packets(packets)
+
     def notify_listeners(self, packet: tuple[Address, bytes]) -> None:
         """
         Send data to all listeners.
         """
+        if self.rate_limiter is not None and not self.rate_limiter.allow(packet[0]):
+            return
+        if self.ingress_queue_size > 0:
+            self._queue_ingress([packet])
+            return
         prefix = packet[1][:self.prefixlen]
         listeners = self._prefix_map.get(prefix, self._listeners)
         for listener in listeners:
-            # TODO: Respect listener.use_main_thread:  # noqa: TD002, TD003, FIX002
-            self._deliver_later(listener, packet)
+            self._deliver(listener, packet)
+
+    def notify_listeners_batch(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Send a batch of data to all listeners.
+
+        The packets are demultiplexed by prefix in one pass and each listener receives all of its packets at once.
+        Packets with the same prefix keep their order, packets with different prefixes may be reordered.
+        """
+        if self.rate_limiter is not None:
+            packets = self.rate_limiter.filter(packets)
+            if not packets:
+                return
+        if self.ingress_queue_size > 0:
+            self._queue_ingress(packets)
+        else:
+            self._demultiplex_batch(packets)
+
+    def _demultiplex_batch(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Deliver a batch of data to the listeners of each packet's prefix.
+        """
+        prefixlen = self.prefixlen
+        packets_by_prefix: dict[bytes, list[tuple[Address, bytes]]] = {}
+        for packet in packets:
+            prefix = packet[1][:prefixlen]
+            prefix_packets = packets_by_prefix.get(prefix)
+            if prefix_packets is None:
+                packets_by_prefix[prefix] = [packet]
+            else:
+                prefix_packets.append(packet)
+
+        batches: dict[EndpointListener, list[tuple[Address, bytes]]] = {}
+        for prefix, prefix_packets in packets_by_prefix.items():
+            for listener in self._prefix_map.get(prefix, self._listeners):
+                batch = batches.get(listener)
+                if batch is None:
+                    batches[listener] = prefix_packets[:]
+                else:
+                    batch.extend(prefix_packets)
+
+        for listener, batch in batches.items():
+            self._deliver_batch(listener, batch)
+
+    def _queue_ingress(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Queue incoming packets per prefix, to be delivered in a later event loop iteration.
+
+        Packets with a prefix that nobody specifically listens for share a single queue.
+        """
+        prefixlen = self.prefixlen
+        priorities = self.ingress_priorities
+        for packet in packets:
+            data = packet[1]
+            prefix = data[:prefixlen]
+            key = prefix if prefix in self._prefix_map else None
+            queue = self._ingress.get(key)
+            if queue is None:
+                queue = self._ingress[key] = IngressQueue(self.ingress_queue_size)
+            priority = priorities.get(data[prefixlen], DEFAULT_PRIORITY) if len(data) > prefixlen else 0
+            self._ingress_sequence_number += 1
+            queue.push(self._ingress_sequence_number, priority, packet)
+
+        if not self._ingress_scheduled:
+            self._ingress_scheduled = True
+            get_running_loop().call_soon(self._drain_ingress)
+
+    def _drain_ingress(self) -> None:
+        """
+        Deliver up to ``ingress_budget`` queued packets, divided fairly over the prefixes that have queued packets.
+
+        If packets remain, we continue in the next event loop iteration, so other work is not starved.
+        """
+        self._ingress_scheduled = False
+        active = [queue for queue in self._ingress.values() if queue.size]
+        packets: list[tuple[Address, bytes]] = []
+        while active and len(packets) < self.ingress_budget:
+            share = max(1, (self.ingress_budget - len(packets)) // len(active))
+            for queue in active:
+                packets.extend(queue.pop() for _ in range(min(share, queue.size)))
+            active = [queue for queue in active if queue.size]
+
+        if active:
+            self._ingress_scheduled = True
+            get_running_loop().call_soon(self._drain_ingress)
+        if packets:
+            self._demultiplex_batch(packets)
+
+    def set_rate_limiter(self, rate_limiter: SourceRateLimiter | None) -> None:
+        """
+        Set the rate limiter for incoming packets, or None to accept all packets.
+        """
+        self.rate_limiter = rate_limiter
+
+    def get_ingress_statistics(self, prefix: bytes | None) -> dict[str, int]:
+        """
+        Get the number of queued packets, the maximum number of queued packets and the number of dropped packets for
+        the given prefix. Use None to get the statistics of the packets with prefixes that nobody listens for.
+        """
+        queue = self._ingress.get(prefix)
+        if queue is None:
+            return {"queued": 0, "max_queued": 0, "dropped": 0}
+        return queue.get_statistics()
 
     @abc.abstractmethod
     def assert_open(self) -> None:
@@ -192,6 +398,17 @@ class EndpointListener(metaclass=abc.ABCMeta):
         :param packet: the received packet, in (source, binary string) format.
         """
 
+    def on_packets(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Callback for when a batch of data is received on this endpoint.
+
+        By default, this calls ``on_packet`` for each packet. Listeners can override this to handle a batch at once.
+
+        :param packets: the received packets, in (source, binary string) format.
+        """
+        for packet in packets:
+            self.on_packet(packet)
+
     def _is_ipv6_address(self, address: str) -> bool:
         """
         Whether the supplied address is IPv6.
@@ -264,6 +481,102 @@ class EndpointListener(metaclass=abc.ABCMeta):
         return "127.0.0.1"
 
 
+class ListenerWorker:
+    """
+    Worker thread that delivers packets to a listener that does not need to run on the main thread.
+
+    Packets are queued up to a maximum number. When the queue is full, newly received packets are dropped instead of
+    stalling the receive path of the endpoint and all other listeners.
+    """
+
+    def __init__(self, endpoint: Endpoint, listener: EndpointListener, max_queued: int) -> None:
+        """
+        Start a new worker thread for the given listener.
+
+        :param endpoint: the endpoint that received the packets.
+        :param listener: the listener to deliver the packets to.
+        :param max_queued: the maximum number of packets that can wait to be delivered.
+        """
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self.endpoint = endpoint
+        self.listener = listener
+        self.max_queued = max_queued
+
+        self.queued = 0
+        self.delivered = 0
+        self.dropped = 0
+
+        self._queue: deque[list[tuple[Address, bytes]]] = deque()
+        self._condition = threading.Condition()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"{listener.__class__.__name__}Worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether this worker still accepts packets.
+        """
+        return self._running
+
+    def submit(self, packets: list[tuple[Address, bytes]]) -> bool:
+        """
+        Queue packets for delivery, dropping the packets that do not fit in the queue.
+
+        :return: whether all packets were queued.
+        """
+        with self._condition:
+            space = max(self.max_queued - self.queued, 0) if self._running else 0
+            accepted = packets if len(packets) <= space else packets[:space]
+            dropped = len(packets) - len(accepted)
+            if dropped:
+                self.dropped += dropped
+                self._logger.debug("Dropping %d packet(s) for %s, queue is full", dropped,
+                                   self.listener.__class__.__name__)
+            if accepted:
+                self._queue.append(accepted)
+                self.queued += len(accepted)
+                self._condition.notify()
+            return dropped == 0
+
+    def stop(self) -> None:
+        """
+        Stop delivering packets. Queued packets are discarded.
+
+        A delivery that is in progress is finished, but we do not wait for it.
+        """
+        with self._condition:
+            self._running = False
+            self._queue.clear()
+            self.queued = 0
+            self._condition.notify()
+
+    def join(self, timeout: float | None = None) -> None:
+        """
+        Wait for the worker thread to exit, after it has been stopped.
+        """
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """
+        Deliver queued packets until we are stopped.
+        """
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                packets = self._queue.popleft()
+                self.queued -= len(packets)
+            try:
+                self.endpoint._deliver_batch_later(self.listener, packets)  # noqa: SLF001
+            except Exception:
+                self._logger.exception("Exception occurred while delivering packets to %s",
+                                       self.listener.__class__.__name__)
+            self.delivered += len(packets)
+
+
 class IllegalEndpointListenerError(RuntimeError):
     """
     Exception raised when an EndpointListener instance was expected, but not supplied.
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .udp.endpoint import Address
+
+DEFAULT_PRIORITY = 1
+"""
+The ingress priority of messages that have no explicit priority.
+"""
+
+DEFAULT_INGRESS_PRIORITIES: dict[int, int] = {
+    245: 0,  # Introduction response
+    246: 0,  # Introduction request
+    249: 0,  # Puncture
+    250: 0,  # Puncture request
+}
+"""
+The default ingress priorities per message identifier. Packets with a lower priority are dropped first.
+
+Peer discovery traffic is cheap to lose (it is retried periodically) and is the most likely traffic to be flooded.
+"""
+
+
+class IngressQueue:
+    """
+    Bounded queue of incoming packets for a single prefix.
+
+    When the queue is full, the oldest packet of the lowest queued priority is dropped to make room for a packet with a
+    higher priority. Otherwise, the incoming packet itself is dropped. Packets are delivered in the order in which they
+    were received, regardless of their priority.
+    """
+
+    __slots__ = ("capacity", "dropped", "levels", "max_size", "size")
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Create a new queue that holds at most the given number of packets.
+        """
+        self.capacity = capacity
+        self.levels: dict[int, deque[tuple[int, tuple[Address, bytes]]]] = {}
+        self.size = 0
+        self.max_size = 0
+        self.dropped = 0
+
+    def push(self, sequence_number: int, priority: int, packet: tuple[Address, bytes]) -> bool:
+        """
+        Queue a packet, possibly dropping a packet of a lower priority.
+
+        :param sequence_number: the (increasing) number that determines the delivery order of the packet.
+        :param priority: the priority of the packet.
+        :param packet: the packet to queue.
+        :return: whether the packet was queued.
+        """
+        if self.size >= self.capacity:
+            self.dropped += 1
+            lowest = min((level for level, packets in self.levels.items() if packets), default=priority)
+            if lowest >= priority:
+                return False
+            self.levels[lowest].popleft()
+            self.size -= 1
+
+        level = self.levels.get(priority)
+        if level is None:
+            level = self.levels[priority] = deque()
+        level.append((sequence_number, packet))
+        self.size += 1
+        self.max_size = max(self.max_size, self.size)
+        return True
+
+    def pop(self) -> tuple[Address, bytes]:
+        """
+        Take the oldest packet from the queue.
+
+        :raises IndexError: if the queue is empty.
+        """
+        oldest = None
+        for packets in self.levels.values():
+            if packets and (oldest is None or packets[0][0] < oldest[0][0]):
+                oldest = packets
+        if oldest is None:
+            msg = "pop from an empty ingress queue"
+            raise IndexError(msg)
+        self.size -= 1
+        return oldest.popleft()[1]
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        Get the current number of queued packets, the maximum number of queued packets and the number of drops.
+        """
+        return {"queued": self.size, "max_queued": self.max_size, "dropped": self.dropped}
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from ...util import TokenBucket
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .udp.endpoint import Address
+
+
+class SourceRateLimiter:
+    """
+    Token bucket rate limiter for incoming packets, per source IP address.
+
+    Packets are limited per IP address, not per port, as ports are free to choose for the sender. The number of tracked
+    IP addresses is bounded: when it is exceeded, the least recently seen IP address is forgotten. Packets from allowed
+    IP addresses (e.g., those of the bootstrap servers) are never limited.
+    """
+
+    def __init__(self, rate: float = 100.0, burst: float = 200.0, max_sources: int = 4096) -> None:
+        """
+        Create a new rate limiter.
+
+        :param rate: the number of packets per second that each source is allowed to send.
+        :param burst: the number of packets that each source is allowed to send at once.
+        :param max_sources: the maximum number of sources to track.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_sources = max_sources
+        # Sources are kept in order of last use, so the least recently used source is always first.
+        self.buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self.allowed: set[str] = set()
+
+        self.accepted = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def set_allowed(self, addresses: Iterable[Address]) -> None:
+        """
+        Set the addresses that are never limited.
+        """
+        self.allowed = {address[0] for address in addresses}
+        for ip in self.allowed:
+            self.buckets.pop(ip, None)
+
+    def allow(self, address: Address, now: float | None = None) -> bool:
+        """
+        Check if we accept a packet from the given address and count it.
+        """
+        ip = address[0]
+        if ip in self.allowed:
+            self.accepted += 1
+            return True
+
+        now = time.monotonic() if now is None else now
+        bucket = self.buckets.get(ip)
+        if bucket is None:
+            if len(self.buckets) >= self.max_sources:
+                self.buckets.popitem(last=False)
+                self.evicted += 1
+            bucket = self.buckets[ip] = TokenBucket(self.rate, self.burst)
+            bucket.last_refill = now
+        else:
+            self.buckets.move_to_end(ip)
+
+        if bucket.consume(1, now):
+            self.accepted += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def filter(self, packets: list[tuple[Address, bytes]]) -> list[tuple[Address, bytes]]:
+        """
+        Get the packets that we accept from the given packets.
+        """
+        now = time.monotonic()
+        return [packet for packet in packets if self.allow(packet[0], now)]
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        Get the number of accepted and rejected packets and the number of evicted, tracked and allowed sources.
+        """
+        return {"accepted": self.accepted, "rejected": self.rejected, "evicted": self.evicted,
+                "sources": len(self.buckets), "allowed": len(self.allowed)}
@@ -72,6 +72,19 @@ class StatisticsEndpoint(EndpointListener, Endpoint):
         message_id = data[22]
         self.add_received_stat(prefix, message_id, len(data))
 
+    def on_packets(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Callback for when a batch of packets is received through our underlying endpoint.
+        """
+        statistics = self.statistics
+        if not statistics:
+            return
+        timestamp = time.time()
+        for _, data in packets:
+            prefix = data[:22]
+            if prefix in statistics and len(data) > 22:
+                self.add_received_stat(prefix, data[22], len(data), timestamp)
+
     # Statistics methods
     def add_sent_stat(self, prefix: bytes, identifier: int, num_bytes: int, timestamp: float | None = None) -> None:
         """
@@ -93,6 +106,13 @@ class StatisticsEndpoint(EndpointListener, Endpoint):
             self.statistics[prefix][identifier] = NetworkStat(identifier)
         self.statistics[prefix][identifier].add_received_stat(timestamp if timestamp else time.time(), num_bytes)
 
+    def get_ingress_statistics(self, prefix: bytes | None) -> dict[str, int]:
+        """
+        Get the number of queued packets, the maximum number of queued packets and the number of dropped packets in the
+        ingress queues of the underlying endpoint for the given prefix.
+        """
+        return self.endpoint.get_ingress_statistics(prefix)
+
     def get_statistics(self, prefix: bytes) -> dict[int, NetworkStat]:
         """
         Get the message statistics per message identifier for the given prefix.
@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import asyncio
+import errno
+import socket
+import struct
+import typing
+from collections import deque
+from ctypes import (
+    CDLL,
+    POINTER,
+    Structure,
+    addressof,
+    c_char,
+    c_char_p,
+    c_int,
+    c_size_t,
+    c_uint,
+    c_uint32,
+    c_void_p,
+    cast,
+    get_errno,
+    memmove,
+    pointer,
+)
+
+from ..endpoint import EndpointClosedException
+from .endpoint import UDPEndpoint, UDPv4Address, UDPv6Address
+
+if typing.TYPE_CHECKING:
+    from .endpoint import Address, SocketOption
+
+libc = CDLL("libc.so.6", use_errno=True)
+
+MSG_DONTWAIT = 0x40
+MSG_TRUNC = 0x20
+
+SOCKADDR_SIZE = 28  # The size of the largest supported address struct: ``sockaddr_in6``.
+SOCKADDR_FAMILY = struct.Struct("=H")
+SOCKADDR_IN = struct.Struct("!H4s8x")
+SOCKADDR_IN6 = struct.Struct("!HI16sI")
+PORT = struct.Struct("!H")
+
+# ruff: noqa: N801
+
+
+class iovec(Structure):
+    """
+    Scatter/gather buffer struct.
+    """
+
+    _fields_ = [
+        ("iov_base", c_void_p),
+        ("iov_len", c_size_t)
+    ]
+
+
+class msghdr(Structure):
+    """
+    Message header struct, as used by ``recvmsg`` and ``sendmsg``.
+    """
+
+    _fields_ = [
+        ("msg_name", c_void_p),
+        ("msg_namelen", c_uint32),
+        ("msg_iov", POINTER(iovec)),
+        ("msg_iovlen", c_size_t),
+        ("msg_control", c_void_p),
+        ("msg_controllen", c_size_t),
+        ("msg_flags", c_int)
+    ]
+
+
+class mmsghdr(Structure):
+    """
+    Message header struct with the number of transmitted bytes, as used by ``recvmmsg`` and ``sendmmsg``.
+    """
+
+    _fields_ = [
+        ("msg_hdr", msghdr),
+        ("msg_len", c_uint)
+    ]
+
+
+libc.recvmmsg.argtypes = [c_int, POINTER(mmsghdr), c_uint, c_int, c_void_p]
+libc.recvmmsg.restype = c_int
+libc.sendmmsg.argtypes = [c_int, POINTER(mmsghdr), c_uint, c_int]
+libc.sendmmsg.restype = c_int
+
+
+class MessageBatch:
+    """
+    Preallocated message headers, address buffers and (optionally) data buffers for a batch of messages.
+    """
+
+    def __init__(self, batch_size: int, packet_size: int = 0) -> None:
+        """
+        Allocate the structures for ``batch_size`` messages with data buffers of ``packet_size`` bytes.
+        """
+        self.messages = (mmsghdr * batch_size)()
+        self.iovecs = (iovec * batch_size)()
+        self.names = (c_char * (batch_size * SOCKADDR_SIZE))()
+        self.names_view = memoryview(self.names).cast("B")
+        self.buffer = (c_char * (batch_size * packet_size))()
+        self.buffer_view = memoryview(self.buffer).cast("B")
+        self.packet_size = packet_size
+
+        names_address = addressof(self.names)
+        buffer_address = addressof(self.buffer)
+        for i in range(batch_size):
+            header = self.messages[i].msg_hdr
+            header.msg_name = names_address + i * SOCKADDR_SIZE
+            header.msg_namelen = SOCKADDR_SIZE
+            header.msg_iov = pointer(self.iovecs[i])
+            header.msg_iovlen = 1
+            self.iovecs[i].iov_base = buffer_address + i * packet_size
+            self.iovecs[i].iov_len = packet_size
+
+    def get_address(self, index: int) -> Address:
+        """
+        Get the source address of the given received message.
+        """
+        offset = index * SOCKADDR_SIZE
+        family, = SOCKADDR_FAMILY.unpack_from(self.names_view, offset)
+        port, = PORT.unpack_from(self.names_view, offset + 2)
+        if family == socket.AF_INET6:
+            return UDPv6Address(socket.inet_ntop(socket.AF_INET6, self.names_view[offset + 8:offset + 24]), port)
+        return UDPv4Address(socket.inet_ntop(socket.AF_INET, self.names_view[offset + 4:offset + 8]), port)
+
+    def get_data(self, index: int) -> bytes:
+        """
+        Get the data of the given received message.
+        """
+        offset = index * self.packet_size
+        return bytes(self.buffer_view[offset:offset + self.messages[index].msg_len])
+
+    def set_message(self, index: int, sockaddr: bytes, packet: bytes) -> None:
+        """
+        Point the given message to a destination address and the data to send.
+
+        The packet must be kept alive until the message has been sent.
+        """
+        memmove(addressof(self.names) + index * SOCKADDR_SIZE, sockaddr, len(sockaddr))
+        self.messages[index].msg_hdr.msg_namelen = len(sockaddr)
+        self.iovecs[index].iov_base = cast(c_char_p(packet), c_void_p).value
+        self.iovecs[index].iov_len = len(packet)
+
+
+class UDPBatchEndpoint(UDPEndpoint):
+    """
+    Endpoint that binds UDP (over IPv4 by default) and receives and sends packets in batches.
+
+    Instead of one system call per packet, up to ``batch_size`` packets are read using a single ``recvmmsg`` call when
+    the socket becomes readable. Packets that are sent within the same event loop iteration are written using a single
+    ``sendmmsg`` call. This only works on Linux.
+    """
+
+    def __init__(self, port: int = 0, ip: str = "0.0.0.0", sockopts: list[SocketOption] | None = None,
+                 batch_size: int = 32, max_packet_size: int = 65536) -> None:
+        """
+        Create a new batched UDP endpoint that will attempt to bind on the given ip and ATTEMPT to claim the given port.
+
+        :param batch_size: the maximum number of packets to receive or send with a single system call.
+        :param max_packet_size: the maximum size of received packets, larger packets are dropped.
+        """
+        super().__init__(port, ip, sockopts)
+        self.batch_size = batch_size
+        self.max_packet_size = max_packet_size
+
+        self._socket: socket.socket | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._receive_batch = MessageBatch(batch_size, max_packet_size)
+        self._send_batch = MessageBatch(batch_size)
+        self._send_queue: deque[tuple[bytes, bytes]] = deque()
+        self._send_scheduled = False
+        self._send_blocked = False
+
+    def _pack_address(self, socket_address: Address) -> bytes:
+        """
+        Convert the given address to a ``sockaddr_in`` or ``sockaddr_in6`` struct, depending on our socket family.
+
+        :raises OSError: if the address is not an IP address of our socket family.
+        """
+        ip, port = socket_address[0], socket_address[1]
+        if self.SOCKET_FAMILY == socket.AF_INET6:
+            return (SOCKADDR_FAMILY.pack(socket.AF_INET6)
+                    + SOCKADDR_IN6.pack(port, 0, socket.inet_pton(socket.AF_INET6, ip), 0))
+        return SOCKADDR_FAMILY.pack(socket.AF_INET) + SOCKADDR_IN.pack(port, socket.inet_pton(socket.AF_INET, ip))
+
+    def send(self, socket_address: Address, packet: bytes) -> None:
+        """
+        Queue a packet to be sent to a given address, at the end of the current event loop iteration.
+
+        :param socket_address: Tuple of (IP, port) which indicates the destination of the packet.
+        :param packet: the raw (binary) data to send.
+        """
+        self.assert_open()
+        try:
+            sockaddr = self._pack_address(socket_address)
+        except (TypeError, ValueError, IndexError, OSError, struct.error) as exc:
+            self._logger.warning("Dropping packet due to message formatting error: %s", exc)
+            return
+        self._send_queue.append((sockaddr, packet if isinstance(packet, bytes) else bytes(packet)))
+        if not self._send_scheduled and not self._send_blocked:
+            self._send_scheduled = True
+            typing.cast("asyncio.AbstractEventLoop", self._loop).call_soon(self._send_queued)
+
+    def _send_queued(self) -> None:
+        """
+        Send the queued packets using as few ``sendmmsg`` calls as possible.
+
+        If the socket buffer is full, we wait for the socket to become writable again.
+        """
+        self._send_scheduled = False
+        if not self._running:
+            return
+        batch = self._send_batch
+        queue = self._send_queue
+        loop = typing.cast("asyncio.AbstractEventLoop", self._loop)
+        fileno = typing.cast("socket.socket", self._socket).fileno()
+
+        while queue:
+            count = min(len(queue), self.batch_size)
+            for i in range(count):
+                batch.set_message(i, *queue[i])
+            sent = libc.sendmmsg(fileno, batch.messages, count, 0)
+            if sent < 0:
+                error = get_errno()
+                if error in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    if not self._send_blocked:
+                        self._send_blocked = True
+                        loop.add_writer(fileno, self._send_queued)
+                    return
+                # The first message could not be sent, drop it and continue with the others.
+                self._logger.warning("Dropping packet due to send error: %s", errno.errorcode.get(error, error))
+                queue.popleft()
+                continue
+            for _ in range(sent):
+                self.bytes_up += len(queue.popleft()[1])
+
+        if self._send_blocked:
+            self._send_blocked = False
+            loop.remove_writer(fileno)
+
+    def _receive(self) -> None:
+        """
+        Receive a batch of packets, now that the socket is readable.
+        """
+        if not self._running:
+            return
+        batch = self._receive_batch
+        messages = batch.messages
+        received = libc.recvmmsg(typing.cast("socket.socket", self._socket).fileno(), messages, self.batch_size,
+                                 MSG_DONTWAIT, None)
+        if received < 0:
+            error = get_errno()
+            if error not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                self._logger.warning("Failed to receive packets: %s", errno.errorcode.get(error, error))
+            return
+
+        packets = []
+        for i in range(received):
+            header = messages[i].msg_hdr
+            if not header.msg_flags & MSG_TRUNC:
+                packets.append((batch.get_address(i), batch.get_data(i)))
+            header.msg_namelen = SOCKADDR_SIZE
+            header.msg_flags = 0
+        self.datagrams_received(packets)
+
+    def datagrams_received(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Process a batch of incoming data.
+        """
+        self.bytes_down += sum(len(datagram) for _, datagram in packets)
+        self.notify_listeners_batch(packets)
+
+    async def open(self) -> bool:
+        """
+        Open the Endpoint.
+
+        :return: True is the Endpoint was successfully opened, False otherwise.
+        """
+        if self._running:
+            return True
+
+        self._loop = asyncio.get_running_loop()
+
+        for _ in range(10000):
+            try:
+                self._socket = self._create_socket()
+                self._logger.debug("Listening at %d", self._port)
+                break
+            except (OSError, ValueError):
+                self._logger.debug("Listening failed at %d", self._port)
+                self._port += 1
+                continue
+        else:
+            return False
+
+        self._loop.add_reader(self._socket.fileno(), self._receive)
+
+        self._running = True
+        return True
+
+    def assert_open(self) -> None:
+        """
+        Check if we are opened by the programmer.
+        """
+        if not self._running:
+            raise EndpointClosedException(self)
+
+    def close(self) -> None:
+        """
+        Closes the Endpoint.
+        """
+        self.stop_workers()
+        if not self._running:
+            return
+
+        self._running = False
+
+        loop = self._loop
+        sock = self._socket
+        if loop is not None and sock is not None:
+            loop.remove_reader(sock.fileno())
+            if self._send_blocked:
+                loop.remove_writer(sock.fileno())
+            sock.close()
+        self._send_blocked = False
+        self._send_queue.clear()
+
+    def get_address(self) -> Address:
+        """
+        Get the address for this Endpoint.
+        """
+        self.assert_open()
+        return typing.cast("socket.socket", self._socket).getsockname()
+
+
+class UDPv6BatchEndpoint(UDPBatchEndpoint):
+    """
+    UDPBatchEndpoint subclass that binds to IPv6 instead of IPv4.
+    """
+
+    SOCKET_FAMILY = socket.AF_INET6
+
+    def __init__(self, port: int = 0, ip: str = "::", batch_size: int = 32, max_packet_size: int = 65536) -> None:
+        """
+        Create new batched UDP endpoint over IPv6.
+        """
+        super().__init__(port, ip, [(socket.SOL_SOCKET, socket.SO_RCVBUF, 870400),
+                                    (socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)], batch_size, max_packet_size)
@@ -105,6 +105,24 @@ class UDPEndpoint(Endpoint, asyncio.DatagramProtocol):
         """
         self._logger.log(level, message)
 
+    def _create_socket(self) -> socket.socket:
+        """
+        Create a non-blocking socket that is bound to our ip and port and update our port to the bound port.
+
+        :raises OSError: if the socket could not be bound.
+        """
+        s = socket.socket(self.SOCKET_FAMILY, socket.SOCK_DGRAM)
+        try:
+            for level, optname, value in self._sockopts:
+                s.setsockopt(level, optname, value)
+            s.bind((self._ip, self._port))
+            s.setblocking(False)
+        except (OSError, ValueError):
+            s.close()
+            raise
+        self._port = s.getsockname()[1]
+        return s
+
     async def open(self) -> bool:
         """
         Open the Endpoint.
@@ -122,12 +140,7 @@ class UDPEndpoint(Endpoint, asyncio.DatagramProtocol):
             try:
                 # It is recommended that this endpoint is opened at port = 0,
                 # such that the OS handles the port assignment
-                s = socket.socket(self.SOCKET_FAMILY, socket.SOCK_DGRAM)
-                for level, optname, value in self._sockopts:
-                    s.setsockopt(level, optname, value)
-                s.bind((self._ip, self._port))
-                s.setblocking(False)
-                self._port = s.getsockname()[1]
+                s = self._create_socket()
 
                 self._transport, _ = await loop.create_datagram_endpoint(lambda: self, sock=s)
 
@@ -152,6 +165,7 @@ class UDPEndpoint(Endpoint, asyncio.DatagramProtocol):
         """
         Closes the Endpoint.
         """
+        self.stop_workers()
         if not self._running:
             return
 
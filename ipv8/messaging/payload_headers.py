@@ -29,7 +29,7 @@ class BinMemberAuthenticationPayload(Payload):
         """
         Read the serialized key material into a payload.
         """
-        return BinMemberAuthenticationPayload(public_key_bin)
+        return BinMemberAuthenticationPayload(bytes(public_key_bin))
 
 
 class GlobalTimeDistributionPayload(Payload):
@@ -6,7 +6,7 @@ import typing
 from array import array
 from binascii import hexlify
 from contextlib import suppress
-from struct import Struct, pack, unpack_from
+from struct import Struct, pack, pack_into, unpack_from
 from typing import TYPE_CHECKING, TypeAlias, cast
 
 from .interfaces.udp.endpoint import DomainAddress, UDPv4Address, UDPv6Address
@@ -43,8 +43,16 @@ class Packer(typing.Generic[T, A], metaclass=abc.ABCMeta):
         Pack the given data.
         """
 
+    def pack_into(self, buffer: bytearray, *data: T) -> None:
+        """
+        Pack the given data and append it to the given buffer.
+
+        By default, this appends the output of ``pack()``. Packers can override this to avoid intermediate copies.
+        """
+        buffer += self.pack(*data)  # type: ignore[call-arg]
+
     @abc.abstractmethod
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: A) -> int:
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: A) -> int:
         """
         Unpack an object from the given data buffer and return the new offset in the data buffer.
         """
@@ -90,11 +98,24 @@ class NestedPayload(Packer):
         :param serializable: the Serializable instance which we should serialize.
         :return: the serialized data
         """
-        data = self.serializer.pack_serializable(serializable)
-        return pack(">H", len(data)) + data
+        buffer = bytearray()
+        self.pack_into(buffer, serializable)
+        return bytes(buffer)
+
+    def pack_into(self, buffer: bytearray, serializable: Serializable) -> None:  # type: ignore[override]
+        """
+        Pack some serializable into the given buffer, back-patching the length prefix afterward.
+
+        :param buffer: the buffer to append the serialized data to.
+        :param serializable: the Serializable instance which we should serialize.
+        """
+        length_offset = len(buffer)
+        buffer += b"\x00\x00"
+        self.serializer.pack_serializable_into(serializable, buffer)
+        pack_into(">H", buffer, length_offset, len(buffer) - length_offset - 2)
 
     def unpack(self,
-               data: bytes,
+               data: bytes | memoryview,
                offset: int,
                unpack_list: list,
                *args: type[Serializable]) -> int:
@@ -139,7 +160,7 @@ class Bits(Packer):
         byte |= 0x01 if data[7] else 0x00
         return pack(">B", byte)
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack multiple bits from a single byte. The resulting bits are appended to unpack_list.
 
@@ -169,7 +190,13 @@ class Raw(Packer):
         """
         return packable
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def pack_into(self, buffer: bytearray, packable: bytes) -> None:  # type: ignore[override]
+        """
+        Append the packable to the buffer without doing anything to it.
+        """
+        buffer += packable
+
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Match everything remaining in the data as a bytes string.
         """
@@ -196,7 +223,14 @@ class VarLen(Packer):
         """
         return pack(self.length_format, len(data) // self.base) + data
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def pack_into(self, buffer: bytearray, data: bytes) -> None:  # type: ignore[override]
+        """
+        Append the length of the given data, followed by the data itself, to the buffer.
+        """
+        buffer += pack(self.length_format, len(data) // self.base)
+        buffer += data
+
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack from VarLen packed data.
         """
@@ -216,13 +250,19 @@ class VarLenUtf8(VarLen):
         """
         return super().pack(data.encode())
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def pack_into(self, buffer: bytearray, data: str) -> None:  # type: ignore[override]
+        """
+        Append a packed UTF-8 string to the buffer.
+        """
+        super().pack_into(buffer, data.encode())
+
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack an encoded UTF-8 string.
         """
         encoded_data: list[bytes] = []
         out = super().unpack(data, offset, encoded_data)
-        unpack_list.append(encoded_data[0].decode())
+        unpack_list.append(str(encoded_data[0], "utf-8"))
         return out
 
 
@@ -237,7 +277,7 @@ class IPv4(Packer):
         """
         return pack(">4sH", socket.inet_aton(data[0]), data[1])
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack a packed IPv4 address.
         """
@@ -275,7 +315,7 @@ class Address(Packer):
         msg = f"Unexpected address type {address}"
         raise PackError(msg)
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack a generic address from bytes.
         """
@@ -290,7 +330,7 @@ class Address(Packer):
             return offset + 19
         if not self.ip_only and address_type == ADDRESS_TYPE_DOMAIN_NAME:
             length, = unpack_from(">H", data, offset + 1)
-            host = data[offset + 3: offset + 3 + length].decode()
+            host = str(data[offset + 3: offset + 3 + length], "utf-8")
             unpack_list.append(DomainAddress(host, unpack_from(">H", data, offset + 3 + length)[0]))
             return offset + 5 + length
         msg = f"Cannot unpack address type {address_type}"
@@ -316,9 +356,19 @@ class ListOf(Packer):
         """
         Feed a list of objects to the registered packer.
         """
-        return pack(self.length_format, len(data)) + b"".join([self.packer.pack(item) for item in data])
+        buffer = bytearray()
+        self.pack_into(buffer, data)
+        return bytes(buffer)
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def pack_into(self, buffer: bytearray, data: list) -> None:  # type: ignore[override]
+        """
+        Feed a list of objects to the registered packer, appending the output to the given buffer.
+        """
+        buffer += pack(self.length_format, len(data))
+        for item in data:
+            self.packer.pack_into(buffer, item)
+
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack a list of objects from the data.
         """
@@ -355,7 +405,7 @@ class DefaultArray(Packer):
         """
         return pack(self.length_format, len(data)) + array(self.real_format_str, data).tobytes()
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack a list of items from the known ``array`` format.
         """
@@ -376,15 +426,22 @@ class DefaultStruct(Packer):
         Create a new packer for the given ``struct`` format string.
         """
         self.format_str = format_str
-        self.size = Struct(format_str).size
+        self.struct = Struct(format_str)
+        self.size = self.struct.size
 
     def pack(self, *data: list) -> bytes:
         """
         Pack a list of items by forwarding them to ``struct``.
         """
-        return pack(self.format_str, *data)
+        return self.struct.pack(*data)
 
-    def unpack(self, data: bytes, offset: int, unpack_list: list, *args: object) -> int:
+    def pack_into(self, buffer: bytearray, *data: list) -> None:
+        """
+        Append the packed items to the given buffer.
+        """
+        buffer += self.struct.pack(*data)
+
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
         """
         Unpack a list of items from the known ``struct`` format.
         """
@@ -393,6 +450,51 @@ class DefaultStruct(Packer):
         return offset + self.size
 
 
+class MergedStruct(Packer):
+    """
+    Adjacent ``DefaultStruct`` formats of a ``Serializable``, merged into a single ``struct`` call.
+
+    This packer is only used for unpacking: the unpacked values are split up again to mimic the output of the
+    original, separate, ``DefaultStruct`` packers.
+    """
+
+    def __init__(self, packers: Sequence[DefaultStruct]) -> None:
+        """
+        Merge the given ``DefaultStruct`` packers, which must share the same byte order character.
+        """
+        self.byte_order = packers[0].format_str[0]
+        self.struct = Struct(self.byte_order + "".join(packer.format_str[1:] for packer in packers))
+        self.size = self.struct.size
+        self.value_counts = [len(Struct(packer.format_str).unpack(bytes(packer.size))) for packer in packers]
+
+    @staticmethod
+    def can_merge(packer: Packer) -> bool:
+        """
+        Check whether the given packer is a plain ``DefaultStruct`` with an explicit byte order.
+        """
+        return type(packer) is DefaultStruct and packer.format_str[:1] in ("<", ">", "!", "=")
+
+    def pack(self, *data: list) -> bytes:
+        """
+        Pack the flattened values of all merged formats.
+        """
+        return self.struct.pack(*data)
+
+    def unpack(self, data: bytes | memoryview, offset: int, unpack_list: list, *args: object) -> int:
+        """
+        Unpack all merged formats at once and append the values per original format.
+        """
+        result = self.struct.unpack_from(data, offset)
+        index = 0
+        for count in self.value_counts:
+            unpack_list.append(result[index:index + count] if count > 1 else result[index])
+            index += count
+        return offset + self.size
+
+
+UnpackPlan: TypeAlias = "list[tuple[object, Packer, tuple]]"
+
+
 class Serializer:
     """
     The class performing serialization of Serializable objects.
@@ -447,6 +549,7 @@ class Serializer:
             "arrayH-q": DefaultArray("q", "H"),
             "arrayH-d": DefaultArray("d", "H"),
         }
+        self._unpack_plans: dict[type[Serializable], tuple[list[FormatListType], UnpackPlan]] = {}
 
     def get_available_formats(self) -> list[str]:
         """
@@ -468,6 +571,7 @@ class Serializer:
         :param packer: the packer to use for it
         """
         self._packers[name] = packer
+        self._unpack_plans.clear()
 
     def pack(self, fmt: str, item: object) -> bytes:
         """
@@ -479,7 +583,7 @@ class Serializer:
         """
         return self._packers[fmt].pack(item)
 
-    def unpack(self, fmt: FormatListType, data: bytes, offset: int = 0) -> tuple[object, int]:
+    def unpack(self, fmt: FormatListType, data: bytes | memoryview, offset: int = 0) -> tuple[object, int]:
         """
         Unpack data without using a Serializable. Using a Serializable is the preferred method.
 
@@ -505,14 +609,23 @@ class Serializer:
         :type serializable: Serializable
         :return: the serialized object
         """
-        packed = b""
+        buffer = bytearray()
+        self.pack_serializable_into(serializable, buffer)
+        return bytes(buffer)
+
+    def pack_serializable_into(self, serializable: Serializable, buffer: bytearray) -> None:
+        """
+        Serialize a single Serializable instance and append it to the given buffer.
+
+        :param serializable: the Serializable to pack
+        :param buffer: the buffer to append the serialized object to
+        """
         for packable in serializable.to_pack_list():
             try:
-                packed += self._packers[packable[0]].pack(*packable[1:])
+                self._packers[packable[0]].pack_into(buffer, *packable[1:])
             except Exception as e:
                 msg = f"Could not pack item: {packable}\n{type(e).__name__}: {e}"
                 raise PackError(msg) from e
-        return packed
 
     def pack_serializable_list(self, serializables: Sequence[Serializable]) -> bytes:
         """
@@ -522,42 +635,104 @@ class Serializer:
         :type serializables: [Serializable]
         :return: the serialized list
         """
-        return b"".join(self.pack_serializable(serializable) for serializable in serializables)
+        buffer = bytearray()
+        self.pack_serializable_list_into(serializables, buffer)
+        return bytes(buffer)
+
+    def pack_serializable_list_into(self, serializables: Sequence[Serializable], buffer: bytearray) -> None:
+        """
+        Serialize a list of Serializable instances and append them to the given buffer.
+
+        :param serializables: the Serializables to pack
+        :param buffer: the buffer to append the serialized list to
+        """
+        for serializable in serializables:
+            self.pack_serializable_into(serializable, buffer)
 
     def unpack_serializable(self,
                             serializable: type[S],
-                            data: bytes,
+                            data: bytes | memoryview,
                             offset: int = 0) -> tuple[S, int]:
         """
         Use the formats specified in a serializable object and unpack to it.
 
+        If the given data is a ``memoryview``, the data is decoded without copying: "raw", "varlen" and nested
+        payload fields are then ``memoryview`` slices of the given data. Use ``bytes()`` to materialize them.
+
         :param serializable: the serializable classes to get the format from and unpack to
         :param data: the data to unpack from
         :param offset: the optional offset to unpack data from
         """
+        format_list = serializable.format_list
+        cached = self._unpack_plans.get(serializable)
+        if cached is None or cached[0] is not format_list:
+            cached = (format_list, self._compile_unpack_plan(format_list))
+            self._unpack_plans[serializable] = cached
         unpack_list: list = []
-        for fmt in serializable.format_list:
+        for fmt, packer, args in cached[1]:
             try:
-                offset = self._packers[fmt].unpack(data, offset, unpack_list)  # type: ignore[index]
-            except KeyError:
-                fmt = cast("type", fmt)  # If this is not a type, we'll crash
-                if not issubclass(fmt, Serializable):
-                    raise
-                offset = self._packers["payload"].unpack(data, offset, unpack_list, fmt)
-            except TypeError:
-                if not isinstance(fmt, list):
-                    raise
-                offset = self._packers["payload-list"].unpack(data, offset, unpack_list, fmt[0])
+                offset = packer.unpack(data, offset, unpack_list, *args)
             except Exception as e:
                 msg = f"Could not unpack item: {fmt}\n{type(e).__name__}: {e}"
                 raise PackError(msg) from e
         return serializable.from_unpack_list(*unpack_list), offset
 
+    def _compile_unpack_plan(self, format_list: list[FormatListType]) -> UnpackPlan:
+        """
+        Resolve the packers for a format list once, so we don't need to look them up for every unpack.
+
+        Adjacent ``DefaultStruct`` formats are merged into a single ``MergedStruct`` and nested (lists of)
+        Serializable classes are resolved to the "payload" and "payload-list" packers.
+
+        :param format_list: the format list of a Serializable
+        :return: a list of (format, packer, packer arguments) tuples
+        """
+        plan: UnpackPlan = []
+        structs: list[tuple[FormatListType, DefaultStruct]] = []
+
+        def flush_structs() -> None:
+            if len(structs) == 1:
+                plan.append((structs[0][0], structs[0][1], ()))
+            elif structs:
+                plan.append(([fmt for fmt, _ in structs], MergedStruct([packer for _, packer in structs]), ()))
+            structs.clear()
+
+        for fmt in format_list:
+            packer, args = self._resolve_unpack_format(fmt)
+            if MergedStruct.can_merge(packer):
+                packer = cast("DefaultStruct", packer)
+                if structs and structs[0][1].format_str[0] != packer.format_str[0]:
+                    flush_structs()
+                structs.append((fmt, packer))
+                continue
+            flush_structs()
+            plan.append((fmt, packer, args))
+        flush_structs()
+        return plan
+
+    def _resolve_unpack_format(self, fmt: FormatListType) -> tuple[Packer, tuple]:
+        """
+        Get the packer and packer arguments for a single format of a format list.
+
+        :param fmt: a format name, a list with a nested Serializable class, or a nested Serializable class
+        :return: the packer and the arguments to pass to it
+        """
+        if isinstance(fmt, str):
+            packer = self._packers.get(fmt)
+            if packer is not None:
+                return packer, ()
+        elif isinstance(fmt, list):
+            return self._packers["payload-list"], (fmt[0], )
+        elif isinstance(fmt, type) and issubclass(fmt, Serializable):
+            return self._packers["payload"], (fmt, )
+        msg = f"Unknown format: {fmt}"
+        raise PackError(msg)
+
     def unpack_serializable_list(self,
                                  serializables: Sequence[type[Serializable]],
-                                 data: bytes,
+                                 data: bytes | memoryview,
                                  offset: int = 0,
-                                 consume_all: bool = True) -> list[Serializable | bytes]:
+                                 consume_all: bool = True) -> list[Serializable | bytes | memoryview]:
         """
         Use the formats specified in a list of serializable objects and unpack to them.
 
@@ -569,7 +744,7 @@ class Serializer:
         :except PackError: if consume_all is True and not all the data was consumed when parsing the serializables
         :return: the list of Serializable instances
         """
-        unpacked: list[Serializable | bytes] = []
+        unpacked: list[Serializable | bytes | memoryview] = []
         for serializable in serializables:
             payload, offset = self.unpack_serializable(serializable, data, offset)
             unpacked.append(payload)
@@ -3,6 +3,7 @@ from __future__ import annotations
 import abc
 import asyncio
 import logging
+from random import choice
 from types import SimpleNamespace
 from typing import TYPE_CHECKING, Generic, TypeVar
 
@@ -13,6 +14,8 @@ from .messaging.serialization import Serializer
 from .taskmanager import TaskManager
 
 if TYPE_CHECKING:
+    from collections.abc import Container
+
     from .messaging.interfaces.udp.endpoint import Address
     from .peer import Peer
     from .peerdiscovery.discovery import DiscoveryStrategy
@@ -165,6 +168,16 @@ class Overlay(EndpointListener, TaskManager, Generic[SettingsClass], metaclass=a
         :rtype: [(str, int)]
         """
 
+    def get_random_walkable_address(self, exclude: Container[Address] = ()) -> Address | None:
+        """
+        Get a random address we can walk to on this overlay.
+
+        :param exclude: addresses that should not be returned
+        :return: a random walkable address or None if there are no (non-excluded) walkable addresses
+        """
+        available = [address for address in self.get_walkable_addresses() if address not in exclude]
+        return choice(available) if available else None
+
     def get_peer_for_introduction(self, exclude: Peer | None = None) -> Peer | None:
         """
         Get a peer for introduction.
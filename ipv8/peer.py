@@ -11,41 +11,79 @@ from .keyvault.keys import Key
 from .messaging.interfaces.udp.endpoint import Address, UDPv4Address, UDPv6Address
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Callable, Mapping
 
 
 class DirtyDict(dict):
     """
     Dictionary that becomes dirty when elements are changed.
+
+    Observers can be registered to be called back with the ``(old, new)`` values whenever a value is added, changed or
+    removed. Removed values are reported as ``(old, None)`` and added values as ``(None, new)``.
     """
 
+    __slots__ = ("dirty", "observers")
+
     def __init__(self, **kwargs) -> None:
         """
         Create a new dict that flags when its content has been updated.
         """
         super().__init__(**kwargs)
         self.dirty = True
+        self.observers: list[Callable[[Any, Any], None]] | None = None
+
+    def add_observer(self, observer: Callable[[Any, Any], None]) -> None:
+        """
+        Register a callback for value changes.
+        """
+        if self.observers is None:
+            self.observers = []
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Callable[[Any, Any], None]) -> None:
+        """
+        Unregister a callback for value changes, if it was registered.
+        """
+        if self.observers and observer in self.observers:
+            self.observers.remove(observer)
+
+    def _notify(self, old: Any, new: Any) -> None:  # noqa: ANN401
+        """
+        Inform the observers of a value change.
+        """
+        for observer in list(self.observers or ()):
+            observer(old, new)
 
     def __setitem__(self, key: Any, value: Any) -> None: # noqa: ANN401
         """
         Callback for when an item is set to a value. This dirties the dict.
         """
+        old = self.get(key)
         super().__setitem__(key, value)
         self.dirty = True
+        if self.observers and old != value:
+            self._notify(old, value)
 
     def update(self, mapping: Mapping, **kwargs) -> None:  # type: ignore[override]
         """
         Callback for when another mapping is merged into this dict. This dirties the dict.
         """
-        super().update(mapping, **kwargs)
+        if self.observers:
+            for key, value in dict(mapping, **kwargs).items():
+                self[key] = value
+        else:
+            super().update(mapping, **kwargs)
         self.dirty = True
 
     def clear(self) -> None:
         """
         Callback for when all items are removed. This dirties the dict.
         """
+        old_values = list(self.values()) if self.observers else []
         super().clear()
         self.dirty = True
+        for old in old_values:
+            self._notify(old, None)
 
     def pop(self, key: Any) -> Any:  # type: ignore[override]  # noqa: ANN401
         """
@@ -53,6 +91,8 @@ class DirtyDict(dict):
         """
         out = super().pop(key)
         self.dirty = True
+        if self.observers:
+            self._notify(out, None)
         return out
 
     def popitem(self) -> Any:  # noqa: ANN401
@@ -61,6 +101,8 @@ class DirtyDict(dict):
         """
         out = super().popitem()
         self.dirty = True
+        if self.observers:
+            self._notify(out[1], None)
         return out
 
 
@@ -71,6 +113,11 @@ class Peer:
 
     INTERFACE_ORDER = [UDPv6Address, UDPv4Address, tuple]
 
+    # Peers can still be weakly referenced, but they have no instance dict: subclasses that need custom attributes get
+    # a dict by not defining ``__slots__`` themselves (like the DHT ``Node``).
+    __slots__ = ("__weakref__", "_address", "_addresses", "_lamport_timestamp", "_pings", "address_frozen",
+                 "creation_time", "key", "last_response", "mid", "new_style_intro", "public_key", "public_key_bin")
+
     def __init__(self, key: Key | bytes, address: Address | None = None, intro: bool = True) -> None:
         """
         Create a new Peer.
@@ -89,6 +136,10 @@ class Peer:
         else:
             self.key = cast("Key", key)
         self.public_key = self.key.pub()
+        self.public_key_bin: bytes = self.public_key.key_to_bin()
+        """
+        The binary format of the public key of this Peer, equal to ``public_key.key_to_bin()``.
+        """
         self.mid = self.public_key.key_to_hash()
         self._addresses = DirtyDict()
         if address is not None:
@@ -97,7 +148,7 @@ class Peer:
         self.creation_time = time()
         self.last_response = 0 if intro else time()
         self._lamport_timestamp = 0
-        self.pings: deque = deque(maxlen=5)
+        self._pings: deque | None = None
         self.new_style_intro = False
 
         self.address_frozen = False
@@ -105,6 +156,24 @@ class Peer:
         Set this to True if you want to avoid this Peer's address being updated.
         """
 
+    @property
+    def pings(self) -> deque:
+        """
+        The most recent (at most 5) ping measurements of this Peer.
+
+        The underlying deque is only created when it is first needed.
+        """
+        if self._pings is None:
+            self._pings = deque(maxlen=5)
+        return self._pings
+
+    @pings.setter
+    def pings(self, value: deque) -> None:
+        """
+        Replace the ping measurements of this Peer.
+        """
+        self._pings = value
+
     @property
     def addresses(self) -> dict[type[Address], Address]:
         """
@@ -167,9 +236,9 @@ class Peer:
         :return: the median ping or None if no measurements were performed yet
         :rtype: float or None
         """
-        if not self.pings:
+        if not self._pings:
             return None
-        sorted_pings = sorted(self.pings)
+        sorted_pings = sorted(self._pings)
         if len(sorted_pings) % 2 == 0:
             return (sorted_pings[len(sorted_pings) // 2 - 1] + sorted_pings[len(sorted_pings) // 2]) / 2
         return sorted_pings[len(sorted_pings) // 2]
@@ -181,9 +250,9 @@ class Peer:
         :return: the average ping or None if no measurements were performed yet
         :rtype: float or None
         """
-        if not self.pings:
+        if not self._pings:
             return None
-        return sum(self.pings) / len(self.pings)
+        return sum(self._pings) / len(self._pings)
 
     def update_clock(self, timestamp: int) -> None:
         """
@@ -217,7 +286,7 @@ class Peer:
         """
         if not isinstance(other, Peer):
             return False
-        return self.public_key.key_to_bin() == other.public_key.key_to_bin()
+        return self.public_key_bin == other.public_key_bin
 
     def __ne__(self, other: object) -> bool:
         """
@@ -225,7 +294,7 @@ class Peer:
         """
         if not isinstance(other, Peer):
             return True
-        return self.public_key.key_to_bin() != other.public_key.key_to_bin()
+        return self.public_key_bin != other.public_key_bin
 
     def __str__(self) -> str:
         """
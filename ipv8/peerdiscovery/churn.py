@@ -62,10 +62,12 @@ class RandomChurn(DiscoveryStrategy[Overlay]):
                 window = sample(list(self.overlay.network.verified_peers), sample_size)
 
                 for peer in window:
+                    # Avoid creating a ping history for peers that were never pinged.
+                    pings = peer._pings  # noqa: SLF001
                     if self.should_drop(peer) and peer.address in self._pinged:
                         self.overlay.network.remove_peer(peer)
                         self._pinged.pop(peer.address)
-                    elif self.is_inactive(peer) or len(peer.pings) < cast("int", peer.pings.maxlen):
+                    elif self.is_inactive(peer) or pings is None or len(pings) < cast("int", pings.maxlen):
                         if ((peer.address in self._pinged)
                                 and (time() > (self._pinged[peer.address] + self.ping_interval))):
                             self._pinged.pop(peer.address)
@@ -236,10 +236,11 @@ class DiscoveryCommunity(Community):
         You can have different key material for different communities. So, in order for you to cross-communicate,
         you should sign messages with the key material that is used by a particular community.
         """
-        packet = self._prefix + bytes([msg_num])
-        packet += self.serializer.pack_serializable_list(payloads)
-        packet += default_eccrypto.create_signature(cast("PrivateKey", peer.key), packet)
-        return packet
+        packet = bytearray(self._prefix)
+        packet.append(msg_num)
+        self.serializer.pack_serializable_list_into(payloads, packet)
+        packet += default_eccrypto.create_signature(cast("PrivateKey", peer.key), bytes(packet))
+        return bytes(packet)
 
     def create_similarity_request(self, peer: Peer) -> bytes:
         """
@@ -251,7 +252,7 @@ class DiscoveryCommunity(Community):
                                            self.my_estimated_wan,
                                            "unknown",
                                            self.get_my_overlays(peer))
-        auth = BinMemberAuthenticationPayload(peer.public_key.key_to_bin())
+        auth = BinMemberAuthenticationPayload(peer.public_key_bin)
         dist = GlobalTimeDistributionPayload(global_time)
 
         return self.custom_pack(peer, 1, [auth, dist, payload])
@@ -262,7 +263,7 @@ class DiscoveryCommunity(Community):
         """
         global_time = self.claim_global_time()
         payload = SimilarityResponsePayload(identifier, self.get_my_overlays(peer), [])
-        auth = BinMemberAuthenticationPayload(peer.public_key.key_to_bin())
+        auth = BinMemberAuthenticationPayload(peer.public_key_bin)
         dist = GlobalTimeDistributionPayload(global_time)
 
         return self.custom_pack(peer, 2, [auth, dist, payload])
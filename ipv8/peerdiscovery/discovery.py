@@ -86,12 +86,10 @@ class RandomWalk(DiscoveryStrategy[Overlay]):
             if self.window_size and 0 < self.window_size <= len(self.intro_timeouts):
                 return
             # Take step
-            known = self.overlay.get_walkable_addresses()
-            available = list(set(known) - set(self.intro_timeouts.keys()))
-
             # We can get stuck in an infinite loop of unreachable peers if we never contact the tracker again
-            if available and randint(0, 255) >= self.reset_chance:
-                peer = choice(available)
+            peer = (self.overlay.get_random_walkable_address(self.intro_timeouts)
+                    if randint(0, 255) >= self.reset_chance else None)
+            if peer is not None:
                 self.overlay.walk_to(peer)
                 self.intro_timeouts[peer] = time()
             else:
@@ -3,15 +3,16 @@ from __future__ import annotations
 import abc
 import contextlib
 import logging
-from collections import OrderedDict
+from functools import partial
 from operator import methodcaller
+from random import choice
 from threading import RLock
 from typing import TYPE_CHECKING, NamedTuple, cast
 
 from ..messaging.serialization import default_serializer
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Container, Iterable, Iterator
 
     from ..messaging.interfaces.udp.endpoint import Address
     from ..overlay import Overlay
@@ -35,6 +36,77 @@ class WalkableAddress(NamedTuple):
     new_style: bool
 
 
+class AddressSet:
+    """
+    A set of addresses that supports drawing a uniformly random element in constant time.
+    """
+
+    def __init__(self, addresses: Iterable[Address] = ()) -> None:
+        """
+        Create a new set with the given initial addresses.
+        """
+        super().__init__()
+        self._addresses: list[Address] = []
+        self._indices: dict[Address, int] = {}
+        for address in addresses:
+            self.add(address)
+
+    def add(self, address: Address) -> None:
+        """
+        Add an address to this set, if it is not already in it.
+        """
+        if address not in self._indices:
+            self._indices[address] = len(self._addresses)
+            self._addresses.append(address)
+
+    def discard(self, address: Address) -> None:
+        """
+        Remove an address from this set, if it is in it.
+        """
+        index = self._indices.pop(address, None)
+        if index is not None:
+            # Fill the gap with the last element, so that removal does not need to shift the list.
+            last = self._addresses.pop()
+            if index < len(self._addresses):
+                self._addresses[index] = last
+                self._indices[last] = index
+
+    def sample(self, exclude: Container[Address] = (), attempts: int = 3) -> Address | None:
+        """
+        Get a random address from this set.
+
+        :param exclude: addresses that should not be returned.
+        :param attempts: the number of random draws before falling back to filtering out the excluded addresses.
+        :returns: a random address that is not excluded, or None if no such address exists.
+        """
+        if not self._addresses:
+            return None
+        for _ in range(attempts):
+            address = choice(self._addresses)
+            if address not in exclude:
+                return address
+        available = [address for address in self._addresses if address not in exclude]
+        return choice(available) if available else None
+
+    def __contains__(self, address: object) -> bool:
+        """
+        Check if an address is in this set.
+        """
+        return address in self._indices
+
+    def __iter__(self) -> Iterator[Address]:
+        """
+        Iterate over the addresses in this set.
+        """
+        return iter(self._addresses)
+
+    def __len__(self) -> int:
+        """
+        Get the number of addresses in this set.
+        """
+        return len(self._addresses)
+
+
 class PeerObserver(metaclass=abc.ABCMeta):
     """
     An observer that gets called back when a peer is added or removed from the Network.
@@ -86,21 +158,22 @@ class Network:
         self.service_overlays: dict[Service, Overlay] = {}
         """Map of service identifiers to local overlays."""
 
-        self.reverse_ip_cache_size = 500
-        self.reverse_ip_lookup: OrderedDict[Address, Peer] = OrderedDict()
-        """Cache of IP:port -> Peer. This is a cache rather than a normal dictionary (the addresses of a peer are
-        temporal and can grow infinitely): we rotate out old information to avoid a memory leak."""
+        self.peers_per_address: dict[Address, dict[Peer, None]] = {}
+        """Index of IP:port -> verified Peers using that address (insertion-ordered set), following address updates."""
 
-        self.reverse_intro_cache_size = 500
-        self.reverse_intro_lookup: OrderedDict[Peer, list[Address]] = OrderedDict()
-        """Map of Peer -> [IP:port], reversing the information from _all_addresses. This is a cache rather than a
-        normal dictionary (the addresses of a peer are temporal and can grow infinitely): we rotate out old
-        information to avoid a memory leak."""
+        self.peers_per_service: dict[Service, dict[Peer, None]] = {}
+        """Index of service_id -> verified Peers supporting that service (insertion-ordered set)."""
 
-        self.reverse_service_cache_size = 500
-        self.reverse_service_lookup: OrderedDict[Service, list[Peer]] = OrderedDict()
-        """Cache of service_id -> [Peer]. This is a cache rather than a normal dictionary (the services of a peer may
-        be temporal and can grow infinitely): we rotate out old information to avoid a memory leak."""
+        self.introductions_per_peer: dict[PublicKeyMat, dict[Address, None]] = {}
+        """Index of introducer public key -> introduced IP:port addresses, reversing the information from
+        _all_addresses (insertion-ordered set)."""
+
+        self.walkable_per_service: dict[Service | None, AddressSet] = {}
+        """Incrementally maintained walkable addresses per service_id (None for all services). A service is only
+        tracked after its walkable addresses are first requested."""
+
+        self._address_observers: dict[PublicKeyMat, Callable[[Address | None, Address | None], None]] = {}
+        """Callbacks registered with the addresses of verified peers to keep the address index up-to-date."""
 
         self.peer_observers: set[PeerObserver] = set()
         """
@@ -137,14 +210,8 @@ class Network:
             if ((address not in self._all_addresses)
                     or (self._all_addresses[address].introduced_by not in self.verified_by_public_key_bin)):
                 # This is a new address, or our previous parent has been removed
-                self._all_addresses[address] = WalkableAddress(peer.public_key.key_to_bin(), service, new_style)
-                intro_cache = self.reverse_intro_lookup.get(peer, None)
-                if intro_cache:
-                    intro_cache.append(address)
-                else:
-                    self.reverse_intro_lookup[peer] = [address]
-                    if len(self.reverse_intro_lookup) > self.reverse_intro_cache_size:
-                        self.reverse_intro_lookup.popitem(False)  # Pop the oldest cache entry
+                self._set_walkable_address(address,
+                                           WalkableAddress(peer.public_key_bin, service, new_style))
 
             self.add_verified_peer(peer)
 
@@ -155,22 +222,24 @@ class Network:
         :param peer: the peer to update the services for.
         :param services: the list of services to register.
         """
+        service_set = set(services)
         with self.graph_lock:
-            key_material = peer.public_key.key_to_bin()
+            key_material = peer.public_key_bin
             if key_material not in self.services_per_peer:
-                self.services_per_peer[key_material] = set(services)
+                new_services = service_set
+                self.services_per_peer[key_material] = service_set
             else:
-                self.services_per_peer[key_material] |= set(services)
-            for service in services:
-                service_cache = self.reverse_service_lookup.get(service, None)
-                if service_cache is not None:
-                    # Ensure that the peer instance in the cache is the same one as in verified_peers.
-                    if peer in service_cache:
-                        service_cache.remove(peer)
-                    service_cache.append(self.verified_by_public_key_bin.get(key_material, peer))
-                    self.reverse_service_lookup[service] = service_cache
-                    if len(self.reverse_service_lookup) > self.reverse_service_cache_size:
-                        self.reverse_service_lookup.popitem(False)  # Pop the oldest cache entry
+                new_services = service_set - self.services_per_peer[key_material]
+                self.services_per_peer[key_material] |= service_set
+            known = self.verified_by_public_key_bin.get(key_material, None)
+            if known is not None:
+                for service in service_set:
+                    self.peers_per_service.setdefault(service, {})[known] = None
+            if any(service in self.walkable_per_service for service in new_services):
+                # Both the addresses of this peer and the addresses it introduced may have changed walkability.
+                self._update_walkable(self.introductions_per_peer.get(key_material, ()))
+                if known is not None:
+                    self._update_walkable(known.addresses.values())
 
     def add_verified_peer(self, peer: Peer) -> None:
         """
@@ -182,7 +251,8 @@ class Network:
             return
         with self.graph_lock:
             # This may just be an address update
-            known = self.verified_by_public_key_bin.get(peer.public_key.key_to_bin(), None)
+            key_material = peer.public_key_bin
+            known = self.verified_by_public_key_bin.get(key_material, None)
             if known:
                 known.addresses.update(peer.addresses)
                 return
@@ -190,17 +260,170 @@ class Network:
                 if peer not in self.verified_peers:
                     # This should always happen, unless someone edits the verified_peers dict directly.
                     # This would be a programmer "error", but we will allow it.
-                    self.verified_peers.add(peer)
-                    self.verified_by_public_key_bin[peer.public_key.key_to_bin()] = peer
-                    list(map(methodcaller("on_peer_added", peer), self.peer_observers))
+                    self._add_verified(peer, key_material)
+                else:
+                    self._index_verified(peer, key_material)
             elif all(address not in self.blacklist for address in peer.addresses.values()):
                 for address in peer.addresses.values():
                     if address not in self._all_addresses:
-                        self._all_addresses[address] = WalkableAddress(b"", None, False)
+                        self._set_walkable_address(address, WalkableAddress(b"", None, False))
                 if peer not in self.verified_peers:
-                    self.verified_peers.add(peer)
-                    self.verified_by_public_key_bin[peer.public_key.key_to_bin()] = peer
-                    list(map(methodcaller("on_peer_added", peer), self.peer_observers))
+                    self._add_verified(peer, key_material)
+
+    def _add_verified(self, peer: Peer, key_material: PublicKeyMat) -> None:
+        """
+        Register a new verified peer and add it to the indexes.
+
+        :param peer: the new peer.
+        :param key_material: the public key bin of the new peer.
+        """
+        self.verified_peers.add(peer)
+        self._index_verified(peer, key_material)
+        list(map(methodcaller("on_peer_added", peer), self.peer_observers))
+
+    def _index_verified(self, peer: Peer, key_material: PublicKeyMat) -> None:
+        """
+        Add a verified peer to the indexes.
+
+        :param peer: the verified peer.
+        :param key_material: the public key bin of the verified peer.
+        """
+        self.verified_by_public_key_bin[key_material] = peer
+        for address in peer.addresses.values():
+            self.peers_per_address.setdefault(address, {})[peer] = None
+        for service in self.services_per_peer.get(key_material, ()):
+            self.peers_per_service.setdefault(service, {})[peer] = None
+        observer = partial(self._on_address_changed, peer)
+        self._address_observers[key_material] = observer
+        peer.addresses.add_observer(observer)  # type: ignore[attr-defined]
+        self._update_walkable(peer.addresses.values())
+
+    def _remove_verified(self, peer: Peer, key_material: PublicKeyMat) -> None:
+        """
+        Unregister a verified peer and remove it from the indexes.
+
+        :param peer: the verified peer instance to remove.
+        :param key_material: the public key bin of the peer.
+        """
+        self.verified_peers.discard(peer)
+        self.verified_by_public_key_bin.pop(key_material, None)
+        observer = self._address_observers.pop(key_material, None)
+        if observer is not None:
+            peer.addresses.remove_observer(observer)  # type: ignore[attr-defined]
+        for address in peer.addresses.values():
+            self._unindex_address(peer, address)
+        for service in self.services_per_peer.get(key_material, ()):
+            service_peers = self.peers_per_service.get(service)
+            if service_peers is not None:
+                service_peers.pop(peer, None)
+                if not service_peers:
+                    self.peers_per_service.pop(service)
+        self._update_walkable(peer.addresses.values())
+        list(map(methodcaller("on_peer_removed", peer), self.peer_observers))
+
+    def _remove_services(self, key_material: PublicKeyMat) -> None:
+        """
+        Forget the services of a peer.
+
+        :param key_material: the public key bin of the peer.
+        """
+        if self.services_per_peer.pop(key_material, None):
+            self._update_walkable(self.introductions_per_peer.get(key_material, ()))
+
+    def _unindex_address(self, peer: Peer, address: Address) -> None:
+        """
+        Remove a single address of a verified peer from the address index.
+        """
+        address_peers = self.peers_per_address.get(address)
+        if address_peers is not None:
+            address_peers.pop(peer, None)
+            if not address_peers:
+                self.peers_per_address.pop(address)
+
+    def _on_address_changed(self, peer: Peer, old: Address | None, new: Address | None) -> None:
+        """
+        Callback for when an address of a verified peer is added, changed or removed.
+        """
+        with self.graph_lock:
+            # The same address may still be registered for another interface type.
+            if old is not None and old not in peer.addresses.values():
+                self._unindex_address(peer, old)
+            if new is not None:
+                self.peers_per_address.setdefault(new, {})[peer] = None
+            self._update_walkable(address for address in (old, new) if address is not None)
+
+    def _set_walkable_address(self, address: Address, walkable: WalkableAddress) -> None:
+        """
+        Register a walkable address and update the introduction index.
+        """
+        self._unindex_introduction(address)
+        self._all_addresses[address] = walkable
+        if walkable.introduced_by:
+            self.introductions_per_peer.setdefault(walkable.introduced_by, {})[address] = None
+        self._update_walkable((address, ))
+
+    def _pop_walkable_address(self, address: Address) -> None:
+        """
+        Remove a walkable address, if it exists, and update the introduction index.
+        """
+        if address in self._all_addresses:
+            self._unindex_introduction(address)
+            self._all_addresses.pop(address)
+            self._update_walkable((address, ))
+
+    def _unindex_introduction(self, address: Address) -> None:
+        """
+        Remove a walkable address, if it exists, from the introduction index.
+        """
+        walkable = self._all_addresses.get(address)
+        if walkable is not None and walkable.introduced_by:
+            introductions = self.introductions_per_peer.get(walkable.introduced_by)
+            if introductions is not None:
+                introductions.pop(address, None)
+                if not introductions:
+                    self.introductions_per_peer.pop(walkable.introduced_by)
+
+    def _is_walkable(self, address: Address, service_id: Service | None) -> bool:
+        """
+        Check if an address is walkable for a given service_id (or for any service, if None is given).
+
+        An address is walkable if it is not in use by a verified peer (supporting the service) and, when a service is
+        given, it was introduced to us through that service or by a peer that supports it.
+        """
+        walkable = self._all_addresses.get(address)
+        if walkable is None:
+            return False
+        if (service_id is not None and service_id != walkable.services
+                and service_id not in self.services_per_peer.get(walkable.introduced_by, ())):
+            return False
+        for peer in self.peers_per_address.get(address, ()):
+            if service_id is None or service_id in self.services_per_peer.get(peer.public_key_bin, ()):
+                return False
+        return True
+
+    def _update_walkable(self, addresses: Iterable[Address]) -> None:
+        """
+        Recheck the walkability of the given addresses for all tracked services.
+        """
+        if not self.walkable_per_service:
+            return
+        for address in list(addresses):
+            for service_id, walkable_set in self.walkable_per_service.items():
+                if self._is_walkable(address, service_id):
+                    walkable_set.add(address)
+                else:
+                    walkable_set.discard(address)
+
+    def _get_walkable_set(self, service_id: Service | None) -> AddressSet:
+        """
+        Get the walkable addresses of a service, starting to track the service if it was not tracked yet.
+        """
+        walkable_set = self.walkable_per_service.get(service_id)
+        if walkable_set is None:
+            walkable_set = AddressSet(address for address in self._all_addresses
+                                      if self._is_walkable(address, service_id))
+            self.walkable_per_service[service_id] = walkable_set
+        return walkable_set
 
     def register_service_provider(self, service_id: Service, overlay: Overlay) -> None:
         """
@@ -218,22 +441,8 @@ class Network:
 
         :param service_id: the service name/id to fetch peers for.
         """
-        out = []
-        service_cache = self.reverse_service_lookup.pop(service_id, None)
-        if service_cache is None:
-            with self.graph_lock:
-                for peer in self.verified_peers:
-                    key_material = peer.public_key.key_to_bin()
-                    if service_id in self.services_per_peer.get(key_material, []):
-                        out.append(peer)
-        else:
-            out = [peer for peer in service_cache if
-                   peer in self.verified_peers
-                   and service_id in self.services_per_peer.get(peer.public_key.key_to_bin(), [])]
-        self.reverse_service_lookup[service_id] = out
-        if len(self.reverse_service_lookup) > self.reverse_service_cache_size:
-            self.reverse_service_lookup.popitem(False)  # Pop the oldest cache entry
-        return out
+        with self.graph_lock:
+            return list(self.peers_per_service.get(service_id, ()))
 
     def get_services_for_peer(self, peer: Peer) -> set[bytes]:
         """
@@ -242,7 +451,7 @@ class Network:
         :param peer: the peer to check services for.
         """
         with self.graph_lock:
-            return self.services_per_peer.get(peer.public_key.key_to_bin(), set())
+            return self.services_per_peer.get(peer.public_key_bin, set())
 
     def get_walkable_addresses(self,
                                service_id: Service | None = None,
@@ -254,24 +463,23 @@ class Network:
         :param old_style: only return addresses that are not new-style.
         """
         with self.graph_lock:
-            known = self.get_peers_for_service(service_id) if service_id else self.verified_peers
-            verified: list[Address] = []
-            for peer in known:
-                verified.extend(peer.addresses.values())
-            out = list(set(self._all_addresses.keys()) - set(verified))
-            if service_id:
-                new_out = []
-                for address in out:
-                    intro_peer, service, new_style = self._all_addresses[address]
-                    if old_style and new_style:
-                        continue
-                    services = self.services_per_peer.get(intro_peer, set())
-                    if service:
-                        services.add(service)
-                    if service_id in services:
-                        new_out.append(address)
-                out = new_out
-            return out
+            walkable_set = self._get_walkable_set(service_id or None)
+            if service_id and old_style:
+                return [address for address in walkable_set if not self._all_addresses[address].new_style]
+            return list(walkable_set)
+
+    def get_random_walkable_address(self,
+                                    service_id: Service | None = None,
+                                    exclude: Container[Address] = ()) -> Address | None:
+        """
+        Get a random address that is ready to be walked to.
+
+        :param service_id: the service_id to filter on.
+        :param exclude: addresses that should not be returned.
+        :returns: a random walkable address, or None if there are no (non-excluded) walkable addresses.
+        """
+        with self.graph_lock:
+            return self._get_walkable_set(service_id or None).sample(exclude)
 
     def get_verified_by_address(self, address: Address) -> Peer | None:
         """
@@ -283,21 +491,15 @@ class Network:
         :return: the Peer object for this address or None
         """
         with self.graph_lock:
-            peer = self.reverse_ip_lookup.pop(address, None)
-            if not peer:
-                for p in self.verified_peers:
-                    if address in p.addresses.values():
-                        peer = p
-                        self.reverse_ip_lookup[address] = peer
-                        if len(self.reverse_ip_lookup) > self.reverse_ip_cache_size:
-                            self.reverse_ip_lookup.popitem(False)  # Pop the oldest cache entry
-                        break
-            else:
-                # Refresh the peer in the cache (by popping first, it is now on top of the stack again)
-                self.reverse_ip_lookup[address] = peer
-                if len(self.reverse_ip_lookup) > self.reverse_ip_cache_size:
-                    self.reverse_ip_lookup.popitem(False)  # Pop the oldest cache entry
-        return peer
+            peers = self.peers_per_address.get(address)
+            if peers:
+                return next(iter(peers))
+            if len(self.verified_peers) != len(self.verified_by_public_key_bin):
+                # Someone edited the verified_peers directly: the peers that were added this way are not indexed.
+                for peer in self.verified_peers:
+                    if address in peer.addresses.values():
+                        return peer
+            return None
 
     def get_verified_by_public_key_bin(self, public_key_bin: PublicKeyMat) -> Peer | None:
         """
@@ -315,15 +517,8 @@ class Network:
         :param peer: the peer to get the introductions for
         :return: a list of the introduced addresses (ip, port)
         """
-        introductions = self.reverse_intro_lookup.get(peer, None)
-        if introductions is None:
-            with self.graph_lock:
-                introductions = [k for k, v in self._all_addresses.items()
-                                 if v.introduced_by == peer.public_key.key_to_bin()]
-                self.reverse_intro_lookup[peer] = introductions
-                if len(self.reverse_intro_lookup) > self.reverse_intro_cache_size:
-                    self.reverse_intro_lookup.popitem(False)  # Pop the oldest cache entry
-        return introductions
+        with self.graph_lock:
+            return list(self.introductions_per_peer.get(peer.public_key_bin, ()))
 
     def remove_by_address(self, address: Address) -> None:
         """
@@ -332,16 +527,11 @@ class Network:
         :param address: the (ip, port) address to remove
         """
         with self.graph_lock:
-            self._all_addresses.pop(address, None)
-            # Note that the services_per_peer will never be 0, we abuse the lazy `or` to pop the peers from
-            # the services_per_peer mapping if they are no longer included. This is fast.
-            new_verified_peers = {peer for peer in self.verified_peers
-                                  if address not in peer.addresses.values()
-                                  or self.services_per_peer.pop(peer.public_key.key_to_bin(), None) == 0}
-            removed_peers = self.verified_peers - new_verified_peers
-            self.verified_peers = new_verified_peers
-            for peer in removed_peers:
-                list(map(methodcaller("on_peer_removed", peer), self.peer_observers))
+            self._pop_walkable_address(address)
+            for peer in list(self.peers_per_address.get(address, ())):
+                key_material = peer.public_key_bin
+                self._remove_verified(peer, key_material)
+                self._remove_services(key_material)
 
     def remove_peer(self, peer: Peer) -> None:
         """
@@ -351,12 +541,16 @@ class Network:
         """
         with self.graph_lock:
             for address in peer.addresses.values():
-                self._all_addresses.pop(address, None)
-            if peer in self.verified_peers:
+                self._pop_walkable_address(address)
+            key_material = peer.public_key_bin
+            known = self.verified_by_public_key_bin.get(key_material, None)
+            if known is not None:
+                self._remove_verified(known, key_material)
+            elif peer in self.verified_peers:
+                # Someone edited the verified_peers set directly, there is nothing to remove from the indexes.
                 self.verified_peers.remove(peer)
                 list(map(methodcaller("on_peer_removed", peer), self.peer_observers))
-            self.verified_by_public_key_bin.pop(peer.public_key.key_to_bin(), None)
-            self.services_per_peer.pop(peer.public_key.key_to_bin(), None)
+            self._remove_services(key_material)
 
     def snapshot(self) -> bytes:
         """
@@ -387,7 +581,7 @@ class Network:
                 try:
                     address, offset = default_serializer.unpack("address", snapshot, offset)
                     address = cast("Address", address)
-                    self._all_addresses[address] = WalkableAddress(b"", None, False)
+                    self._set_walkable_address(address, WalkableAddress(b"", None, False))
                 except Exception:
                     if offset <= previous_offset:
                         # We got stuck, or even went back in time.
@@ -3,8 +3,10 @@ from __future__ import annotations
 import abc
 import logging
 from abc import ABC
-from asyncio import CancelledError, Future, gather
+from asyncio import CancelledError, Future, gather, get_running_loop
 from contextlib import contextmanager, suppress
+from heapq import heapify, heappop, heappush
+from itertools import count
 from random import random
 from threading import Lock
 from typing import TYPE_CHECKING, TypeVar, cast, overload
@@ -15,8 +17,11 @@ from .taskmanager import TaskManager
 from .util import succeed
 
 if TYPE_CHECKING:
+    from asyncio import Handle
     from collections.abc import Generator, Iterable
 
+TimeoutEntry = tuple[float, int, str, "NumberCache"]
+
 
 class NumberCache:
     """
@@ -175,6 +180,20 @@ class RequestCache(TaskManager):
         This is used internally for ``passthrough()``, don't modify this directly!
         """
 
+        self._timeouts: dict[str, TimeoutEntry] = {}
+        """
+        The pending timeout of each cache identifier. Removing an entry from this dict cancels its timeout.
+        """
+
+        self._timeout_heap: list[TimeoutEntry] = []
+        """
+        Heap of (deadline, sequence number, identifier, cache) timeouts. Cancelled timeouts are only removed lazily.
+        """
+
+        self._timeout_counter = count()
+        self._timeout_handle: Handle | None = None
+        self._timeout_wakeup = 0.0
+
     def add(self, cache: ACT) -> ACT | None:
         """
         Add CACHE into this RequestCache instance.
@@ -211,7 +230,11 @@ class RequestCache(TaskManager):
                 # Otherwise, only overwrite the timeout if the cache class is in the filter.
                 timeout_delay = self._timeout_override
 
-            self.register_task(cache, self._on_timeout, cache, delay=timeout_delay)
+            loop = get_running_loop()
+            entry: TimeoutEntry = (loop.time() + timeout_delay, next(self._timeout_counter), identifier, cache)
+            self._timeouts[identifier] = entry
+            heappush(self._timeout_heap, entry)
+            self._schedule_timeouts()
             waiter = self._waiters.pop((cache.prefix, cache.number), None)
             if waiter is not None and not waiter.done():
                 waiter.set_result(cache)
@@ -301,7 +324,7 @@ class RequestCache(TaskManager):
         if isinstance(prefix, str):
             identifier = self._create_identifier(number, prefix)
             cache = self._identifiers.pop(identifier)
-            self.cancel_pending_task(cache)
+            self._cancel_timeout(identifier)
             return cache
         return self.pop(prefix.name, number)
 
@@ -358,6 +381,60 @@ class RequestCache(TaskManager):
             self._timeout_override = None
             self._timeout_filters = None
 
+    def _cancel_timeout(self, identifier: str) -> None:
+        """
+        Cancel the timeout of the cache with the given identifier, if it has one.
+        """
+        self._timeouts.pop(identifier, None)
+        # Cancelled timeouts stay in the heap until they expire, unless they start to dominate it.
+        if len(self._timeout_heap) > 2 * len(self._timeouts) + 64:
+            self._timeout_heap = list(self._timeouts.values())
+            heapify(self._timeout_heap)
+
+    def _schedule_timeouts(self) -> None:
+        """
+        Make sure we wake up for the earliest pending timeout.
+        """
+        heap = self._timeout_heap
+        while heap and self._timeouts.get(heap[0][2]) is not heap[0]:
+            heappop(heap)
+        if not heap:
+            if self._timeout_handle is not None:
+                self._timeout_handle.cancel()
+                self._timeout_handle = None
+            return
+        deadline = heap[0][0]
+        if self._timeout_handle is not None:
+            if self._timeout_wakeup <= deadline:
+                return
+            self._timeout_handle.cancel()
+        loop = get_running_loop()
+        self._timeout_wakeup = deadline
+        self._timeout_handle = (loop.call_soon(self._process_timeouts) if deadline <= loop.time()
+                                else loop.call_at(deadline, self._process_timeouts))
+
+    def _process_timeouts(self) -> None:
+        """
+        Time out all caches whose deadline has passed.
+        """
+        self._timeout_handle = None
+        loop = get_running_loop()
+        now = loop.time()
+        heap = self._timeout_heap
+        while heap and heap[0][0] <= now:
+            entry = heappop(heap)
+            if self._timeouts.get(entry[2]) is not entry:
+                continue  # This timeout was cancelled.
+            del self._timeouts[entry[2]]
+            try:
+                self._on_timeout(entry[3])
+            except Exception as e:
+                # Don't let one failing cache prevent the other caches from timing out.
+                loop.call_exception_handler({"message": f"Exception in timeout of {entry[3]}",
+                                             "exception": e})
+        if not self._shutdown:
+            self._schedule_timeouts()
+
     def _on_timeout(self, cache: NumberCache) -> None:
         """
         Called CACHE.timeout_delay seconds after CACHE was added to this RequestCache.
@@ -381,7 +458,15 @@ class RequestCache(TaskManager):
                 else:
                     future.set_result(on_timeout)
 
-        self.cancel_pending_task(cache)
+    def _clear_timeouts(self) -> None:
+        """
+        Cancel all pending timeouts.
+        """
+        self._timeouts.clear()
+        self._timeout_heap.clear()
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
 
     def _create_identifier(self, number: int, prefix: str) -> str:
         return f"{prefix}:{number}"
@@ -392,6 +477,7 @@ class RequestCache(TaskManager):
         """
         self._logger.debug("Clearing %s [%s]", self, len(self._identifiers))
         tasks = self.cancel_all_pending_tasks()
+        self._clear_timeouts()
         self._identifiers.clear()
         return tasks
 
@@ -405,6 +491,7 @@ class RequestCache(TaskManager):
             with self._task_lock:
                 self._shutdown = True
                 tasks = self.cancel_all_pending_tasks()
+            self._clear_timeouts()
 
             for cache in self._identifiers.values():
                 # Cancel all managed futures, and suppress the CancelledErrors
@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING, cast
 from ...bootstrapping.dispersy.bootstrapper import DispersyBootstrapper
 from ...configuration import DISPERSY_BOOTSTRAPPER
 from ...messaging.anonymization.community import TunnelCommunity, TunnelSettings
+from ...messaging.anonymization.crypto import PythonCryptoEndpoint
 from ...REST.isolation_endpoint import IsolationEndpoint
 from ..base import TestBase
 from ..mocking.community import MockCommunity
@@ -43,6 +44,7 @@ class MockTunnelCommunity(TunnelCommunity, MockCommunity):
         self.circuits = {}
         self.relay_from_to = {}
         self.exit_sockets = {}
+        self.crypto_endpoint = PythonCryptoEndpoint(self.endpoint)
 
         bootstrapper = DispersyBootstrapper(DISPERSY_BOOTSTRAPPER["init"]["ip_addresses"], [])
         self.bootstrappers = [bootstrapper]
@@ -2,6 +2,7 @@ import base64
 import random
 
 from ...keyvault.crypto import default_eccrypto
+from ...messaging.interfaces.rate_limiter import SourceRateLimiter
 from ...peer import Peer
 from ...REST.network_endpoint import NetworkEndpoint
 from ..base import TestBase
@@ -110,3 +111,24 @@ class TestNetworkEndpoint(TestBase[MockCommunity]):
             self.assertEqual("0.0.0.0", peer_descriptor["ip"])
             self.assertEqual(0, peer_descriptor["port"])
             self.assertSetEqual(set(mock_b64services[b64mid]), set(peer_descriptor["services"]))
+
+    async def test_rate_limit_disabled(self) -> None:
+        """
+        Check if the network endpoint reports that rate limiting is disabled, if there is no rate limiter.
+        """
+        response = await response_to_json(await self.rest_ep.get_rate_limit_statistics(MockRequest("network")))
+
+        self.assertDictEqual({"enabled": False}, response)
+
+    async def test_rate_limit(self) -> None:
+        """
+        Check if the network endpoint returns the counters of the rate limiter.
+        """
+        self.node(0).rate_limiter = SourceRateLimiter(rate=1.0, burst=1.0)
+        self.node(0).rate_limiter.allow(("1.2.3.4", 5))
+        self.node(0).rate_limiter.allow(("1.2.3.4", 5))
+
+        response = await response_to_json(await self.rest_ep.get_rate_limit_statistics(MockRequest("network")))
+
+        self.assertDictEqual({"enabled": True, "accepted": 1, "rejected": 1, "evicted": 0, "sources": 1,
+                              "allowed": 0}, response)
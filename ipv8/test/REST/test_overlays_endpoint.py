@@ -3,6 +3,7 @@ from __future__ import annotations
 import binascii
 
 from ...keyvault.crypto import default_eccrypto
+from ...keyvault.signature_cache import VerifiedSignatureCache
 from ...messaging.interfaces.statistics_endpoint import StatisticsEndpoint
 from ...peer import Peer
 from ...REST.overlays_endpoint import OverlaysEndpoint
@@ -88,6 +89,8 @@ class TestOverlaysEndpoint(TestBase[MockCommunity]):
         self.assertListEqual([], response["overlays"][0]["peers"])
         self.assertEqual("MockCommunity", response["overlays"][0]["overlay_name"])
         self.assertDictEqual({}, response["overlays"][0]["statistics"])
+        self.assertDictEqual({}, response["overlays"][0]["signature_cache"])
+        self.assertDictEqual({}, response["overlays"][0]["ingress"])
 
     async def test_one_overlay_one_peer(self) -> None:
         """
@@ -156,6 +159,34 @@ class TestOverlaysEndpoint(TestBase[MockCommunity]):
         self.assertEqual(1, len(response["overlays"]))
         self.assertDictEqual(expected_stats, response["overlays"][0]["statistics"])
 
+    async def test_one_overlay_signature_cache(self) -> None:
+        """
+        Check if the overlays endpoint returns the signature cache statistics of an overlay that has one.
+        """
+        mock_community = MockCommunity()
+        mock_community.signature_cache = VerifiedSignatureCache()
+        mock_community.signature_cache.add(VerifiedSignatureCache.digest(b"packet"), True)
+        mock_community.signature_cache.get(VerifiedSignatureCache.digest(b"packet"))
+        self.node(0).overlays.append(mock_community)
+
+        response = await response_to_json(await self.rest_ep.get_overlays(MockRequest("overlays")))
+
+        self.assertDictEqual({"hits": 1, "misses": 0, "size": 1}, response["overlays"][0]["signature_cache"])
+
+    async def test_one_overlay_ingress_statistics(self) -> None:
+        """
+        Check if the overlays endpoint returns the ingress statistics of an overlay.
+        """
+        self.mount_statistics()
+        endpoint = self.node(0).endpoint.endpoint
+        endpoint.ingress_queue_size = 10
+        endpoint.add_prefix_listener(self.overlay(0), self.overlay(0).get_prefix())
+        endpoint.notify_listeners((("1.2.3.4", 5), self.overlay(0).get_prefix() + b"\x01"))
+
+        response = await response_to_json(await self.rest_ep.get_overlays(MockRequest("overlays")))
+
+        self.assertDictEqual({"queued": 1, "max_queued": 1, "dropped": 0}, response["overlays"][0]["ingress"])
+
     async def test_multiple_overlays(self) -> None:
         """
         Check if the overlays endpoint returns multiple overlays.
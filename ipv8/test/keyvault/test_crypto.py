@@ -153,3 +153,42 @@ class TestECCrypto(TestBase):
         """
         sig = self.ecc.create_signature(TestECCrypto.libnacl_key, b"test")
         self.assertTrue(self.ecc.is_valid_signature(TestECCrypto.libnacl_key, b"test", sig))
+
+    def test_public_key_cache_hit(self) -> None:
+        """
+        Check if ECCrypto reuses parsed public keys for the same binary format.
+        """
+        key_bin = TestECCrypto.libnacl_key.pub().key_to_bin()
+
+        key1 = self.ecc.key_from_public_bin(key_bin)
+        key2 = self.ecc.key_from_public_bin(key_bin)
+
+        self.assertIs(key1, key2)
+        self.assertEqual(1, self.ecc.public_key_cache_hits)
+        self.assertEqual(1, self.ecc.public_key_cache_misses)
+
+    def test_public_key_cache_bounded(self) -> None:
+        """
+        Check if ECCrypto evicts the least recently used public key when its cache is full.
+        """
+        self.ecc = ECCrypto(public_key_cache_size=1)
+        libnacl_bin = TestECCrypto.libnacl_key.pub().key_to_bin()
+        m2crypto_bin = TestECCrypto.m2crypto_key.pub().key_to_bin()
+
+        self.ecc.key_from_public_bin(libnacl_bin)
+        self.ecc.key_from_public_bin(m2crypto_bin)
+
+        self.assertEqual([m2crypto_bin], list(self.ecc.public_key_cache))
+
+    def test_public_key_cache_disabled(self) -> None:
+        """
+        Check if ECCrypto does not cache public keys with a cache size of 0.
+        """
+        self.ecc = ECCrypto(public_key_cache_size=0)
+        key_bin = TestECCrypto.libnacl_key.pub().key_to_bin()
+
+        key1 = self.ecc.key_from_public_bin(key_bin)
+        key2 = self.ecc.key_from_public_bin(key_bin)
+
+        self.assertIsNot(key1, key2)
+        self.assertEqual(0, self.ecc.public_key_cache_hits)
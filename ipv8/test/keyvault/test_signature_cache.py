@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from ...keyvault.signature_cache import VerifiedSignatureCache
+from ..base import TestBase
+
+
+class TestVerifiedSignatureCache(TestBase):
+    """
+    Tests related to the VerifiedSignatureCache.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new cache per unit test.
+        """
+        super().setUp()
+        self.cache = VerifiedSignatureCache(max_size=2, timeout=10.0)
+
+    def test_miss(self) -> None:
+        """
+        Check if an unknown packet is a cache miss.
+        """
+        self.assertIsNone(self.cache.get(self.cache.digest(b"packet")))
+        self.assertEqual(0, self.cache.hits)
+        self.assertEqual(1, self.cache.misses)
+
+    def test_hit(self) -> None:
+        """
+        Check if a known packet is a cache hit.
+        """
+        self.cache.add(self.cache.digest(b"valid"), True)
+        self.cache.add(self.cache.digest(b"invalid"), False)
+
+        self.assertTrue(self.cache.get(self.cache.digest(b"valid")))
+        self.assertFalse(self.cache.get(self.cache.digest(b"invalid")))
+        self.assertEqual(2, self.cache.hits)
+        self.assertEqual(0, self.cache.misses)
+
+    def test_digest_memoryview(self) -> None:
+        """
+        Check if the digest of a memoryview equals the digest of its bytes.
+        """
+        self.assertEqual(self.cache.digest(b"packet"), self.cache.digest(memoryview(b"packet")))
+
+    def test_expired(self) -> None:
+        """
+        Check if a known packet is a cache miss after it expires.
+        """
+        self.cache.timeout = -1.0
+        self.cache.add(self.cache.digest(b"packet"), True)
+
+        self.assertIsNone(self.cache.get(self.cache.digest(b"packet")))
+
+    def test_bounded(self) -> None:
+        """
+        Check if the oldest packet is forgotten when the cache is full.
+        """
+        self.cache.add(self.cache.digest(b"packet1"), True)
+        self.cache.add(self.cache.digest(b"packet2"), True)
+        self.cache.add(self.cache.digest(b"packet3"), True)
+
+        self.assertIsNone(self.cache.get(self.cache.digest(b"packet1")))
+        self.assertEqual(2, len(self.cache.entries))
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
-from asyncio import Future, ensure_future, iscoroutine
+from asyncio import Future, ensure_future, gather, get_running_loop, iscoroutine, wait_for
 from functools import partial
 from typing import TYPE_CHECKING, cast
 from unittest.mock import Mock
 
-from ....messaging.anonymization.community import TunnelCommunity, TunnelSettings
+from ....messaging.anonymization.community import TunnelCommunity, TunnelSettings, unpack_cell
 from ....messaging.anonymization.endpoint import TunnelEndpoint
+from ....messaging.anonymization.payload import CellPayload, CreatePayload
 from ....messaging.anonymization.tunnel import (
     CIRCUIT_STATE_EXTENDING,
+    CIRCUIT_STATE_READY,
+    FORWARD,
     PEER_FLAG_EXIT_BT,
     PEER_FLAG_EXIT_IPV8,
     PEER_FLAG_RELAY,
     PEER_FLAG_SPEED_TEST,
+    Circuit,
+    Hop,
+    RelayRoute,
 )
 from ....messaging.interfaces.udp.endpoint import DomainAddress, UDPEndpoint
 from ....util import maybe_coroutine, succeed
@@ -103,6 +109,12 @@ class TestTunnelCommunity(TestBase[TunnelCommunity]):
             self.assertFalse(node.overlay.relay_from_to)
             self.assertFalse(node.overlay.circuits)
 
+    async def wait_for_circuits(self, timeout: float = 5.0) -> None:
+        """
+        Wait until the circuits of the first node are either ready or removed.
+        """
+        await wait_for(gather(*(circuit.ready for circuit in self.overlay(0).circuits.values())), timeout)
+
     def settings(self, i: int) -> TunnelSettings:
         """
         Shortcut for the tunnel settings of a particular node.
@@ -317,6 +329,20 @@ class TestTunnelCommunity(TestBase[TunnelCommunity]):
 
         self.assert_no_more_tunnels()
 
+    async def test_find_circuits_added_directly(self) -> None:
+        """
+        Check if circuits that are added to or removed from the circuits directly are found or not found.
+        """
+        circuit = Circuit(1, 1)
+        circuit.add_hop(Hop(self.overlay(1).my_peer))
+        self.overlay(0).circuits[circuit.circuit_id] = circuit
+
+        self.assertEqual([circuit], self.overlay(0).find_circuits(hops=1))
+
+        self.overlay(0).circuits.pop(circuit.circuit_id)
+
+        self.assertEqual([], self.overlay(0).find_circuits(hops=1))
+
     async def test_destroy_circuit_bad_id(self) -> None:
         """
         Check if the correct circuit gets destroyed.
@@ -370,6 +396,56 @@ class TestTunnelCommunity(TestBase[TunnelCommunity]):
         self.assertEqual(len(ep_listener.received_packets), 1)
         self.assertEqual(ep_listener.received_packets[0][1], data)
 
+    async def test_tunnel_data_zero_copy(self) -> None:
+        """
+        Check if data is correctly exited from a view of the cell, when zero-copy decoding is enabled.
+        """
+        self.public_endpoint = UDPEndpoint()
+        await self.public_endpoint.open()
+        ep_listener = MockEndpointListener(self.public_endpoint)
+        for i in range(len(self.nodes)):
+            self.overlay(i).zero_copy_decoding = True
+        exited = []
+        exit_data = self.overlay(1).exit_data
+        self.overlay(1).exit_data = lambda *args: exited.append(args[3]) or exit_data(*args)
+
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(1)
+        await self.deliver_messages()
+        data = b"\x00" * 23 + bytes(range(256))
+        circuit = next(iter(self.overlay(0).circuits.values()))
+        self.overlay(0).send_data(circuit.hop.address, circuit.circuit_id,
+                                  DomainAddress("localhost", self.public_endpoint.get_address()[1]),
+                                  ("0.0.0.0", 0), data)
+        future = Future()
+        ep_listener.on_packet = lambda packet: ep_listener.received_packets.append(packet) or future.set_result(None)
+        await future
+
+        self.assertEqual(1, len(exited))
+        self.assertIsInstance(exited[0], memoryview)
+        self.assertEqual(data, ep_listener.received_packets[0][1])
+
+    def test_unpack_cell_zero_copy(self) -> None:
+        """
+        Check if cells are not unpacked from a view of the cell data, even when zero-copy decoding is enabled.
+        """
+        overlay = self.overlay(0)
+        overlay.zero_copy_decoding = True
+        received = []
+        handler = unpack_cell(CreatePayload)(lambda _, address, payload, circuit_id: received.append(payload))
+        public_key_bin = overlay.my_peer.public_key.key_to_bin()
+        data = overlay.get_prefix() + bytes([CreatePayload.msg_id]) + overlay.serializer.pack_serializable(
+            CreatePayload(42, 7, public_key_bin, b"key"))
+
+        handler(overlay, ("1.2.3.4", 5), data, 42)
+
+        self.assertEqual(1, len(received))
+        self.assertEqual(42, received[0].circuit_id)
+        self.assertIsInstance(received[0].node_public_key, bytes)
+        self.assertEqual(public_key_bin, received[0].node_public_key)
+        self.assertEqual(b"key", received[0].key)
+
     async def test_two_hop_circuit(self) -> None:
         """
         Check if a two hop circuit is correctly created.
@@ -386,6 +462,23 @@ class TestTunnelCommunity(TestBase[TunnelCommunity]):
 
         self.assertEqual(self.overlay(0).tunnels_ready(2), 1.0)
 
+    async def test_two_hop_circuit_rate_limited(self) -> None:
+        """
+        Check if a two hop circuit is correctly created when the relays are rate limited.
+        """
+        self.add_node_to_experiment(self.create_node())
+        for i in range(len(self.nodes)):
+            self.settings(i).relay_rate_limit = 1024
+            self.settings(i).relay_burst_size = 1
+
+        # Build a tunnel
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(2)
+        await self.deliver_messages(1.0)
+
+        self.assertEqual(self.overlay(0).tunnels_ready(2), 1.0)
+
     async def test_three_hop_circuit(self) -> None:
         """
         Check if a three hop circuit is correctly created.
@@ -403,6 +496,206 @@ class TestTunnelCommunity(TestBase[TunnelCommunity]):
 
         self.assertEqual(self.overlay(0).tunnels_ready(3), 1.0)
 
+    async def test_three_hop_circuit_batched(self) -> None:
+        """
+        Check if a three hop circuit is correctly created when cells are processed in batches.
+        """
+        self.add_node_to_experiment(self.create_node())
+        self.add_node_to_experiment(self.create_node())
+        for i in range(len(self.nodes)):
+            self.settings(i).cell_batch_size = 8
+
+        # Build a tunnel
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(3)
+        # Cell batches are flushed by callbacks and worker threads, not tasks: wait for the circuit itself.
+        await self.wait_for_circuits()
+
+        self.assertEqual(self.overlay(0).tunnels_ready(3), 1.0)
+
+    async def test_three_hop_circuit_threaded(self) -> None:
+        """
+        Check if a three hop circuit is correctly created when the crypto of cell batches is performed on threads.
+        """
+        self.add_node_to_experiment(self.create_node())
+        self.add_node_to_experiment(self.create_node())
+        for i in range(len(self.nodes)):
+            self.settings(i).cell_batch_size = 8
+            self.settings(i).threaded_cell_crypto = True
+
+        # Build a tunnel
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(3)
+        # Cell batches are flushed by callbacks and worker threads, not tasks: wait for the circuit itself.
+        await self.wait_for_circuits()
+
+        self.assertEqual(self.overlay(0).tunnels_ready(3), 1.0)
+
+    async def test_three_hop_circuit_sharded(self) -> None:
+        """
+        Check if a three hop circuit is correctly created when the crypto of circuits is sharded over threads.
+        """
+        self.add_node_to_experiment(self.create_node())
+        self.add_node_to_experiment(self.create_node())
+        for i in range(len(self.nodes)):
+            self.settings(i).cell_batch_size = 8
+            self.settings(i).threaded_cell_crypto = True
+            self.settings(i).cell_crypto_shards = 2
+
+        # Build a tunnel
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(3)
+        # Cell batches are flushed by callbacks and worker threads, not tasks: wait for the circuit itself.
+        await self.wait_for_circuits()
+
+        self.assertEqual(self.overlay(0).tunnels_ready(3), 1.0)
+
+    def test_crypto_shard_per_circuit(self) -> None:
+        """
+        Check if circuits are sharded over the crypto workers by circuit id.
+        """
+        self.settings(0).cell_crypto_shards = 2
+        crypto_endpoint = self.overlay(0).crypto_endpoint
+
+        self.assertIs(crypto_endpoint.get_crypto_shard(1), crypto_endpoint.get_crypto_shard(3))
+        self.assertIsNot(crypto_endpoint.get_crypto_shard(1), crypto_endpoint.get_crypto_shard(2))
+        self.assertEqual(2, len(crypto_endpoint.crypto_shards))
+
+    def test_flush_cells_malformed(self) -> None:
+        """
+        Check if a malformed cell in a batch is dropped without dropping the other cells of the batch.
+        """
+        crypto_endpoint = self.overlay(0).crypto_endpoint
+        crypto_endpoint.crypt_cells = lambda pendings: [True] * len(pendings)
+        crypto_endpoint.finish_cell = finish_cell = Mock()
+        prefix = self.overlay(0).get_prefix()
+        address = self.overlay(1).my_estimated_wan
+
+        crypto_endpoint.cell_batch = [(address, CellPayload(1, b"\x01").to_bin(prefix)),
+                                      (address, CellPayload(2, b"\x02").to_bin(prefix)[:25]),
+                                      (address, CellPayload(3, b"\x03").to_bin(prefix))]
+        crypto_endpoint.flush_cells()
+
+        self.assertEqual([1, 3], [call.args[0].cell.circuit_id for call in finish_cell.call_args_list])
+
+    async def test_crypt_and_finish_previous_failed(self) -> None:
+        """
+        Check if a threaded batch is finished when the batch before it failed.
+        """
+        crypto_endpoint = self.overlay(0).crypto_endpoint
+        crypto_endpoint.crypt_cells = lambda pendings: [True] * len(pendings)
+        crypto_endpoint.finish_cell = finish_cell = Mock()
+        previous = Future()
+        pending = crypto_endpoint.prepare_cell(self.overlay(1).my_estimated_wan,
+                                               CellPayload(1, b"\x01").to_bin(self.overlay(0).get_prefix()))
+
+        # Fail the previous batch while this batch is waiting for it.
+        get_running_loop().call_later(0.1, previous.set_exception, RuntimeError("previous batch failed"))
+        await crypto_endpoint._crypt_and_finish_threaded(previous, [[pending]])  # noqa: SLF001
+
+        finish_cell.assert_called_once_with(pending)
+        self.assertIsInstance(previous.exception(), RuntimeError)
+
+    async def test_relay_failed_crypto(self) -> None:
+        """
+        Check if a cell that cannot be decrypted is not counted as relayed.
+        """
+        self.add_node_to_experiment(self.create_node())
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(2)
+        await self.deliver_messages()
+        circuit = next(iter(self.overlay(0).circuits.values()))
+        relay_node = next(i for i in (1, 2) if circuit.circuit_id in self.overlay(i).relay_from_to)
+        relay = self.overlay(relay_node).relay_from_to[circuit.circuit_id]
+        relay_early_count = relay.relay_early_count
+        cell = CellPayload(circuit.circuit_id, b"\x01" * 64, relay_early=True)
+
+        self.overlay(relay_node).crypto_endpoint.process_cell(self.address(0),
+                                                              cell.to_bin(self.overlay(relay_node).get_prefix()))
+
+        self.assertEqual(relay_early_count, relay.relay_early_count)
+
+    def test_crypto_shard_disabled(self) -> None:
+        """
+        Check if the default thread pool is used when circuits are not sharded.
+        """
+        self.assertIsNone(self.overlay(0).crypto_endpoint.get_crypto_shard(1))
+
+    async def test_circuit_pool(self) -> None:
+        """
+        Check if spare circuits are kept separate from the regular circuits.
+        """
+        self.settings(0).circuit_pool_size = 1
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(1)
+        await self.deliver_messages()
+
+        spares = [c for c in self.overlay(0).circuits.values() if c.spare]
+        self.assertEqual(2, len(self.overlay(0).circuits))
+        self.assertEqual(1, len(spares))
+        self.assertEqual(CIRCUIT_STATE_READY, spares[0].state)
+        self.assertNotIn(spares[0], self.overlay(0).find_circuits())
+        self.assertEqual(self.overlay(0).tunnels_ready(1), 1.0)
+
+    async def test_circuit_pool_promote(self) -> None:
+        """
+        Check if a spare circuit is promoted when a circuit is removed and if the pool is refilled afterwards.
+        """
+        self.settings(0).circuit_pool_size = 1
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(1)
+        await self.deliver_messages()
+        circuit = self.overlay(0).find_circuits()[0]
+        spare = next(c for c in self.overlay(0).circuits.values() if c.spare)
+
+        await self.overlay(0).remove_circuit(circuit.circuit_id, remove_now=True)
+
+        # The first circuit was built while the pool was still empty.
+        self.assertEqual([spare], self.overlay(0).find_circuits())
+        self.assertEqual(1, self.overlay(0).circuit_pool_hits)
+        self.assertEqual(1, self.overlay(0).circuit_pool_misses)
+
+        self.overlay(0).do_circuits()
+        await self.deliver_messages()
+
+        self.assertEqual(1, len([c for c in self.overlay(0).circuits.values() if c.spare]))
+
+    async def test_circuit_pool_no_promote_unneeded(self) -> None:
+        """
+        Check if a spare circuit is not promoted when a circuit is removed that is no longer needed.
+        """
+        self.settings(0).circuit_pool_size = 1
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        self.overlay(0).build_tunnels(1)
+        await self.deliver_messages()
+        circuit = self.overlay(0).find_circuits()[0]
+        spare = next(c for c in self.overlay(0).circuits.values() if c.spare)
+        self.overlay(0).circuits_needed[1] = 0
+
+        await self.overlay(0).remove_circuit(circuit.circuit_id, remove_now=True)
+
+        self.assertTrue(spare.spare)
+        self.assertEqual([], self.overlay(0).find_circuits())
+        self.assertEqual(0, self.overlay(0).circuit_pool_hits)
+
+    async def test_circuit_pool_miss(self) -> None:
+        """
+        Check if a circuit pool without spare circuits counts a miss.
+        """
+        self.settings(0).circuit_pool_size = 1
+        self.overlay(0).add_circuit_pool(1, [PEER_FLAG_EXIT_IPV8])
+
+        self.assertIsNone(self.overlay(0).promote_spare_circuit(1, [PEER_FLAG_EXIT_IPV8]))
+        self.assertIsNone(self.overlay(0).promote_spare_circuit(2))
+        self.assertEqual(1, self.overlay(0).circuit_pool_misses)
+
     async def test_create_two_circuit(self) -> None:
         """
         Check if multiple 1 hop circuit creation works.
@@ -492,6 +785,50 @@ class TestTunnelCommunity(TestBase[TunnelCommunity]):
         self.assertEqual(circuit.unverified_hop, None)
         self.assertEqual(self.overlay(0).tunnels_ready(2), 1.0)
 
+    async def test_race_first_hop(self) -> None:
+        """
+        Check if the first hop to respond to a raced create becomes the first hop of a circuit.
+        """
+        self.add_node_to_experiment(self.create_node())
+        self.add_node_to_experiment(self.create_node())
+        self.settings(0).next_hop_race_size = 2
+        self.settings(3).peer_flags |= {PEER_FLAG_EXIT_BT}
+        join_circuits = [Mock(wraps=self.overlay(i).join_circuit) for i in [1, 2]]
+        self.overlay(1).join_circuit, self.overlay(2).join_circuit = join_circuits
+        await self.introduce_nodes()
+        circuit = self.overlay(0).create_circuit(2, exit_flags=[PEER_FLAG_EXIT_BT])
+        await self.deliver_messages()
+
+        self.assertEqual([1, 1], [join_circuit.call_count for join_circuit in join_circuits])
+        self.assertEqual(self.overlay(0).tunnels_ready(2), 1.0)
+        self.assertIn(circuit.hops[0].mid, [self.mid(1), self.mid(2)])
+        self.assertEqual(circuit.hops[1].mid, self.mid(3))
+        # The losing first hop should have removed its exit socket, the winning one turned it into a relay
+        self.assertEqual(len(self.overlay(1).exit_sockets) + len(self.overlay(2).exit_sockets), 0)
+        self.assertEqual(len(self.overlay(1).relay_from_to) + len(self.overlay(2).relay_from_to), 2)
+        self.assertEqual(len(self.overlay(3).exit_sockets), 1)
+
+    async def test_race_extend(self) -> None:
+        """
+        Check if the candidate to respond first to a raced extend becomes the next hop of a circuit.
+        """
+        self.add_node_to_experiment(self.create_node())
+        self.add_node_to_experiment(self.create_node())
+        self.settings(0).next_hop_race_size = 3
+        for i in [2, 3]:
+            self.settings(i).peer_flags |= {PEER_FLAG_EXIT_BT}
+            self.overlay(i).should_join_circuit = lambda _, address: succeed(address == self.address(1))
+        await self.introduce_nodes()
+        circuit = self.overlay(0).create_circuit(2)
+        await self.deliver_messages()
+
+        self.assertEqual(self.overlay(0).tunnels_ready(2), 1.0)
+        self.assertEqual(circuit.hops[0].mid, self.mid(1))
+        self.assertIn(circuit.hops[1].mid, [self.mid(2), self.mid(3)])
+        # The first hop should have destroyed the losing exit socket
+        self.assertEqual(len(self.overlay(2).exit_sockets) + len(self.overlay(3).exit_sockets), 1)
+        self.assertEqual(len(self.overlay(1).relay_from_to), 2)
+
     async def test_tunnel_endpoint_anon(self) -> None:
         """
         Check if the tunnel endpoint is routing traffic correctly with anonymity enabled.
@@ -529,6 +866,132 @@ class TestTunnelCommunity(TestBase[TunnelCommunity]):
         self.assertEqual(len(ep_listener.received_packets), 1)
         send_data.assert_not_called()
 
+    async def test_tunnel_endpoint_stripe(self) -> None:
+        """
+        Check if the tunnel endpoint stripes traffic over circuits in proportion to their inverse round-trip time.
+        """
+        endpoint = TunnelEndpoint(self.endpoint(0))
+        fast, slow = Circuit(1), Circuit(2)
+        fast.update_rtt(0.1)
+        slow.update_rtt(0.2)
+
+        selected = [endpoint.select_circuit([fast, slow], 100) for _ in range(30)]
+
+        self.assertEqual(20, selected.count(fast))
+        self.assertEqual(10, selected.count(slow))
+
+    async def test_tunnel_endpoint_stripe_new_circuit(self) -> None:
+        """
+        Check if the tunnel endpoint does not send all traffic over a new circuit to let it catch up.
+        """
+        endpoint = TunnelEndpoint(self.endpoint(0))
+        old, new = Circuit(1), Circuit(2)
+        for _ in range(10):
+            endpoint.select_circuit([old], 100)
+
+        selected = [endpoint.select_circuit([old, new], 100) for _ in range(10)]
+
+        self.assertEqual(5, selected.count(old))
+        self.assertEqual(5, selected.count(new))
+        self.assertEqual({1, 2}, set(endpoint.finish_times))
+
+    async def test_ping_rtt(self) -> None:
+        """
+        Check if pinging a circuit measures its round-trip time.
+        """
+        self.settings(1).peer_flags |= {PEER_FLAG_EXIT_BT}
+        await self.introduce_nodes()
+        circuit = self.overlay(0).create_circuit(1)
+        await circuit.ready
+
+        self.overlay(0).do_ping()
+        await self.deliver_messages()
+
+        self.assertIsNotNone(circuit.rtt)
+
+    async def test_relay_fair_queueing(self) -> None:
+        """
+        Check if the cells of rate limited relays are sent in a deficit round robin fashion.
+        """
+        self.settings(0).relay_total_rate_limit = 1000
+        self.settings(0).relay_burst_size = 1000
+        crypto_endpoint = self.overlay(0).crypto_endpoint
+        crypto_endpoint.endpoint.send = send = Mock()
+        heavy = RelayRoute(1, Hop(self.overlay(1).my_peer), FORWARD)
+        light = RelayRoute(2, Hop(self.overlay(1).my_peer), FORWARD)
+
+        for _ in range(4):
+            crypto_endpoint.shape_relayed_packet(heavy, b"h" * 1000)
+        crypto_endpoint.shape_relayed_packet(light, b"l" * 1000)
+        crypto_endpoint.relay_bucket.capacity = crypto_endpoint.relay_bucket.tokens = 10000
+        crypto_endpoint.process_relay_queues()
+
+        self.assertEqual(b"hhlhh", bytes(call.args[1][0] for call in send.call_args_list))
+        self.assertEqual(3, heavy.cells_delayed)
+        self.assertEqual(1, light.cells_delayed)
+        self.assertEqual({}, crypto_endpoint.queued_relays)
+
+    async def test_relay_rate_limit(self) -> None:
+        """
+        Check if the cells of a relay that exceed its rate are queued and dropped when its queue is full.
+        """
+        self.settings(0).relay_rate_limit = 1000
+        self.settings(0).relay_burst_size = 1000
+        self.settings(0).relay_queue_size = 2
+        crypto_endpoint = self.overlay(0).crypto_endpoint
+        crypto_endpoint.endpoint.send = send = Mock()
+        relay = RelayRoute(1, Hop(self.overlay(1).my_peer), FORWARD)
+
+        for _ in range(4):
+            crypto_endpoint.shape_relayed_packet(relay, b"\x00" * 1000)
+        crypto_endpoint.process_relay_queues()
+
+        self.assertEqual(1, send.call_count)
+        self.assertEqual(1000, relay.bytes_up)
+        self.assertEqual(2, len(relay.queue))
+        self.assertEqual(2, relay.cells_delayed)
+        self.assertEqual(1, relay.cells_dropped)
+        self.assertIsNotNone(crypto_endpoint.relay_queue_handle)
+
+    async def test_relay_zero_quantum(self) -> None:
+        """
+        Check if queued relay cells are still sent if the quantum of the relay scheduler is not positive.
+        """
+        self.settings(0).relay_total_rate_limit = 1000
+        self.settings(0).relay_burst_size = 1000
+        self.settings(0).relay_quantum = 0
+        crypto_endpoint = self.overlay(0).crypto_endpoint
+        crypto_endpoint.endpoint.send = send = Mock()
+        relay = RelayRoute(1, Hop(self.overlay(1).my_peer), FORWARD)
+
+        for _ in range(2):
+            crypto_endpoint.shape_relayed_packet(relay, b"\x00" * 100)
+        crypto_endpoint.process_relay_queues()
+
+        self.assertEqual(2, send.call_count)
+        self.assertEqual({}, crypto_endpoint.queued_relays)
+
+    async def test_remove_relay_drops_queue(self) -> None:
+        """
+        Check if the queued cells of a relay are dropped when the relay is removed.
+        """
+        self.settings(0).relay_rate_limit = 1000
+        self.settings(0).relay_burst_size = 1000
+        crypto_endpoint = self.overlay(0).crypto_endpoint
+        crypto_endpoint.endpoint.send = send = Mock()
+        relay = RelayRoute(2, Hop(self.overlay(1).my_peer), FORWARD)
+        self.overlay(0).relay_from_to[1] = relay
+
+        for _ in range(3):
+            crypto_endpoint.shape_relayed_packet(relay, b"\x00" * 1000)
+        await self.overlay(0).remove_relay(1, remove_now=True)
+        relay.bucket.tokens = relay.bucket.capacity = 10000
+        crypto_endpoint.process_relay_queues()
+
+        self.assertEqual(1, send.call_count)
+        self.assertEqual(0, len(relay.queue))
+        self.assertEqual({}, crypto_endpoint.queued_relays)
+
     async def test_tunnel_endpoint_no_anon(self) -> None:
         """
         Check if the tunnel endpoint is routing traffic correctly with anonymity disabled.
@@ -0,0 +1,218 @@
+from ....messaging.anonymization.crypto import CryptoException, ReplayWindow, Route, RoutingTable, TunnelCrypto
+from ....messaging.anonymization.tunnel import BACKWARD, FORWARD, Circuit, CircuitIndex
+from ...base import TestBase
+
+
+class TestTunnelCrypto(TestBase):
+    """
+    Tests related to the TunnelCrypto encryption and decryption.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create session keys for a shared secret of only zeroes.
+        """
+        super().setUp()
+        self.crypto = TunnelCrypto()
+        self.keys = self.crypto.generate_session_keys(b"\x00" * 64)
+
+    def test_session_keys_aead(self) -> None:
+        """
+        Check if the cipher contexts of session keys are created for the session keys.
+        """
+        self.assertEqual(self.keys.key_forward, self.keys.aead_forward.sk)
+        self.assertEqual(self.keys.key_backward, self.keys.aead_backward.sk)
+
+    def test_session_keys_equality(self) -> None:
+        """
+        Check if the cipher contexts are ignored when comparing session keys.
+        """
+        self.assertEqual(self.keys, self.crypto.generate_session_keys(b"\x00" * 64))
+
+    def test_encrypt_decrypt_forward(self) -> None:
+        """
+        Check if content can be encrypted and decrypted in the forward direction.
+        """
+        encrypted = TunnelCrypto.encrypt_str(b"content", self.keys, FORWARD)
+
+        self.assertEqual(b"content", TunnelCrypto.decrypt_str(encrypted, self.keys, FORWARD))
+        self.assertEqual(2, self.keys.salt_explicit_forward)
+        self.assertEqual(1, self.keys.salt_explicit_backward)
+
+    def test_encrypt_decrypt_backward(self) -> None:
+        """
+        Check if content can be encrypted and decrypted in the backward direction.
+        """
+        encrypted = TunnelCrypto.encrypt_str(b"content", self.keys, BACKWARD)
+
+        self.assertEqual(b"content", TunnelCrypto.decrypt_str(encrypted, self.keys, BACKWARD))
+        self.assertEqual(1, self.keys.salt_explicit_forward)
+        self.assertEqual(2, self.keys.salt_explicit_backward)
+
+    def test_decrypt_wrong_direction(self) -> None:
+        """
+        Check if content cannot be decrypted using the keys of the opposite direction.
+        """
+        encrypted = TunnelCrypto.encrypt_str(b"content", self.keys, FORWARD)
+
+        with self.assertRaises(ValueError):
+            TunnelCrypto.decrypt_str(encrypted, self.keys, BACKWARD)
+
+    def test_decrypt_truncated(self) -> None:
+        """
+        Check if truncated content is not decrypted.
+        """
+        with self.assertRaises(CryptoException):
+            TunnelCrypto.decrypt_str(b"\x00" * 23, self.keys, FORWARD)
+
+    def test_decrypt_replayed(self) -> None:
+        """
+        Check if content cannot be decrypted twice.
+        """
+        encrypted = TunnelCrypto.encrypt_str(b"content", self.keys, FORWARD)
+        TunnelCrypto.decrypt_str(encrypted, self.keys, FORWARD)
+
+        with self.assertRaises(CryptoException):
+            TunnelCrypto.decrypt_str(encrypted, self.keys, FORWARD)
+
+    def test_decrypt_out_of_order(self) -> None:
+        """
+        Check if content can be decrypted in a different order than it was encrypted in.
+        """
+        encrypted1 = TunnelCrypto.encrypt_str(b"content1", self.keys, FORWARD)
+        encrypted2 = TunnelCrypto.encrypt_str(b"content2", self.keys, FORWARD)
+
+        self.assertEqual(b"content2", TunnelCrypto.decrypt_str(encrypted2, self.keys, FORWARD))
+        self.assertEqual(b"content1", TunnelCrypto.decrypt_str(encrypted1, self.keys, FORWARD))
+
+    def test_decrypt_outdated(self) -> None:
+        """
+        Check if content that is too old for the replay window is not decrypted.
+        """
+        encrypted = TunnelCrypto.encrypt_str(b"content", self.keys, FORWARD)
+        self.keys.salt_explicit_forward += self.keys.replay_window_forward.size
+        TunnelCrypto.decrypt_str(TunnelCrypto.encrypt_str(b"content", self.keys, FORWARD), self.keys, FORWARD)
+
+        with self.assertRaises(CryptoException):
+            TunnelCrypto.decrypt_str(encrypted, self.keys, FORWARD)
+
+    def test_decrypt_forged_no_window(self) -> None:
+        """
+        Check if content that fails to decrypt does not consume its salt_explicit.
+        """
+        encrypted = TunnelCrypto.encrypt_str(b"content", self.keys, FORWARD)
+        forged = encrypted[:-1] + bytes([encrypted[-1] ^ 0xFF])
+
+        with self.assertRaises(ValueError):
+            TunnelCrypto.decrypt_str(forged, self.keys, FORWARD)
+        self.assertEqual(b"content", TunnelCrypto.decrypt_str(encrypted, self.keys, FORWARD))
+
+    def test_replay_window_slide(self) -> None:
+        """
+        Check if the replay window keeps track of explicit salts below the highest received explicit salt.
+        """
+        window = ReplayWindow(8)
+
+        self.assertTrue(window.update(10))
+        self.assertTrue(window.update(5))
+        self.assertTrue(window.update(12))
+
+        self.assertFalse(window.check(5))
+        self.assertFalse(window.check(10))
+        self.assertFalse(window.check(12))
+        self.assertTrue(window.check(6))
+        self.assertFalse(window.check(4))
+        self.assertTrue(window.check(13))
+
+    def test_replay_window_non_positive(self) -> None:
+        """
+        Check if the replay window does not accept explicit salts that are never used for encryption.
+        """
+        window = ReplayWindow()
+
+        self.assertFalse(window.update(0))
+        self.assertFalse(window.update(-1))
+
+
+class TestRoutingTable(TestBase):
+    """
+    Tests related to the RoutingTable, which keeps the routes per circuit id up to date.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a circuit table and an exit socket table that share their routes.
+        """
+        super().setUp()
+        self.routes: dict[int, Route] = {}
+        self.circuits = RoutingTable(self.routes, "circuit")
+        self.exit_sockets = RoutingTable(self.routes, "exit_socket")
+
+    def test_add(self) -> None:
+        """
+        Check if adding a tunnel creates a route for its circuit id.
+        """
+        self.circuits[1] = "circuit"
+
+        self.assertEqual("circuit", self.routes[1].circuit)
+        self.assertIsNone(self.routes[1].relay)
+        self.assertIsNone(self.routes[1].exit_socket)
+
+    def test_shared_route(self) -> None:
+        """
+        Check if tunnels with the same circuit id share their route.
+        """
+        self.circuits[1] = "circuit"
+        self.exit_sockets[1] = "exit socket"
+        self.circuits.pop(1)
+
+        self.assertIsNone(self.routes[1].circuit)
+        self.assertEqual("exit socket", self.routes[1].exit_socket)
+
+    def test_remove(self) -> None:
+        """
+        Check if the route of a circuit id is removed when its last tunnel is removed.
+        """
+        self.circuits.update({1: "circuit1", 2: "circuit2"})
+        self.circuits.setdefault(3, "circuit3")
+        del self.circuits[1]
+        self.circuits.pop(2)
+        self.circuits.popitem()
+
+        self.assertEqual({}, self.routes)
+
+    def test_index(self) -> None:
+        """
+        Check if the index of a table follows the tunnels that are added, replaced and removed.
+        """
+        circuits = RoutingTable(self.routes, "circuit", CircuitIndex())
+        circuit1, circuit2 = Circuit(1, 1), Circuit(1, 2)
+
+        circuits[1] = circuit1
+        self.assertEqual([circuit1], circuits.index.find(hops=1))
+
+        circuits[1] = circuit2
+        self.assertEqual([circuit2], circuits.index.find())
+
+        circuits.clear()
+        self.assertEqual([], circuits.index.find())
+
+    def test_pop_unknown(self) -> None:
+        """
+        Check if popping an unknown circuit id leaves the routes untouched.
+        """
+        self.exit_sockets[1] = "exit socket"
+
+        self.assertIsNone(self.circuits.pop(1, None))
+        self.assertEqual("exit socket", self.routes[1].exit_socket)
+
+    def test_clear(self) -> None:
+        """
+        Check if clearing a table only removes the tunnels of that table from the routes.
+        """
+        self.circuits.update({1: "circuit1", 2: "circuit2"})
+        self.exit_sockets[2] = "exit socket"
+        self.circuits.clear()
+
+        self.assertEqual([2], list(self.routes))
+        self.assertEqual("exit socket", self.routes[2].exit_socket)
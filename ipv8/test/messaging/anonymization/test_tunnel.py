@@ -0,0 +1,131 @@
+from ....keyvault.crypto import default_eccrypto
+from ....messaging.anonymization.tunnel import (
+    CIRCUIT_STATE_CLOSING,
+    CIRCUIT_STATE_EXTENDING,
+    CIRCUIT_STATE_READY,
+    CIRCUIT_TYPE_DATA,
+    CIRCUIT_TYPE_IP_SEEDER,
+    PEER_FLAG_EXIT_BT,
+    PEER_FLAG_RELAY,
+    CandidateTable,
+    Circuit,
+    CircuitIndex,
+    Hop,
+)
+from ....peer import Peer
+from ...base import TestBase
+
+
+class TestCircuitIndex(TestBase):
+    """
+    Tests related to the CircuitIndex, which keeps circuits indexed by type, state and hops.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an empty index and a peer to use as a hop.
+        """
+        super().setUp()
+        self.index = CircuitIndex()
+        self.hop = Hop(Peer(default_eccrypto.generate_key("curve25519").pub()))
+
+    def test_add(self) -> None:
+        """
+        Check if an added circuit can be found by its type, state and hops.
+        """
+        circuit = Circuit(1, 1)
+        self.index.add(circuit)
+
+        self.assertEqual([circuit], self.index.find(CIRCUIT_TYPE_DATA, CIRCUIT_STATE_EXTENDING, 1))
+        self.assertEqual([circuit], self.index.find())
+        self.assertEqual([], self.index.find(CIRCUIT_TYPE_IP_SEEDER))
+        self.assertEqual([], self.index.find(state=CIRCUIT_STATE_READY))
+        self.assertEqual([], self.index.find(hops=2))
+
+    def test_follow_state(self) -> None:
+        """
+        Check if the index follows the state changes of a circuit.
+        """
+        circuit = Circuit(1, 1)
+        self.index.add(circuit)
+
+        circuit.add_hop(self.hop)
+        ready = self.index.find(state=CIRCUIT_STATE_READY)
+        circuit.close()
+
+        self.assertEqual([circuit], ready)
+        self.assertEqual([circuit], self.index.find(state=CIRCUIT_STATE_CLOSING))
+        self.assertEqual([CIRCUIT_STATE_CLOSING], [state for _, state, _ in self.index.circuits])
+
+    def test_spare(self) -> None:
+        """
+        Check if spare circuits are not indexed.
+        """
+        circuit = Circuit(1, 1)
+        self.index.add(circuit)
+
+        circuit.spare = True
+        spares = self.index.find()
+        circuit.spare = False
+
+        self.assertEqual([], spares)
+        self.assertEqual([circuit], self.index.find())
+
+    def test_remove(self) -> None:
+        """
+        Check if a removed circuit is no longer indexed or followed.
+        """
+        circuit = Circuit(1, 1)
+        self.index.add(circuit)
+        self.index.remove(circuit)
+        circuit.add_hop(self.hop)
+
+        self.assertEqual({}, self.index.circuits)
+        self.assertEqual({}, self.index.keys)
+
+
+class TestCandidateTable(TestBase):
+    """
+    Tests related to the CandidateTable, which keeps candidates indexed by peer flag.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an empty table and two peers.
+        """
+        super().setUp()
+        self.candidates = CandidateTable()
+        self.peer1 = Peer(default_eccrypto.generate_key("curve25519").pub())
+        self.peer2 = Peer(default_eccrypto.generate_key("curve25519").pub())
+
+    def test_get_peers(self) -> None:
+        """
+        Check if peers can be retrieved by their flags.
+        """
+        self.candidates[self.peer1] = [PEER_FLAG_RELAY]
+        self.candidates[self.peer2] = [PEER_FLAG_RELAY, PEER_FLAG_EXIT_BT]
+
+        self.assertEqual([self.peer1, self.peer2], self.candidates.get_peers())
+        self.assertEqual([self.peer1, self.peer2], self.candidates.get_peers(PEER_FLAG_RELAY))
+        self.assertEqual([self.peer2], self.candidates.get_peers(PEER_FLAG_EXIT_BT, PEER_FLAG_RELAY))
+
+    def test_change_flags(self) -> None:
+        """
+        Check if peers are reindexed when their flags change.
+        """
+        self.candidates[self.peer1] = [PEER_FLAG_RELAY, PEER_FLAG_EXIT_BT]
+        self.candidates[self.peer1] = [PEER_FLAG_RELAY]
+
+        self.assertEqual([], self.candidates.get_peers(PEER_FLAG_EXIT_BT))
+        self.assertEqual([self.peer1], self.candidates.get_peers(PEER_FLAG_RELAY))
+
+    def test_remove(self) -> None:
+        """
+        Check if removed peers are no longer indexed.
+        """
+        self.candidates.update({self.peer1: [PEER_FLAG_RELAY], self.peer2: [PEER_FLAG_EXIT_BT]})
+        self.candidates.pop(self.peer1)
+        del self.candidates[self.peer2]
+
+        self.assertEqual({}, self.candidates.peers_by_flag)
+        self.assertIsNone(self.candidates.pop(self.peer1, None))
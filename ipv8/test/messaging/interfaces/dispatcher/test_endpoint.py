@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+from asyncio import sleep
 from typing import TYPE_CHECKING
 
 from .....messaging.interfaces.dispatcher.endpoint import (
@@ -10,6 +12,7 @@ from .....messaging.interfaces.dispatcher.endpoint import (
     guess_interface,
 )
 from .....messaging.interfaces.endpoint import Endpoint, EndpointListener
+from .....messaging.interfaces.rate_limiter import SourceRateLimiter
 from .....messaging.interfaces.udp.endpoint import UDPv4Address
 from ....base import TestBase
 
@@ -36,6 +39,51 @@ class DummyEndpointListener(EndpointListener):
         self.incoming.append(packet)
 
 
+class DummyBatchEndpointListener(DummyEndpointListener):
+    """
+    This class listens on an endpoint and stores incoming batches of packets in a list.
+    """
+
+    def __init__(self, endpoint: Endpoint) -> None:
+        """
+        Wrap the given endpoint.
+        """
+        super().__init__(endpoint)
+        self.batches = []
+
+    def on_packets(self, packets: list[tuple[Address, bytes]]) -> None:
+        """
+        Callback for incoming batches of packets.
+        """
+        self.batches.append(packets)
+
+
+class ThreadedEndpointListener(DummyEndpointListener):
+    """
+    This class listens on an endpoint without using the main thread and can be blocked while handling a packet.
+    """
+
+    def __init__(self, endpoint: Endpoint) -> None:
+        """
+        Wrap the given endpoint.
+        """
+        EndpointListener.__init__(self, endpoint, main_thread=False)
+        self.incoming = []
+        self.threads = set()
+        self.received = threading.Event()
+        self.unblocked = threading.Event()
+        self.unblocked.set()
+
+    def on_packet(self, packet: tuple[Address, bytes]) -> None:
+        """
+        Callback for incoming packets, blocks until we are unblocked.
+        """
+        self.threads.add(threading.get_ident())
+        self.received.set()
+        self.unblocked.wait(5)
+        super().on_packet(packet)
+
+
 class DummyEndpoint(Endpoint):
     """
     Non-functional endpoint for manual staging and inspection.
@@ -88,6 +136,7 @@ class DummyEndpoint(Endpoint):
         """
         Close as usual.
         """
+        self.stop_workers()
         self.opened = False
 
     def reset_byte_counters(self) -> None:
@@ -271,6 +320,206 @@ class TestDispatcherEndpoint(TestBase):
         self.assertEqual(2, len(listener1.incoming))
         self.assertEqual(1, len(listener2.incoming))
 
+    async def test_add_prefix_listener_batch(self) -> None:
+        """
+        Check if a batch of packets is demultiplexed by prefix for the listeners of the children.
+        """
+        endpoint, _, listener1 = await self._produce_dummy()
+        listener2 = DummyEndpointListener(endpoint)
+        endpoint.add_prefix_listener(listener2, b"s")
+        packet1 = ("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA
+        packet2 = ("1.2.3.4", 5), b"sata"
+
+        endpoint.notify_listeners_batch([packet1, packet2, packet2])
+
+        self.assertEqual([packet1, packet2, packet2], listener1.incoming)
+        self.assertEqual([packet2, packet2], listener2.incoming)
+
+    async def test_on_packets(self) -> None:
+        """
+        Check if a listener that handles batches receives all of its packets at once.
+        """
+        endpoint, child_endpoint, _ = await self._produce_dummy()
+        listener = DummyBatchEndpointListener(endpoint)
+        endpoint.add_prefix_listener(listener, b"s")
+        packet1 = ("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA
+        packet2 = ("1.2.3.4", 5), b"sata"
+
+        child_endpoint.notify_listeners_batch([packet2, packet1, packet2])
+
+        self.assertEqual([[packet2, packet2]], listener.batches)
+        self.assertEqual([], listener.incoming)
+
+    async def test_on_packets_closed(self) -> None:
+        """
+        Check if batches of packets are not delivered when the endpoint is closed.
+        """
+        endpoint, child_endpoint, listener = await self._produce_dummy()
+        await endpoint.close()
+
+        child_endpoint.notify_listeners_batch([(("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA)])
+
+        self.assertEqual([], listener.incoming)
+
+    async def test_worker_thread(self) -> None:
+        """
+        Check if packets are delivered on a worker thread to a listener that does not need the main thread.
+        """
+        endpoint, child_endpoint, _ = await self._produce_dummy()
+        child_endpoint.worker_queue_size = 10
+        listener = ThreadedEndpointListener(endpoint)
+        endpoint.add_listener(listener)
+        packet = ("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA
+
+        child_endpoint.notify_listeners(packet)
+        listener.received.wait(5)
+        worker = child_endpoint.get_worker(listener)
+        endpoint.remove_listener(listener)
+        worker.join(5)
+
+        self.assertEqual([packet], listener.incoming)
+        self.assertNotIn(threading.get_ident(), listener.threads)
+        self.assertEqual(1, worker.delivered)
+        self.assertFalse(worker.running)
+        self.assertIsNone(child_endpoint.get_worker(listener))
+
+    async def test_close_stops_workers(self) -> None:
+        """
+        Check if the worker threads of the listeners of the interfaces exit when the endpoint is closed.
+        """
+        endpoint, child_endpoint, _ = await self._produce_dummy()
+        child_endpoint.worker_queue_size = 10
+        listener = ThreadedEndpointListener(endpoint)
+        endpoint.add_listener(listener)
+
+        child_endpoint.notify_listeners((("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA))
+        listener.received.wait(5)
+        worker = child_endpoint.get_worker(listener)
+        await endpoint.close()
+
+        self.assertEqual(1, worker.delivered)
+        self.assertFalse(worker.running)
+        self.assertIsNone(child_endpoint.get_worker(listener))
+        self.assertNotIn(f"{ThreadedEndpointListener.__name__}Worker", [t.name for t in threading.enumerate()])
+
+    async def test_worker_queue_full(self) -> None:
+        """
+        Check if packets for a busy listener are dropped when its queue is full.
+        """
+        endpoint, child_endpoint, _ = await self._produce_dummy()
+        child_endpoint.worker_queue_size = 2
+        listener = ThreadedEndpointListener(endpoint)
+        listener.unblocked.clear()
+        endpoint.add_listener(listener)
+        packet = ("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA
+
+        child_endpoint.notify_listeners(packet)
+        listener.received.wait(5)
+        child_endpoint.notify_listeners_batch([packet, packet, packet])
+        worker = child_endpoint.get_worker(listener)
+        dropped = worker.dropped
+        listener.unblocked.set()
+        for _ in range(50):
+            if worker.delivered == 3:
+                break
+            await sleep(.01)
+        endpoint.remove_listener(listener)
+
+        self.assertEqual(1, dropped)
+        self.assertEqual(3, worker.delivered)
+        self.assertEqual([packet] * 3, listener.incoming)
+
+    async def test_worker_disabled(self) -> None:
+        """
+        Check if all listeners are called on the main thread if worker threads are disabled.
+        """
+        endpoint, child_endpoint, _ = await self._produce_dummy()
+        listener = ThreadedEndpointListener(endpoint)
+        endpoint.add_listener(listener)
+
+        child_endpoint.notify_listeners((("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA))
+
+        self.assertEqual({threading.get_ident()}, listener.threads)
+        self.assertIsNone(child_endpoint.get_worker(listener))
+
+    async def test_ingress_fair(self) -> None:
+        """
+        Check if queued incoming packets are delivered fairly per prefix, within the budget of each loop iteration.
+        """
+        endpoint, child_endpoint, _ = await self._produce_dummy()
+        child_endpoint.ingress_queue_size = 10
+        child_endpoint.ingress_budget = 4
+        listener1 = DummyBatchEndpointListener(endpoint)
+        listener2 = DummyBatchEndpointListener(endpoint)
+        endpoint.add_prefix_listener(listener1, b"d")
+        endpoint.add_prefix_listener(listener2, b"s")
+        packet1 = ("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA
+        packet2 = ("1.2.3.4", 5), b"sata"
+
+        child_endpoint.notify_listeners_batch([packet1] * 6 + [packet2] * 2)
+        queued = [listener1.batches[:], listener2.batches[:]]
+        await sleep(0)
+        first_iteration = [listener1.batches[:], listener2.batches[:]]
+        await sleep(0)
+
+        self.assertEqual([[], []], queued)
+        self.assertEqual([[[packet1] * 2], [[packet2] * 2]], first_iteration)
+        self.assertEqual([[packet1] * 2, [packet1] * 4], listener1.batches)
+        self.assertEqual([[packet2] * 2], listener2.batches)
+
+    async def test_ingress_drop(self) -> None:
+        """
+        Check if peer discovery packets are dropped first when an ingress queue is full.
+        """
+        endpoint, child_endpoint, _ = await self._produce_dummy()
+        child_endpoint.ingress_queue_size = 2
+        listener = DummyBatchEndpointListener(endpoint)
+        endpoint.add_prefix_listener(listener, b"s")
+        introduction = ("1.2.3.4", 5), b"s" + bytes([246])
+        data = ("1.2.3.4", 5), b"s" + bytes([1])
+
+        for packet in [introduction, data, data, introduction]:
+            child_endpoint.notify_listeners(packet)
+        await sleep(0)
+
+        self.assertEqual([[data, data]], listener.batches)
+        self.assertEqual({"queued": 0, "max_queued": 2, "dropped": 2}, endpoint.get_ingress_statistics(b"s"))
+
+    def test_ingress_statistics_interfaces(self) -> None:
+        """
+        Check if the ingress statistics of multiple interfaces are combined.
+        """
+        endpoint = DispatcherEndpoint(["Dummy"])
+        endpoint.interfaces["Other"] = DummyEndpoint()
+        endpoint.interfaces["Dummy"].get_ingress_statistics = lambda _: {"queued": 1, "max_queued": 10, "dropped": 2}
+        endpoint.interfaces["Other"].get_ingress_statistics = lambda _: {"queued": 3, "max_queued": 20, "dropped": 4}
+
+        self.assertEqual({"queued": 4, "max_queued": 20, "dropped": 6}, endpoint.get_ingress_statistics(b"s"))
+
+    async def test_rate_limit(self) -> None:
+        """
+        Check if packets from sources that exceed their rate limit are not delivered.
+        """
+        endpoint, child_endpoint, listener = await self._produce_dummy()
+        endpoint.set_rate_limiter(SourceRateLimiter(rate=0.001, burst=2))
+        packet1 = ("1.2.3.4", 5), TestDispatcherEndpoint.RANDOM_DATA
+        packet2 = ("5.6.7.8", 5), TestDispatcherEndpoint.RANDOM_DATA
+
+        child_endpoint.notify_listeners(packet1)
+        child_endpoint.notify_listeners_batch([packet1, packet1, packet2])
+
+        self.assertEqual([packet1, packet1, packet2], listener.incoming)
+        self.assertEqual(1, endpoint.rate_limiter.rejected)
+
+    def test_worker_queue_size_interface(self) -> None:
+        """
+        Check if the worker queue size of an interface can be configured.
+        """
+        endpoint = DispatcherEndpoint(["Dummy"], Dummy={"worker_queue_size": 10, "ingress_queue_size": 20})
+
+        self.assertEqual(10, endpoint.interfaces["Dummy"].worker_queue_size)
+        self.assertEqual(20, endpoint.interfaces["Dummy"].ingress_queue_size)
+
     async def test_guess_interface_ipv4(self) -> None:
         """
         Check if guess_interface guesses IPv4 interfaces correctly.
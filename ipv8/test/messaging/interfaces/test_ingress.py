@@ -0,0 +1,48 @@
+from ....messaging.interfaces.ingress import IngressQueue
+from ...base import TestBase
+
+
+class TestIngressQueue(TestBase):
+    """
+    Tests related to the bounded ingress queue of a single prefix.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a queue that holds two packets.
+        """
+        super().setUp()
+        self.queue = IngressQueue(2)
+        self.packets = [(("1.2.3.4", 5), bytes([i])) for i in range(3)]
+
+    def test_order(self) -> None:
+        """
+        Check if packets are delivered in the order in which they were queued, regardless of their priority.
+        """
+        self.queue.push(1, 1, self.packets[0])
+        self.queue.push(2, 0, self.packets[1])
+
+        self.assertEqual([self.packets[0], self.packets[1]], [self.queue.pop(), self.queue.pop()])
+        self.assertRaises(IndexError, self.queue.pop)
+
+    def test_drop_incoming(self) -> None:
+        """
+        Check if an incoming packet is dropped if the queue is full with packets of the same priority.
+        """
+        self.queue.push(1, 1, self.packets[0])
+        self.queue.push(2, 1, self.packets[1])
+
+        self.assertFalse(self.queue.push(3, 1, self.packets[2]))
+        self.assertEqual([self.packets[0], self.packets[1]], [self.queue.pop(), self.queue.pop()])
+        self.assertEqual({"queued": 0, "max_queued": 2, "dropped": 1}, self.queue.get_statistics())
+
+    def test_drop_lower_priority(self) -> None:
+        """
+        Check if the oldest packet with the lowest priority is dropped to make room for a higher priority packet.
+        """
+        self.queue.push(1, 0, self.packets[0])
+        self.queue.push(2, 0, self.packets[1])
+
+        self.assertTrue(self.queue.push(3, 1, self.packets[2]))
+        self.assertEqual([self.packets[1], self.packets[2]], [self.queue.pop(), self.queue.pop()])
+        self.assertEqual({"queued": 0, "max_queued": 2, "dropped": 1}, self.queue.get_statistics())
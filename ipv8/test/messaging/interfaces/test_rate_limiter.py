@@ -0,0 +1,67 @@
+from ....messaging.interfaces.rate_limiter import SourceRateLimiter
+from ...base import TestBase
+
+
+class TestSourceRateLimiter(TestBase):
+    """
+    Tests related to the rate limiter for incoming packets.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a rate limiter that allows two packets per source and tracks two sources.
+        """
+        super().setUp()
+        self.limiter = SourceRateLimiter(rate=1.0, burst=2.0, max_sources=2)
+
+    def test_limit(self) -> None:
+        """
+        Check if packets are rejected when a source exceeds its burst, regardless of its port.
+        """
+        results = [self.limiter.allow(("1.2.3.4", port), 0.0) for port in range(3)]
+
+        self.assertEqual([True, True, False], results)
+        self.assertTrue(self.limiter.allow(("5.6.7.8", 1), 0.0))
+        self.assertEqual({"accepted": 3, "rejected": 1, "evicted": 0, "sources": 2, "allowed": 0},
+                         self.limiter.get_statistics())
+
+    def test_refill(self) -> None:
+        """
+        Check if a source is allowed to send again after its bucket has been refilled.
+        """
+        self.limiter.allow(("1.2.3.4", 1), 0.0)
+        self.limiter.allow(("1.2.3.4", 1), 0.0)
+
+        self.assertFalse(self.limiter.allow(("1.2.3.4", 1), 0.5))
+        self.assertTrue(self.limiter.allow(("1.2.3.4", 1), 1.5))
+
+    def test_evict_least_recently_used(self) -> None:
+        """
+        Check if the least recently seen source is forgotten when too many sources are tracked.
+        """
+        self.limiter.allow(("1.1.1.1", 1), 0.0)
+        self.limiter.allow(("2.2.2.2", 1), 0.0)
+        self.limiter.allow(("1.1.1.1", 1), 0.0)
+        self.limiter.allow(("3.3.3.3", 1), 0.0)
+
+        self.assertEqual(["1.1.1.1", "3.3.3.3"], list(self.limiter.buckets))
+        self.assertEqual(1, self.limiter.evicted)
+
+    def test_allowed(self) -> None:
+        """
+        Check if allowed sources are never limited.
+        """
+        self.limiter.set_allowed([("1.2.3.4", 6421)])
+
+        results = [self.limiter.allow(("1.2.3.4", 6421), 0.0) for _ in range(5)]
+
+        self.assertEqual([True] * 5, results)
+        self.assertEqual({}, self.limiter.buckets)
+
+    def test_filter(self) -> None:
+        """
+        Check if a batch of packets is filtered per source.
+        """
+        packets = [(("1.2.3.4", 1), b"a"), (("1.2.3.4", 1), b"b"), (("1.2.3.4", 1), b"c"), (("5.6.7.8", 1), b"d")]
+
+        self.assertEqual([packets[0], packets[1], packets[3]], self.limiter.filter(packets))
@@ -82,6 +82,33 @@ class TestStatisticsEndpoint(TestBase):
         self.assertEqual(0, statistics[self.msg_num].num_up)
         self.assertEqual(1, statistics[self.msg_num].num_down)
 
+    async def test_capture_receive_batch(self) -> None:
+        """
+        Check if received batches are registered for enabled prefixes only.
+        """
+        self.stats_ep.enable_community_statistics(self.prefix, True)
+        self.stats_ep.on_packets([(self.fake_addr, self.prefix + self.msg_id + b"Hello World!"),
+                                  (self.fake_addr, b"1" * 22 + self.msg_id + b"Hello World!"),
+                                  (self.fake_addr, self.prefix + self.msg_id + b"Hello World!")])
+
+        statistics = self.stats_ep.get_statistics(self.prefix)
+
+        self.assertEqual(2, statistics[self.msg_num].num_down)
+        self.assertEqual(70, statistics[self.msg_num].bytes_down)
+        self.assertEqual({}, self.stats_ep.get_statistics(b"1" * 22))
+
+    async def test_ingress_statistics(self) -> None:
+        """
+        Check if the ingress statistics of the underlying endpoint are exported.
+        """
+        self.raw_ep.ingress_queue_size = 1
+        self.raw_ep.add_prefix_listener(self.stats_ep, self.prefix)
+        self.raw_ep.notify_listeners((self.fake_addr, self.prefix + self.msg_id + b"Hello World!"))
+        self.raw_ep.notify_listeners((self.fake_addr, self.prefix + self.msg_id + b"Hello World!"))
+
+        self.assertEqual({"queued": 1, "max_queued": 1, "dropped": 1},
+                         self.stats_ep.get_ingress_statistics(self.prefix))
+
     async def test_no_capture_receive_disabled(self) -> None:
         """
         Check if receive calls are not registered when the prefix is disabled.
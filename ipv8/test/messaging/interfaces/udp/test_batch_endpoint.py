@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from asyncio import sleep
+from unittest.mock import patch
+
+from .....messaging.interfaces.dispatcher.endpoint import BATCHED_INTERFACES, INTERFACES, DispatcherEndpoint
+from .....messaging.interfaces.udp.endpoint import UDPEndpoint, UDPv4Address, UDPv6Endpoint
+from ....base import TestBase
+from .test_endpoint import DummyEndpointListener, ThreadedEndpointListener
+
+
+@unittest.skipUnless(BATCHED_INTERFACES, "Batched UDP endpoints are not supported on this platform")
+class TestUDPBatchEndpoint(TestBase):
+    """
+    This class contains various tests for the batched UDP endpoint.
+    """
+
+    async def setUp(self) -> None:
+        """
+        Create a batched endpoint and a regular endpoint that listen on localhost.
+        """
+        super().setUp()
+        self.endpoint1 = BATCHED_INTERFACES["UDPIPv4"](batch_size=8)
+        await self.endpoint1.open()
+        self.endpoint2 = UDPEndpoint()
+        await self.endpoint2.open()
+
+        self.ep1_address = ("127.0.0.1", self.endpoint1.get_address()[1])
+        self.ep2_address = ("127.0.0.1", self.endpoint2.get_address()[1])
+
+        self.endpoint1_listener = DummyEndpointListener(self.endpoint1)
+        self.endpoint1.add_listener(self.endpoint1_listener)
+        self.endpoint2_listener = DummyEndpointListener(self.endpoint2)
+        self.endpoint2.add_listener(self.endpoint2_listener)
+
+    async def tearDown(self) -> None:
+        """
+        Close the endpoints.
+        """
+        self.endpoint1.close()
+        self.endpoint2.close()
+        await super().tearDown()
+
+    async def wait_for_packets(self, listener: DummyEndpointListener, count: int) -> None:
+        """
+        Wait until the given listener received the given number of packets.
+        """
+        for _ in range(50):
+            if len(listener.incoming) >= count:
+                break
+            await sleep(.02)
+
+    async def test_close_stops_workers(self) -> None:
+        """
+        Check if the worker threads of listeners exit when the batched endpoint is closed.
+        """
+        self.endpoint1.worker_queue_size = 10
+        listener = ThreadedEndpointListener(self.endpoint1)
+        self.endpoint1.add_listener(listener)
+        self.endpoint2.send(self.ep1_address, b"a" * 10)
+        await self.wait_for_packets(listener, 1)
+        worker = self.endpoint1.get_worker(listener)
+
+        self.endpoint1.close()
+
+        self.assertEqual(1, worker.delivered)
+        self.assertFalse(worker.running)
+        self.assertIsNone(self.endpoint1.get_worker(listener))
+        self.assertNotIn(f"{ThreadedEndpointListener.__name__}Worker", [t.name for t in threading.enumerate()])
+
+    async def test_dispatcher_close_stops_workers(self) -> None:
+        """
+        Check if the worker threads of listeners exit when a dispatcher with a batched interface is closed.
+        """
+        with patch.dict(INTERFACES, {"UDPIPv4": UDPEndpoint, "UDPIPv6": UDPv6Endpoint}):
+            dispatcher = DispatcherEndpoint(["UDPIPv4"], UDPIPv4={"batched": True, "worker_queue_size": 10})
+        interface = dispatcher.interfaces["UDPIPv4"]
+        await dispatcher.open()
+        listener = ThreadedEndpointListener(dispatcher)
+        dispatcher.add_listener(listener)
+        self.endpoint2.send(("127.0.0.1", interface.get_address()[1]), b"a" * 10)
+        await self.wait_for_packets(listener, 1)
+        worker = interface.get_worker(listener)
+
+        await dispatcher.close()
+
+        self.assertEqual(1, worker.delivered)
+        self.assertFalse(worker.running)
+        self.assertNotIn(f"{ThreadedEndpointListener.__name__}Worker", [t.name for t in threading.enumerate()])
+
+    async def test_send_message(self) -> None:
+        """
+        Test sending a basic message through the batched UDP endpoint.
+        """
+        self.endpoint1.send(self.ep2_address, b"a" * 10)
+        await self.wait_for_packets(self.endpoint2_listener, 1)
+
+        self.assertEqual([(self.ep1_address, b"a" * 10)], self.endpoint2_listener.incoming)
+        self.assertEqual(10, self.endpoint1.bytes_up)
+
+    async def test_receive_message(self) -> None:
+        """
+        Test receiving a basic message through the batched UDP endpoint.
+        """
+        self.endpoint2.send(self.ep1_address, b"a" * 10)
+        await self.wait_for_packets(self.endpoint1_listener, 1)
+
+        self.assertEqual([(self.ep2_address, b"a" * 10)], self.endpoint1_listener.incoming)
+        self.assertIsInstance(self.endpoint1_listener.incoming[0][0], UDPv4Address)
+        self.assertEqual(10, self.endpoint1.bytes_down)
+
+    async def test_send_receive_many_messages(self) -> None:
+        """
+        Test sending and receiving more messages than fit in a single batch.
+        """
+        for ind in range(1, 51):
+            self.endpoint1.send(self.ep2_address, b"a" * ind)
+            self.endpoint2.send(self.ep1_address, b"b" * ind)
+        await self.wait_for_packets(self.endpoint1_listener, 50)
+        await self.wait_for_packets(self.endpoint2_listener, 50)
+
+        self.assertEqual(list(range(1, 51)), sorted(len(data) for _, data in self.endpoint1_listener.incoming))
+        self.assertEqual(list(range(1, 51)), sorted(len(data) for _, data in self.endpoint2_listener.incoming))
+
+    async def test_send_too_big_message(self) -> None:
+        """
+        Test if a too big message is dropped without dropping the messages that are sent in the same batch.
+        """
+        self.endpoint1.send(self.ep2_address, b"a" * 70000)
+        self.endpoint1.send(self.ep2_address, b"a" * 10)
+        await self.wait_for_packets(self.endpoint2_listener, 1)
+
+        self.assertEqual([(self.ep1_address, b"a" * 10)], self.endpoint2_listener.incoming)
+
+    def test_send_invalid_destination(self) -> None:
+        """
+        Test sending a message with an invalid destination through the batched UDP endpoint.
+        """
+        self.endpoint1.send(("not an ip", 0), b"a" * 10)
+
+        self.assertEqual(0, self.endpoint1.bytes_up)
+
+    def test_dispatcher_batched(self) -> None:
+        """
+        Test if the dispatcher uses the batched implementation of an interface, if it is configured to.
+        """
+        with patch.dict(INTERFACES, {"UDPIPv4": UDPEndpoint, "UDPIPv6": UDPv6Endpoint}):
+            dispatcher = DispatcherEndpoint(["UDPIPv4", "UDPIPv6"], UDPIPv4={"batched": True})
+
+        self.assertIsInstance(dispatcher.interfaces["UDPIPv4"], BATCHED_INTERFACES["UDPIPv4"])
+        self.assertNotIsInstance(dispatcher.interfaces["UDPIPv6"], BATCHED_INTERFACES["UDPIPv6"])
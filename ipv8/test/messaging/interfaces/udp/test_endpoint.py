@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from asyncio import sleep
 from typing import TYPE_CHECKING
 
@@ -30,6 +31,19 @@ class DummyEndpointListener(EndpointListener):
         self.incoming.append(packet)
 
 
+class ThreadedEndpointListener(DummyEndpointListener):
+    """
+    This class listens on an endpoint without using the main thread.
+    """
+
+    def __init__(self, endpoint: UDPEndpoint) -> None:
+        """
+        Create a new threaded endpoint listener.
+        """
+        EndpointListener.__init__(self, endpoint, main_thread=False)
+        self.incoming = []
+
+
 class TestUDPEndpoint(TestBase):
     """
     This class contains various tests for the UDP endpoint.
@@ -60,6 +74,27 @@ class TestUDPEndpoint(TestBase):
             self.endpoint2.close()
         await super().tearDown()
 
+    async def test_close_stops_workers(self) -> None:
+        """
+        Check if the worker threads of listeners exit when the endpoint is closed.
+        """
+        self.endpoint2.worker_queue_size = 10
+        listener = ThreadedEndpointListener(self.endpoint2)
+        self.endpoint2.add_listener(listener)
+        self.endpoint1.send(self.ep2_address, b"a" * 10)
+        for _ in range(50):
+            if listener.incoming:
+                break
+            await sleep(.01)
+        worker = self.endpoint2.get_worker(listener)
+
+        self.endpoint2.close()
+
+        self.assertEqual(1, worker.delivered)
+        self.assertFalse(worker.running)
+        self.assertIsNone(self.endpoint2.get_worker(listener))
+        self.assertNotIn(f"{ThreadedEndpointListener.__name__}Worker", [t.name for t in threading.enumerate()])
+
     async def test_send_message(self) -> None:
         """
         Test sending a basic message through the UDP endpoint.
@@ -314,3 +314,118 @@ class TestSerializer(TestBase):
         output, _ = self.serializer.unpack_serializable(NestedWithRaw, data)
         self.assertEqual(instance.raw_list[0].raw, output.raw_list[0].raw)
         self.assertEqual(instance.raw_list[1].raw, output.raw_list[1].raw)
+
+    def test_unpack_merged_structs(self) -> None:
+        """
+        Check if adjacent struct formats are unpacked to the same values as separate formats.
+        """
+        class Merged(Serializable):
+            format_list = ["B", "HH", "20s", "varlenH", "I", "?"]
+
+            def to_pack_list(self) -> list[tuple]:
+                return []
+
+            @classmethod
+            def from_unpack_list(cls: type[Merged], *args: Any) -> tuple:  # noqa: ANN401
+                return args
+
+        data = (struct.pack(">BHH20s", 1, 2, 3, b"a" * 20) + struct.pack(">H", 3) + b"xyz"
+                + struct.pack(">I?", 4, True))
+
+        unpacked, offset = self.serializer.unpack_serializable(Merged, data)
+
+        self.assertEqual((1, (2, 3), b"a" * 20, b"xyz", 4, True), unpacked)
+        self.assertEqual(len(data), offset)
+
+    def test_unpack_plan_add_packer(self) -> None:
+        """
+        Check if registering a packer invalidates the cached unpack plans.
+        """
+        data = self.serializer.pack_serializable(Short(1))
+        self.serializer.unpack_serializable(Short, data)
+
+        self.serializer.add_packer("H", DefaultStruct("<H"))
+        output, _ = self.serializer.unpack_serializable(Short, data)
+
+        self.assertEqual(256, output.number)
+
+    def test_unpack_plan_format_list_changed(self) -> None:
+        """
+        Check if replacing the format_list of a Serializable invalidates its cached unpack plan.
+        """
+        class Changing(Serializable):
+            format_list = ["B"]
+
+            def to_pack_list(self) -> list[tuple]:
+                return []
+
+            @classmethod
+            def from_unpack_list(cls: type[Changing], *args: Any) -> tuple:  # noqa: ANN401
+                return args
+
+        first, _ = self.serializer.unpack_serializable(Changing, b"\x01\x02")
+        Changing.format_list = ["H"]
+        second, _ = self.serializer.unpack_serializable(Changing, b"\x01\x02")
+
+        self.assertEqual((1, ), first)
+        self.assertEqual((258, ), second)
+
+    def test_unpack_unknown_format(self) -> None:
+        """
+        Check if unpacking a Serializable with an unknown format raises a PackError.
+        """
+        class Unknown(Serializable):
+            format_list = ["I do not exist"]
+
+            def to_pack_list(self) -> list[tuple]:
+                return []
+
+            @classmethod
+            def from_unpack_list(cls: type[Unknown], *args: Any) -> tuple:  # noqa: ANN401
+                return args
+
+        self.assertRaises(PackError, self.serializer.unpack_serializable, Unknown, b"")
+
+    def test_pack_serializable_into(self) -> None:
+        """
+        Check if packing into an existing buffer appends the same data as packing to bytes.
+        """
+        instance = NestedWithRaw([Raw(b"123"), Raw(b"456")])
+        buffer = bytearray(b"prefix")
+
+        self.serializer.pack_serializable_into(instance, buffer)
+
+        self.assertEqual(b"prefix" + self.serializer.pack_serializable(instance), bytes(buffer))
+
+    def test_pack_nested_length_prefix(self) -> None:
+        """
+        Check if the back-patched length prefixes of nested payloads are correct.
+        """
+        instance = Nested([Byte(1), Byte(2), Byte(3)])
+
+        data = self.serializer.pack_serializable(instance)
+
+        self.assertEqual(b"\x03\x00\x01\x01\x00\x01\x02\x00\x01\x03", data)
+
+    def test_unpack_memoryview(self) -> None:
+        """
+        Check if unpacking from a memoryview produces memoryview slices of the original data.
+        """
+        instance = NestedWithRaw([Raw(b"123"), Raw(b"456")])
+        data = self.serializer.pack_serializable(instance)
+
+        output, _ = self.serializer.unpack_serializable(NestedWithRaw, memoryview(data))
+
+        self.assertIsInstance(output.raw_list[0].raw, memoryview)
+        self.assertEqual(b"123", bytes(output.raw_list[0].raw))
+        self.assertEqual(b"456", bytes(output.raw_list[1].raw))
+
+    def test_unpack_memoryview_utf8(self) -> None:
+        """
+        Check if UTF-8 strings are decoded to str when unpacking from a memoryview.
+        """
+        data = self.serializer.pack("varlenHutf8", "€")
+
+        output, _ = self.serializer.unpack("varlenHutf8", memoryview(data))
+
+        self.assertEqual("€", output)
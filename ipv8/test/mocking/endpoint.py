@@ -95,6 +95,7 @@ class MockEndpoint(Endpoint):
         """
         Close this endpoint.
         """
+        self.stop_workers()
         self._open = False
 
     def reset_byte_counters(self) -> None:
@@ -84,6 +84,7 @@ class MockIPv8:
 
         self.overlays = []
         self.strategies = []
+        self.rate_limiter = None
 
         if enable_statistics:
             self.endpoint.enable_community_statistics(self.overlay.get_prefix(), True)
@@ -3,7 +3,7 @@ from binascii import unhexlify
 
 from ...keyvault.crypto import default_eccrypto
 from ...peer import Peer
-from ...peerdiscovery.network import Network, PeerObserver
+from ...peerdiscovery.network import AddressSet, Network, PeerObserver
 from ..base import TestBase
 
 
@@ -145,29 +145,41 @@ class TestNetwork(TestBase):
             self.assertNotIn(self.peers[other], self.network.verified_peers)
             self.assertIn(self.peers[other].address, self.network.get_introductions_from(self.peers[0]))
 
-    def test_get_introductions_from_cache_no_refresh(self) -> None:
+    def test_get_introductions_from_index(self) -> None:
         """
-        Cache entries in the introduction cache should not refresh.
-
-        This is to avoid dead peers sticking around the cache for too long.
+        Check if the introduction index follows new introductions, in order of introduction.
         """
         intro1 = ("1.2.3.4", 5)
         intro2 = ("6.7.8.9", 10)
         intro3 = ("11.12.13.14", 15)
         self.network.discover_address(self.peers[0], intro1)
         self.network.discover_address(self.peers[1], intro2)
+        self.network.discover_address(self.peers[0], intro3)
 
-        ilist0 = self.network.get_introductions_from(self.peers[0])
-        ilist1 = self.network.get_introductions_from(self.peers[1])
-        self.assertListEqual([self.peers[0], self.peers[1]], list(self.network.reverse_intro_lookup))
-        self.assertListEqual([intro1], ilist0)
-        self.assertListEqual([intro2], ilist1)
+        self.assertListEqual([intro1, intro3], self.network.get_introductions_from(self.peers[0]))
+        self.assertListEqual([intro2], self.network.get_introductions_from(self.peers[1]))
 
-        # We should make a good faith attempt to update the cache with a new introduction.
-        self.network.discover_address(self.peers[0], intro3)
-        ilist2 = self.network.get_introductions_from(self.peers[0])
-        self.assertListEqual([self.peers[0], self.peers[1]], list(self.network.reverse_intro_lookup))
-        self.assertListEqual([intro1, intro3], ilist2)
+    def test_get_introductions_from_adopted(self) -> None:
+        """
+        Check if an introduced address moves to its new introducer in the index, if its old introducer was removed.
+        """
+        self.network.discover_address(self.peers[0], self.peers[1].address)
+        self.network.remove_peer(self.peers[0])
+        self.network.discover_address(self.peers[2], self.peers[1].address)
+
+        self.assertListEqual([], self.network.get_introductions_from(self.peers[0]))
+        self.assertListEqual([self.peers[1].address], self.network.get_introductions_from(self.peers[2]))
+        self.assertNotIn(self.peers[0].public_key.key_to_bin(), self.network.introductions_per_peer)
+
+    def test_get_introductions_from_removed(self) -> None:
+        """
+        Check if removed addresses are no longer returned as introductions.
+        """
+        self.network.discover_address(self.peers[0], self.peers[1].address)
+        self.network.discover_address(self.peers[0], self.peers[2].address)
+        self.network.remove_by_address(self.peers[1].address)
+
+        self.assertListEqual([self.peers[2].address], self.network.get_introductions_from(self.peers[0]))
 
     def test_discover_services(self) -> None:
         """
@@ -247,22 +259,32 @@ class TestNetwork(TestBase):
         self.assertEqual(self.network.get_peers_for_service(service1)[0].address, peer.address)
         self.assertEqual(self.network.get_peers_for_service(service2)[0].address, peer.address)
 
-    def test_discover_services_cache(self) -> None:
+    def test_get_peers_for_service_removed(self) -> None:
         """
-        Check if services cache updates properly.
+        Check if removed peers are no longer returned for their services.
         """
-        service1 = bytes(range(20))
-        service2 = bytes(range(20, 40))
-        self.network.reverse_service_cache_size = 1
-        self.network.discover_services(self.peers[0], [service1])
+        service = bytes(range(20))
         self.network.add_verified_peer(self.peers[0])
-        self.network.discover_services(self.peers[1], [service2])
         self.network.add_verified_peer(self.peers[1])
+        self.network.discover_services(self.peers[0], [service])
+        self.network.discover_services(self.peers[1], [service])
 
-        self.network.get_peers_for_service(service1)
-        self.network.get_peers_for_service(service2)
+        self.network.remove_peer(self.peers[0])
+
+        self.assertListEqual([self.peers[1]], self.network.get_peers_for_service(service))
+
+    def test_get_peers_for_service_removed_last(self) -> None:
+        """
+        Check if the index entry of a service is removed when no peers support it anymore.
+        """
+        service = bytes(range(20))
+        self.network.add_verified_peer(self.peers[0])
+        self.network.discover_services(self.peers[0], [service])
+
+        self.network.remove_by_address(self.peers[0].address)
 
-        self.assertListEqual([service2], list(self.network.reverse_service_lookup))
+        self.assertListEqual([], self.network.get_peers_for_service(service))
+        self.assertNotIn(service, self.network.peers_per_service)
 
     def test_add_verified_peer_new(self) -> None:
         """
@@ -314,35 +336,81 @@ class TestNetwork(TestBase):
         self.network.add_verified_peer(self.peers[0])
 
         self.assertEqual(self.peers[0], self.network.get_verified_by_address(self.peers[0].address))
-        self.assertIn(self.peers[0].address, self.network.reverse_ip_lookup)
+        self.assertIn(self.peers[0].address, self.network.peers_per_address)
 
-    def test_get_verified_by_address_cache_pop(self) -> None:
+    def test_get_verified_by_address_unknown(self) -> None:
         """
-        When the cache if full, pop the least-used entry.
+        Check if we don't find a peer for an address that is not in use by a verified peer.
         """
         self.network.add_verified_peer(self.peers[0])
-        self.network.add_verified_peer(self.peers[1])
-        self.network.reverse_ip_cache_size = 1
+        self.network.discover_address(self.peers[0], self.peers[1].address)
+
+        self.assertIsNone(self.network.get_verified_by_address(self.peers[1].address))
+
+    def test_get_verified_by_address_removed(self) -> None:
+        """
+        Check if we don't find a peer by its address after it has been removed.
+        """
+        self.network.add_verified_peer(self.peers[0])
+        self.network.remove_peer(self.peers[0])
+
+        self.assertIsNone(self.network.get_verified_by_address(self.peers[0].address))
+        self.assertNotIn(self.peers[0].address, self.network.peers_per_address)
 
-        self.network.get_verified_by_address(self.peers[1].address)  # Cache stack: [1] (full)
-        self.assertListEqual([self.peers[1].address], list(self.network.reverse_ip_lookup))
+    def test_get_verified_by_address_direct(self) -> None:
+        """
+        Check if we find a peer by its address if it was added to the verified peers directly.
+        """
+        self.network.verified_peers.add(self.peers[0])
 
-        self.network.get_verified_by_address(self.peers[0].address)  # Cache stack: [0] (full)
-        self.assertListEqual([self.peers[0].address], list(self.network.reverse_ip_lookup))
+        self.assertEqual(self.peers[0], self.network.get_verified_by_address(self.peers[0].address))
 
-    def test_get_verified_by_address_cache_refresh(self) -> None:
+    def test_get_verified_by_address_direct_indexed(self) -> None:
         """
-        Asking for the same peer twice should land it back on top of the cleanup stack.
+        Check if a peer that was added to the verified peers directly is indexed when it is added again.
         """
+        self.network.discover_address(self.peers[1], self.peers[0].address)
+        self.network.verified_peers.add(self.peers[0])
         self.network.add_verified_peer(self.peers[0])
-        self.network.add_verified_peer(self.peers[1])
-        self.network.reverse_ip_cache_size = 2
 
-        self.network.get_verified_by_address(self.peers[1].address)  # Cache stack: [1]
-        self.network.get_verified_by_address(self.peers[0].address)  # Cache stack: [1, 0] (full)
-        self.network.get_verified_by_address(self.peers[1].address)  # Cache stack: [0, 1] (full)
+        self.assertEqual(self.peers[0], self.network.get_verified_by_address(self.peers[0].address))
+        self.assertIn(self.peers[0], self.network.peers_per_address[self.peers[0].address])
+
+    def test_get_verified_by_address_update(self) -> None:
+        """
+        Check if the address index follows address updates of verified peers.
+        """
+        peer = Peer(self.peers[0].public_key, ("1.1.1.1", 1))
+        self.network.add_verified_peer(peer)
+
+        peer.address = ("1.1.1.1", 2)
+
+        self.assertIsNone(self.network.get_verified_by_address(("1.1.1.1", 1)))
+        self.assertEqual(peer, self.network.get_verified_by_address(("1.1.1.1", 2)))
+
+    def test_get_verified_by_address_update_duplicate(self) -> None:
+        """
+        Check if the address index follows address updates of verified peers, through a duplicate Peer instance.
+        """
+        pk = self.peers[0].public_key
+        self.network.add_verified_peer(Peer(pk, ("1.1.1.1", 1)))
+        self.network.add_verified_peer(Peer(pk, ("1.1.1.1", 2)))
+
+        self.assertIsNone(self.network.get_verified_by_address(("1.1.1.1", 1)))
+        self.assertIsNotNone(self.network.get_verified_by_address(("1.1.1.1", 2)))
+
+    def test_get_verified_by_address_update_removed(self) -> None:
+        """
+        Check if address updates of removed peers no longer affect the address index.
+        """
+        peer = Peer(self.peers[0].public_key, ("1.1.1.1", 1))
+        self.network.add_verified_peer(peer)
+        self.network.remove_peer(peer)
+
+        peer.address = ("1.1.1.1", 2)
 
-        self.assertListEqual([self.peers[0].address, self.peers[1].address], list(self.network.reverse_ip_lookup))
+        self.assertIsNone(self.network.get_verified_by_address(("1.1.1.1", 2)))
+        self.assertDictEqual({}, self.network.peers_per_address)
 
     def test_get_verified_by_public_key(self) -> None:
         """
@@ -444,6 +512,111 @@ class TestNetwork(TestBase):
 
         self.assertEqual([self.peers[1].address], self.network.get_walkable_addresses(service))
 
+    def test_get_walkable_by_service_discovered_later(self) -> None:
+        """
+        Check if tracked walkable addresses are updated when their introducer later turns out to support a service.
+        """
+        service = bytes(range(20))
+        self.network.discover_address(self.peers[0], self.peers[1].address)
+
+        self.assertEqual([], self.network.get_walkable_addresses(service))
+
+        self.network.discover_services(self.peers[0], [service])
+
+        self.assertEqual([self.peers[1].address], self.network.get_walkable_addresses(service))
+
+    def test_get_walkable_by_service_verified(self) -> None:
+        """
+        Check if tracked walkable addresses are no longer walkable when a peer with the service is verified.
+        """
+        service = bytes(range(20))
+        self.network.discover_address(self.peers[0], self.peers[1].address, service)
+
+        self.assertEqual([self.peers[1].address], self.network.get_walkable_addresses(service))
+        self.assertEqual([self.peers[1].address], self.network.get_walkable_addresses())
+
+        self.network.add_verified_peer(self.peers[1])
+
+        self.assertEqual([self.peers[1].address], self.network.get_walkable_addresses(service))
+        self.assertEqual([], self.network.get_walkable_addresses())
+
+        self.network.discover_services(self.peers[1], [service])
+
+        self.assertEqual([], self.network.get_walkable_addresses(service))
+
+    def test_get_walkable_by_service_old_style(self) -> None:
+        """
+        Check if new-style addresses can be filtered from the walkable addresses.
+        """
+        service = bytes(range(20))
+        self.network.discover_address(self.peers[0], self.peers[1].address, service, True)
+        self.network.discover_address(self.peers[0], self.peers[2].address, service, False)
+
+        self.assertEqual({self.peers[1].address, self.peers[2].address},
+                         set(self.network.get_walkable_addresses(service)))
+        self.assertEqual([self.peers[2].address], self.network.get_walkable_addresses(service, True))
+
+    def test_get_walkable_after_removal(self) -> None:
+        """
+        Check if tracked walkable addresses are updated when addresses are removed or their introducer is removed.
+        """
+        service = bytes(range(20))
+        self.network.discover_address(self.peers[0], self.peers[1].address)
+        self.network.discover_address(self.peers[0], self.peers[2].address)
+        self.network.discover_services(self.peers[0], [service])
+        self.network.get_walkable_addresses(service)
+
+        self.network.remove_by_address(self.peers[1].address)
+
+        self.assertEqual([self.peers[2].address], self.network.get_walkable_addresses(service))
+
+        self.network.remove_peer(self.peers[0])
+
+        self.assertEqual([], self.network.get_walkable_addresses(service))
+        self.assertEqual([self.peers[2].address], self.network.get_walkable_addresses())
+
+    def test_get_random_walkable_address(self) -> None:
+        """
+        Check if a random walkable address can be retrieved.
+        """
+        self.network.discover_address(self.peers[0], self.peers[1].address)
+        self.network.discover_address(self.peers[0], self.peers[2].address)
+
+        self.assertIn(self.network.get_random_walkable_address(), {self.peers[1].address, self.peers[2].address})
+
+    def test_get_random_walkable_address_exclude(self) -> None:
+        """
+        Check if excluded addresses are not returned as a random walkable address.
+        """
+        self.network.discover_address(self.peers[0], self.peers[1].address)
+        self.network.discover_address(self.peers[0], self.peers[2].address)
+
+        self.assertEqual(self.peers[2].address,
+                         self.network.get_random_walkable_address(exclude={self.peers[1].address}))
+        self.assertIsNone(self.network.get_random_walkable_address(exclude={self.peers[1].address,
+                                                                            self.peers[2].address}))
+
+    def test_address_set(self) -> None:
+        """
+        Check if addresses can be added to and removed from an AddressSet.
+        """
+        address_set = AddressSet([("1.2.3.4", 5), ("6.7.8.9", 10)])
+        address_set.add(("1.2.3.4", 5))
+        address_set.add(("11.12.13.14", 15))
+        address_set.discard(("1.2.3.4", 5))
+        address_set.discard(("1.2.3.4", 5))
+
+        self.assertEqual(2, len(address_set))
+        self.assertNotIn(("1.2.3.4", 5), address_set)
+        self.assertSetEqual({("6.7.8.9", 10), ("11.12.13.14", 15)}, set(address_set))
+        self.assertIn(address_set.sample(), {("6.7.8.9", 10), ("11.12.13.14", 15)})
+
+    def test_address_set_sample_empty(self) -> None:
+        """
+        Check if sampling an empty AddressSet returns None.
+        """
+        self.assertIsNone(AddressSet().sample())
+
     def test_snapshot_only_verified(self) -> None:
         """
         Check if a snapshot properly serializes verified peers.
@@ -542,7 +715,6 @@ class TestNetwork(TestBase):
         """
         service1 = bytes(range(20))
         service2 = bytes(range(20, 40))
-        self.network.reverse_service_cache_size = 1
         self.network.add_verified_peer(self.peers[0])
         self.network.add_verified_peer(self.peers[1])
         self.network.discover_services(self.peers[0], [service1, service2])
@@ -550,7 +722,6 @@ class TestNetwork(TestBase):
 
         # Setup:
         # 1. self.peers[0] supports service1 and service2
-        # 2. The reverse_service_lookup only includes service1
         # Act:
         # 1. Discover that self.peers[1] supports service2
         self.network.discover_services(self.peers[1], [service2])
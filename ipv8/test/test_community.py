@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 
 from ..bootstrapping.dispersy.bootstrapper import DispersyBootstrapper
 from ..community import Community, CommunitySettings
+from ..keyvault.signature_cache import DEFAULT_SIGNATURE_CACHE_SIZE
 from ..peer import Peer
 from ..peerdiscovery.network import Network
 from .base import TestBase
@@ -204,3 +205,162 @@ class TestCommunityBootstrapping(TestBase):
         self.assertEqual(2, len(tasks),
                          msg="Precondition failed. Only the bootstrap/LAN discovery tasks should be running!")
         self.assertTrue(bootstrap_task.cancelled())
+
+
+class FixedWalkCommunity(NewCommunity):
+    """
+    Community that chooses its own walkable addresses.
+    """
+
+    def get_walkable_addresses(self) -> list[Address]:
+        """
+        Only walk to a fixed address.
+        """
+        return [("1.2.3.4", 5)]
+
+
+class TestCommunityWalkableAddresses(TestBase):
+    """
+    Tests for the walkable addresses of Communities.
+    """
+
+    async def test_random_walkable_address_override(self) -> None:
+        """
+        Check if a random walkable address is taken from the walkable addresses of a subclass that overrides them.
+        """
+        settings = CommunitySettings(my_peer=Peer(b"LibNaCLPK:" + b"0" * 32), endpoint=AutoMockEndpoint(),
+                                     network=Network())
+        community = FixedWalkCommunity(settings)
+        introducer = Peer(b"LibNaCLPK:" + b"1" * 32, ("2.3.4.5", 6))
+        community.network.discover_address(introducer, ("3.4.5.6", 7), community.community_id)
+
+        self.assertEqual(("1.2.3.4", 5), community.get_random_walkable_address())
+        self.assertIsNone(community.get_random_walkable_address({("1.2.3.4", 5)}))
+        await community.unload()
+
+
+class TestCommunityZeroCopy(TestBase):
+    """
+    Tests for Communities that decode their packets without copying.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a libnacl and an M2Crypto node that use zero-copy decoding.
+        """
+        super().setUp()
+        self.nodes = [MockIPv8("curve25519", NewCommunity, CommunitySettings(zero_copy_decoding=True)),
+                      MockIPv8("low", NewCommunity, CommunitySettings(zero_copy_decoding=True))]
+
+    async def test_introduce(self) -> None:
+        """
+        Check if signed introduction messages are decoded when zero-copy decoding is enabled.
+        """
+        self.overlay(0).walk_to(self.address(1))
+        await self.deliver_messages()
+
+        self.assertEqual([self.key_bin(1)], [peer.public_key.key_to_bin() for peer in self.overlay(0).get_peers()])
+        self.assertEqual([self.key_bin(0)], [peer.public_key.key_to_bin() for peer in self.overlay(1).get_peers()])
+
+
+class TestCommunityBatchVerification(TestBase):
+    """
+    Tests for Communities that verify the signatures of incoming packets in batches.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a libnacl and an M2Crypto node that use batch verification.
+        """
+        super().setUp()
+        self.production_overlay_classes.append(NewCommunity)
+        self.nodes = [MockIPv8("curve25519", NewCommunity, CommunitySettings(batch_verification=True)),
+                      MockIPv8("low", NewCommunity, CommunitySettings(batch_verification=True,
+                                                                      verification_batch_size=1))]
+
+    async def test_introduce(self) -> None:
+        """
+        Check if signed introduction messages are handled after batch verification.
+        """
+        self.overlay(0).walk_to(self.address(1))
+        await self.deliver_messages()
+
+        self.assertEqual([self.key_bin(1)], [peer.public_key.key_to_bin() for peer in self.overlay(0).get_peers()])
+        self.assertEqual([self.key_bin(0)], [peer.public_key.key_to_bin() for peer in self.overlay(1).get_peers()])
+
+    async def test_invalid_signature(self) -> None:
+        """
+        Check if signed messages with an invalid signature are not handled after batch verification.
+        """
+        packet = self.overlay(0).create_introduction_request(self.address(1))
+        packet = packet[:-1] + bytes([packet[-1] ^ 0xFF])
+
+        with self.assertLogs(self.overlay(1).logger, "ERROR"):
+            self.overlay(1).on_packet((self.address(0), packet))
+            await self.deliver_messages()
+
+        self.assertEqual([], self.overlay(1).get_peers())
+
+    async def test_packet_batch(self) -> None:
+        """
+        Check if a batch of signed messages is handled after batch verification.
+        """
+        packets = [(self.address(0), self.overlay(0).create_introduction_request(self.address(1)))
+                   for _ in range(3)]
+
+        self.overlay(1).on_packets(packets)
+        await self.deliver_messages()
+
+        self.assertEqual([self.key_bin(0)], [peer.public_key.key_to_bin() for peer in self.overlay(1).get_peers()])
+
+
+    async def test_packet_order(self) -> None:
+        """
+        Check if unsigned messages are not handled before the signed messages that arrived before them.
+        """
+        handled = []
+        handle_packet = self.overlay(1).handle_packet
+        self.overlay(1).handle_packet = lambda *args: handled.append(args[2][22]) or handle_packet(*args)
+        request = self.overlay(0).create_introduction_request(self.address(1))
+        puncture_request = self.overlay(0).create_puncture_request(self.address(1), self.address(1), 1)
+
+        self.overlay(1).on_packets([(self.address(0), request), (self.address(0), puncture_request)])
+        await self.deliver_messages()
+
+        self.assertEqual([request[22], puncture_request[22]], handled[:2])
+
+
+class TestCommunitySignatureCache(TestBase):
+    """
+    Tests for the verified signature cache of Communities.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create two nodes that cache signature verification results.
+        """
+        super().setUp()
+        self.initialize(NewCommunity, 2, CommunitySettings(signature_cache_size=DEFAULT_SIGNATURE_CACHE_SIZE))
+
+    async def test_disabled_by_default(self) -> None:
+        """
+        Check if Communities do not cache signature verification results unless configured to.
+        """
+        settings = CommunitySettings(my_peer=Peer(b"LibNaCLPK:" + b"0" * 32), endpoint=AutoMockEndpoint(),
+                                     network=Network())
+        community = NewCommunity(settings)
+
+        self.assertIsNone(community.signature_cache)
+        await community.unload()
+
+    async def test_duplicate_packet(self) -> None:
+        """
+        Check if the signature of a duplicate packet is only verified once.
+        """
+        packet = self.overlay(0).create_introduction_request(self.address(1))
+
+        self.overlay(1).on_packet((self.address(0), packet))
+        self.overlay(1).on_packet((self.address(0), packet))
+        await self.deliver_messages()
+
+        self.assertEqual({"hits": 1, "misses": 1, "size": 1}, self.overlay(1).signature_cache.get_statistics())
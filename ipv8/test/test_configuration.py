@@ -154,6 +154,22 @@ class TestConfiguration(TestBase):
 
         self.assertEqual(3.14, builder.finalize()["walker_interval"])
 
+    def test_set_illegal_rate_limit(self) -> None:
+        """
+        Check if non-positive rate limits raise an error on finalization.
+        """
+        builder = ConfigBuilder().set_rate_limit(0.0, 10.0)
+
+        self.assertRaises(AssertionError, builder.finalize)
+
+    def test_set_rate_limit(self) -> None:
+        """
+        Check if a rate limit is finalized.
+        """
+        builder = ConfigBuilder().set_rate_limit(100.0, 200.0, 10)
+
+        self.assertEqual({"rate": 100.0, "burst": 200.0, "max_sources": 10}, builder.finalize()["rate_limit"])
+
     def test_add_key_illegal_curve(self) -> None:
         """
         Check if wrong key curves raise an error immediately.
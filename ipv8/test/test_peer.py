@@ -1,4 +1,6 @@
+import weakref
 from base64 import b64encode
+from collections import deque
 
 from ..keyvault.crypto import default_eccrypto
 from ..messaging.interfaces.udp.endpoint import UDPv4Address, UDPv6Address
@@ -232,3 +234,72 @@ class TestPeer(TestBase):
         peer.addresses.update({UDPv4Address: address})
 
         self.assertEqual(peer.address, address)
+
+    def test_address_observer_update(self) -> None:
+        """
+        Check if address observers are notified of changed and added addresses.
+        """
+        changes = []
+        address1 = UDPv4Address("1.2.3.4", 5)
+        address2 = UDPv6Address("1:2:3:4:5:6", 7)
+        peer = Peer(TestPeer.test_key, UDPv4Address("6.7.8.9", 10))
+        peer.addresses.add_observer(lambda old, new: changes.append((old, new)))
+
+        peer.address = address1
+        peer.addresses.update({UDPv4Address: address1, UDPv6Address: address2})
+
+        self.assertListEqual([(UDPv4Address("6.7.8.9", 10), address1), (None, address2)], changes)
+
+    def test_address_observer_remove(self) -> None:
+        """
+        Check if address observers are notified of removed addresses and can be unregistered.
+        """
+        changes = []
+        peer = Peer(TestPeer.test_key, UDPv4Address("6.7.8.9", 10))
+        peer.addresses.add_observer(lambda old, new: changes.append((old, new)))
+        peer.addresses.pop(UDPv4Address)
+        peer.addresses.remove_observer(peer.addresses.observers[0])
+        peer.address = UDPv4Address("1.2.3.4", 5)
+
+        self.assertListEqual([(UDPv4Address("6.7.8.9", 10), None)], changes)
+
+    def test_public_key_bin(self) -> None:
+        """
+        Check if the cached public key bin of a Peer is equal to the binary format of its public key.
+        """
+        self.assertEqual(TestPeer.test_key.pub().key_to_bin(), self.peer.public_key_bin)
+        self.assertEqual(self.peer.public_key_bin, Peer(self.peer.public_key_bin).public_key_bin)
+
+    def test_slots(self) -> None:
+        """
+        Check if the attributes of Peer instances are stored in slots, without an instance dict.
+        """
+        self.assertFalse(hasattr(self.peer, "__dict__"))
+        self.assertFalse(hasattr(self.peer.addresses, "__dict__"))
+
+    def test_weak_reference(self) -> None:
+        """
+        Check if Peer instances can still be weakly referenced.
+        """
+        self.assertIs(self.peer, weakref.ref(self.peer)())
+
+    def test_lazy_pings(self) -> None:
+        """
+        Check if the ping history of a Peer is only created when it is used.
+        """
+        self.assertIsNone(self.peer.get_median_ping())
+        self.assertIsNone(self.peer.get_average_ping())
+        self.assertIsNone(self.peer._pings)  # noqa: SLF001
+
+        self.peer.pings.append(1.0)
+
+        self.assertEqual(5, self.peer.pings.maxlen)
+        self.assertEqual(1.0, self.peer.get_average_ping())
+
+    def test_set_pings(self) -> None:
+        """
+        Check if the ping history of a Peer can be replaced.
+        """
+        self.peer.pings = deque([1.0, 3.0], maxlen=5)
+
+        self.assertEqual(2.0, self.peer.get_average_ping())
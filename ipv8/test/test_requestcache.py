@@ -136,7 +136,7 @@ class TestRequestCache(TestBase):
         """
         num_tasks = len(all_tasks())  # [Background tasks (depends on test runner) + RequestCache]
         self.request_cache.add(MockCache(self.request_cache))
-        self.assertEqual(len(all_tasks()), num_tasks + 1)  # [Background + RequestCache + Cache]
+        self.assertEqual(len(all_tasks()), num_tasks)  # [Background + RequestCache], caches don't need tasks
         await self.request_cache.shutdown()
         self.assertEqual(len(all_tasks()), num_tasks - 1)  # [Background]
         self.request_cache.add(MockCache(self.request_cache))  # No tasks should have been added
@@ -150,6 +150,71 @@ class TestRequestCache(TestBase):
         self.request_cache.add(cache)
         await cache.timed_out
 
+    async def test_timeout_order(self) -> None:
+        """
+        Test if caches time out in order of their timeout, regardless of the order in which they were added.
+        """
+        timed_out = []
+        cache1 = MockInfiniteCache(self.request_cache)
+        cache2 = MockInfiniteCache(self.request_cache)
+        cache1.on_timeout = lambda: timed_out.append(cache1)
+        cache2.on_timeout = lambda: timed_out.append(cache2)
+
+        with self.request_cache.passthrough(timeout=0.02):
+            self.request_cache.add(cache1)
+        with self.request_cache.passthrough(timeout=0.01):
+            self.request_cache.add(cache2)
+        await sleep(0.03)
+
+        self.assertListEqual([cache2, cache1], timed_out)
+
+    async def test_pop_cancels_timeout(self) -> None:
+        """
+        Test if a cache that is popped before its timeout does not time out.
+        """
+        cache = MockInfiniteCache(self.request_cache)
+
+        with self.request_cache.passthrough(timeout=0.01):
+            self.request_cache.add(cache)
+        self.request_cache.pop(cache.prefix, cache.number)
+        await sleep(0.02)
+
+        self.assertFalse(cache.timed_out)
+
+    async def test_pop_readd_timeout(self) -> None:
+        """
+        Test if a cache that is popped and added again only times out with its new timeout.
+        """
+        cache = MockInfiniteCache(self.request_cache)
+
+        with self.request_cache.passthrough(timeout=0.01):
+            self.request_cache.add(cache)
+        self.request_cache.pop(cache.prefix, cache.number)
+        self.request_cache.add(cache)
+        await sleep(0.02)
+
+        self.assertFalse(cache.timed_out)
+        self.assertTrue(self.request_cache.has(cache.prefix, cache.number))
+
+    async def test_timeout_exception(self) -> None:
+        """
+        Test if a cache that raises an exception on timeout does not stop other caches from timing out.
+        """
+        failing_cache = MockInfiniteCache(self.request_cache)
+        failing_cache.on_timeout = lambda: 1 / 0
+        cache = MockInfiniteCache(self.request_cache)
+        errors = []
+        self.loop.set_exception_handler(lambda _, context: errors.append(context["exception"]))
+
+        with self.request_cache.passthrough():
+            self.request_cache.add(failing_cache)
+            self.request_cache.add(cache)
+            await sleep(0.0)
+
+        self.assertTrue(cache.timed_out)
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
     async def test_add_duplicate(self) -> None:
         """
         Test if adding a cache twice returns None as the newly added cache.
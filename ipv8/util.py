@@ -3,6 +3,7 @@ from __future__ import annotations
 import operator
 import signal
 import struct
+import time
 from asyncio import Event, Future, iscoroutine
 from typing import TYPE_CHECKING, Any, TypeVar
 
@@ -90,3 +91,55 @@ def run_forever() -> Coroutine:
     :rtype: coroutine
     """
     return create_event_with_signals().wait()
+
+
+class TokenBucket:
+    """
+    Token bucket that is refilled with a given rate of tokens per second, up to a given capacity.
+    """
+
+    __slots__ = ("capacity", "last_refill", "rate", "tokens")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """
+        Create a new (full) token bucket.
+
+        :param rate: the number of tokens that are added per second.
+        :param capacity: the maximum number of tokens in the bucket, i.e., the maximum burst size.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def available(self, now: float | None = None) -> float:
+        """
+        Refill the bucket and return the number of tokens that are available.
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+        return self.tokens
+
+    def allows(self, amount: float, now: float | None = None) -> bool:
+        """
+        Check if the given number of tokens can be taken from the bucket.
+
+        Amounts that exceed the capacity of the bucket are allowed once the bucket is full.
+        """
+        return self.available(now) >= min(amount, self.capacity)
+
+    def consume(self, amount: float, now: float | None = None) -> bool:
+        """
+        Take the given number of tokens from the bucket, if they are available.
+        """
+        if not self.allows(amount, now):
+            return False
+        self.tokens -= amount
+        return True
+
+    def delay(self, amount: float) -> float:
+        """
+        Get the number of seconds until the given number of tokens can be taken, as of the last refill.
+        """
+        return max(0.0, (min(amount, self.capacity) - self.tokens) / self.rate)
@@ -36,6 +36,7 @@ else:
         from ipv8.messaging.anonymization.endpoint import TunnelEndpoint
         from ipv8.messaging.anonymization.hidden_services import HiddenTunnelCommunity
         from ipv8.messaging.interfaces.dispatcher.endpoint import DispatcherEndpoint
+        from ipv8.messaging.interfaces.rate_limiter import SourceRateLimiter
         from ipv8.messaging.interfaces.udp.endpoint import UDPEndpoint
         from ipv8.overlay import Overlay
         from ipv8.peer import Peer
@@ -56,6 +57,7 @@ else:
         from .ipv8.messaging.anonymization.endpoint import TunnelEndpoint  # type: ignore[import-not-found, no-redef]
         from .ipv8.messaging.anonymization.hidden_services import HiddenTunnelCommunity  # type: ignore[import-not-found, no-redef]
         from .ipv8.messaging.interfaces.dispatcher.endpoint import DispatcherEndpoint  # type: ignore[import-not-found, no-redef]
+        from .ipv8.messaging.interfaces.rate_limiter import SourceRateLimiter  # type: ignore[import-not-found, no-redef]
         from .ipv8.messaging.interfaces.udp.endpoint import UDPEndpoint  # type: ignore[import-not-found, no-redef]
         from .ipv8.overlay import Overlay  # type: ignore[import-not-found, no-redef]
         from .ipv8.peer import Peer  # type: ignore[import-not-found, no-redef]
@@ -121,6 +123,11 @@ else:
                 endpoint_args = {spec.pop("interface"): spec for spec in endpoint_specs}
                 self.endpoint = DispatcherEndpoint(list(endpoint_args.keys()), **endpoint_args)
 
+            self.rate_limiter: SourceRateLimiter | None = None
+            if configuration.get("rate_limit"):
+                self.rate_limiter = SourceRateLimiter(**configuration["rate_limit"])
+                self.endpoint.set_rate_limiter(self.rate_limiter)
+
             if enable_statistics:
                 self.endpoint = StatisticsEndpoint(self.endpoint)
             if any(overlay.get("initialize", {}).get("anonymize") for overlay in configuration["overlays"]):
@@ -199,6 +206,7 @@ else:
             The main IPv8 asyncio loop that schedules all registered strategies.
             """
             if self.endpoint.is_open() and self.state_machine_task:
+                self.update_rate_limiter()
                 with self.overlay_lock:
                     smooth = self.walk_interval // len(self.strategies) if self.strategies else 0
                     ticker = len(self.strategies)
@@ -223,6 +231,17 @@ else:
                     else:
                         await sleep(self.walk_interval)
 
+        def update_rate_limiter(self) -> None:
+            """
+            Never rate limit the (possibly newly resolved) addresses of the bootstrap servers of our overlays.
+            """
+            if self.rate_limiter is None:
+                return
+            with self.overlay_lock:
+                self.rate_limiter.set_allowed([address for overlay in self.overlays if isinstance(overlay, Community)
+                                               for bootstrapper in overlay.bootstrappers
+                                               for address in bootstrapper.blacklist()])
+
         def add_strategy(self, overlay: Overlay, strategy: DiscoveryStrategy, target_peers: int) -> None:
             """
             Register a strategy to call every tick unless a target number of peers has been reached.
@@ -0,0 +1,53 @@
+import sys
+from os import environ
+from timeit import repeat
+
+# Check if we are running from the root directory
+# If not, modify our path so that we can import IPv8
+try:
+    import ipv8
+    del ipv8
+except ImportError:
+    import __scriptpath__  # noqa: F401
+
+from libnacl.aead import AEAD
+
+from ipv8.messaging.anonymization.crypto import TunnelCrypto
+from ipv8.messaging.anonymization.tunnel import FORWARD
+
+number = int(environ.get("CELL_CRYPTO_NUMBER", "10000"))
+size = int(environ.get("CELL_CRYPTO_SIZE", "1024"))
+
+
+def main() -> None:
+    """
+    Compare encrypting cells with the cached cipher context of the session keys to creating a context per cell.
+
+    This only reports the timings, it does not assert anything: creating an AEAD context only stores the key, so the
+    difference is expected to be small compared to the encryption itself.
+    """
+    keys = TunnelCrypto().generate_session_keys(b"\x00" * 64)
+    content = b"\x00" * size
+
+    def uncached() -> None:
+        TunnelCrypto.encrypt_str(content, keys, FORWARD)
+        AEAD(keys.key_forward)
+
+    def cached() -> None:
+        TunnelCrypto.encrypt_str(content, keys, FORWARD)
+
+    def context() -> None:
+        AEAD(keys.key_forward)
+
+    cached_time = min(repeat(cached, number=number, repeat=5))
+    uncached_time = min(repeat(uncached, number=number, repeat=5))
+    context_time = min(repeat(context, number=number, repeat=5))
+
+    print(f"{number} cells of {size} bytes", file=sys.stderr)  # noqa: T201
+    print(f"cached context:   {cached_time * 1e6 / number:.2f} us/cell", file=sys.stderr)  # noqa: T201
+    print(f"context per cell: {uncached_time * 1e6 / number:.2f} us/cell", file=sys.stderr)  # noqa: T201
+    print(f"context creation: {context_time * 1e6 / number:.2f} us/context", file=sys.stderr)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()